@@ -1,89 +1,356 @@
-from typing import Dict, Any, List
+import time
+from itertools import chain, islice
+from typing import Dict, Any, Callable, List, Optional, Iterator, Iterable, Sequence, Tuple, Union, TYPE_CHECKING
 from parsers.swagger_parser import SwaggerParser
-from parsers.schema_analyzer import SchemaAnalyzer
+from parsers.schema_analyzer import SchemaAnalyzer, LazySampleData
+from parsers.spec_cache import SpecCache
+from parsers.spec_stream import SpecStream
+from parsers.spec_validator import SpecValidator, STRUCTURAL, FULL
+from parsers.spec_diff import diff_analyses
 from models.endpoint_model import *
+from utils.http_pool import create_session, HostLimiter
+from utils.metrics import Instrumentation, NULL_INSTRUMENTATION
+
+# Subsystems used by a single command (writers, JTL and database ingest, the
+# worker pool) are imported inside the methods that need them, so analyzing
+# a spec does not load them; tests/test_cli.py holds the import budget.
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from parsers.correlation import CorrelationEngine
+    from parsers.snapshot_store import AnalysisSnapshotStore
+    from writers.plan_optimizer import PlanOptimizer
 
 
 class InputInterpreterAgent:
-    def __init__(self):
-        self.parser = SwaggerParser()
+    def __init__(self, spec_cache: Optional[SpecCache] = None, workers: int = 1,
+                 executor: str = 'process', parallel_threshold: int = 256, chunk_size: int = 32,
+                 instrumentation: Optional[Instrumentation] = None,
+                 snapshot_store: Optional['AnalysisSnapshotStore'] = None,
+                 validator: Optional[SpecValidator] = None, fingerprints: bool = False):
+        self.parser = SwaggerParser(cache=spec_cache)
         self.analyzer = SchemaAnalyzer()
         self.analysis_result = None
+        self.snapshot_store = snapshot_store
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        # Operation fingerprints let a later run reuse this analysis as previous=;
+        # snapshots always carry them
+        self.fingerprints = fingerprints
+
+        # Structural validation runs inline; full validation in the background when enabled
+        self.validator = validator or SpecValidator()
+        self.validation: Optional[ValidationReport] = None
+        self.full_validation: Optional['Future[ValidationReport]'] = None
+
+        # Parallel mode: shard work across a pool once a spec is large enough
+        self.workers = workers
+        self.executor = executor
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+
+    def process_swagger_url(self, swagger_url: str,
+                            previous: Optional[SwaggerAnalysis] = None) -> SwaggerAnalysis:
+        """Main method to process Swagger URL and return analysis.
 
-    def process_swagger_url(self, swagger_url: str) -> SwaggerAnalysis:
-        """Main method to process Swagger URL and return analysis"""
+        When a previous analysis of the same API is given, only operations
+        whose fingerprint changed are re-parsed and re-analyzed, and the
+        result carries a change set relative to the previous analysis. The
+        previous analysis needs fingerprints: it comes from an agent created
+        with fingerprints=True, a snapshot store or an earlier incremental
+        run; otherwise every operation counts as modified.
+        Otherwise, with a snapshot store, an unchanged spec is loaded from
+        its stored analysis instead of being parsed and analyzed again; its
+        validation report then comes from the validator's cache.
+        """
 
         print(f"🔍 Fetching Swagger specification from: {swagger_url}")
+        metrics = self.instrumentation
+        self.validation = None
+        self.full_validation = None
 
-        # Step 1: Fetch and parse spec
-        spec_data = self.parser.fetch_spec(swagger_url)
+        # Step 1: Fetch spec and decode everything except the paths
+        with self.parser.open_stream(swagger_url, metrics) as stream:
+            spec_data = self.parser.load_spec(stream.header)
 
-        # Step 2: Extract basic info
-        analysis = SwaggerAnalysis(
-            base_url="",
-            title=spec_data.get('info', {}).get('title', 'API'),
-            version=spec_data.get('info', {}).get('version', '1.0'),
-            description=spec_data.get('info', {}).get('description', '')
-        )
+            if self.validator.full:
+                self.full_validation = self.validator.submit(stream.reopen(), FULL)
+
+            digest = None
+            if self.snapshot_store is not None and previous is None:
+                with metrics.stage('snapshot_load'):
+                    digest = stream.digest()
+                    snapshot = self.snapshot_store.load(digest)
+                if snapshot is not None:
+                    # Same report as an uncached run; only checked again when the validator forgot it
+                    self.validation = self.validator.validate(stream, STRUCTURAL)
+                    self._report_warnings()
+                    return self._finish_run(swagger_url, snapshot)
+
+            # Step 2: Extract basic info
+            analysis = SwaggerAnalysis(
+                base_url="",
+                title=spec_data.get('info', {}).get('title', 'API'),
+                version=spec_data.get('info', {}).get('version', '1.0'),
+                description=spec_data.get('info', {}).get('description', '')
+            )
 
-        # Step 3: Parse servers
-        analysis.servers = self.parser.parse_servers(spec_data)
-        if analysis.servers:
-            analysis.base_url = analysis.servers[0]
+            # Step 3: Parse servers
+            analysis.servers = self.parser.parse_servers(spec_data)
+            if analysis.servers:
+                analysis.base_url = analysis.servers[0]
 
-        # Step 4: Parse global security
-        analysis.global_security = self.parser.parse_security_definitions(spec_data)
+            # Step 4: Parse global security
+            analysis.global_security = self.parser.parse_security_definitions(spec_data)
 
-        # Step 5: Parse endpoints
-        analysis.endpoints = self._parse_all_endpoints(spec_data)
+            # Step 5: Parse endpoints and enhance with JMeter-specific analysis
+            if previous is not None:
+                with metrics.stage('incremental_analyze'):
+                    analysis.endpoints = list(self._iter_incremental_endpoints(stream, previous))
+                    analysis.change_set = diff_analyses(previous, analysis)
+            else:
+                analysis.endpoints = list(self._iter_stream_endpoints(stream))
 
-        # Step 6: Enhance with JMeter-specific analysis
-        for i, endpoint in enumerate(analysis.endpoints):
-            analysis.endpoints[i] = self.analyzer.analyze_endpoint_requirements(endpoint)
+        self._report_warnings()
 
+        if digest is not None:
+            self.validation.digest = digest
+            self.validator.remember(self.validation)
+            with metrics.stage('snapshot_store'):
+                try:
+                    self.snapshot_store.store(digest, analysis)
+                except (OSError, ValueError, TypeError) as e:
+                    # The analysis is still good; only the next run loses the shortcut
+                    print(f"⚠️ Could not store analysis snapshot: {e}")
+
+        return self._finish_run(swagger_url, analysis)
+
+    def _report_warnings(self):
+        warnings = self.validation.warnings if self.validation else []
+        if warnings:
+            print(f"⚠️ {len(warnings)} spec validation warnings, first: {warnings[0]}")
+
+    def _finish_run(self, swagger_url: str, analysis: SwaggerAnalysis) -> SwaggerAnalysis:
         self.analysis_result = analysis
         print(f"✅ Successfully analyzed {len(analysis.endpoints)} endpoints")
 
+        if self.instrumentation.enabled:
+            self._record_run_metrics(analysis)
+            self.instrumentation.flush({'source': swagger_url, 'title': analysis.title})
+
         return analysis
 
+    def process_many(self, urls: Iterable[str], max_workers: int = 8, per_host_limit: int = 4,
+                     timeout: float = 30) -> Iterator[BatchResult]:
+        """Process a catalog of specs concurrently, yielding results as they complete.
+
+        All fetches share one keep-alive connection pool, at most
+        per_host_limit requests run against the same host at a time, and a
+        failing spec is reported in its BatchResult instead of aborting the
+        batch. Each spec is processed with this agent's settings: its
+        instrumentation, validator and parallel mode.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        session = create_session(per_host_limit)
+        host_limiter = HostLimiter(per_host_limit)
+
+        def process_one(url: str) -> BatchResult:
+            started = time.perf_counter()
+            agent = InputInterpreterAgent(spec_cache=self.parser.cache, snapshot_store=self.snapshot_store,
+                                          instrumentation=self.instrumentation, validator=self.validator,
+                                          workers=self.workers, executor=self.executor,
+                                          parallel_threshold=self.parallel_threshold,
+                                          chunk_size=self.chunk_size)
+            agent.parser.http = session
+            agent.parser.timeout = timeout
+            agent.parser.host_limiter = host_limiter
+
+            try:
+                analysis = agent.process_swagger_url(url)
+                return BatchResult(url=url, analysis=analysis,
+                                   elapsed_seconds=time.perf_counter() - started)
+            except Exception as e:
+                print(f"❌ Failed to process {url}: {str(e)}")
+                return BatchResult(url=url, error=str(e),
+                                   elapsed_seconds=time.perf_counter() - started)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(process_one, url) for url in urls]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            session.close()
+
+    def iter_endpoints(self, source: str) -> Iterator[EndpointInfo]:
+        """Yield fully analyzed endpoints one at a time from a spec source.
+
+        Path items are decoded incrementally, so memory stays bounded by the
+        spec header plus the largest single operation.
+        """
+        with self.parser.open_stream(source, self.instrumentation) as stream:
+            self.parser.load_spec(stream.header)
+            yield from self._iter_stream_endpoints(stream)
+
+    def _iter_stream_endpoints(self, stream: SpecStream) -> Iterator[EndpointInfo]:
+        """Parse and analyze each path item as it is read from the stream"""
+        path_items = self._checked_paths(stream)
+
+        if self.workers > 1:
+            # Small specs are not worth the pool start-up cost: stay serial
+            head = list(islice(path_items, self.parallel_threshold))
+            if len(head) == self.parallel_threshold:
+                yield from self._iter_parallel_endpoints(chain(head, path_items))
+                return
+            path_items = iter(head)
+
+        if self.instrumentation.enabled:
+            yield from self._iter_timed_endpoints(path_items)
+            return
+
+        for path, path_item in path_items:
+            for endpoint in self._parse_path_item(path, path_item):
+                yield self.analyzer.analyze_endpoint_requirements(endpoint)
+
+    def _checked_paths(self, stream: SpecStream) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Path items of the stream, structurally validated as they are read"""
+        self.validation = report = ValidationReport(level=STRUCTURAL)
+        yield from self.validator.check(stream.header, stream.iter_paths(), report,
+                                        resolver=self.parser.resolver)
+
+    def _iter_timed_endpoints(self, path_items: Iterator[Tuple[str, Dict[str, Any]]]) -> Iterator[EndpointInfo]:
+        """Serial loop that attributes time to path decoding, parsing and analysis"""
+        metrics = self.instrumentation
+
+        while True:
+            with metrics.stage('decode_paths'):
+                item = next(path_items, None)
+            if item is None:
+                return
+
+            with metrics.stage('parse'):
+                endpoints = self._parse_path_item(*item)
+
+            for endpoint in endpoints:
+                with metrics.stage('analyze'):
+                    endpoint = self.analyzer.analyze_endpoint_requirements(endpoint)
+                yield endpoint
+
+    def _iter_parallel_endpoints(self, path_items: Iterator[Tuple[str, Dict[str, Any]]]) -> Iterator[EndpointInfo]:
+        """Shard path items across the pool while the stream is still being read"""
+        from utils import pipeline
+
+        started = time.perf_counter()
+        with pipeline.create_executor(self.executor, self.workers, self.parser.spec_data,
+                                      self._needs_fingerprints()) as executor:
+            chunks = pipeline.chunked(path_items, self.chunk_size)
+            for endpoints in pipeline.ordered_map(executor, pipeline.analyze_path_items,
+                                                  chunks, self.workers * 2):
+                yield from endpoints
+        self.instrumentation.add_time('parallel_parse_analyze', time.perf_counter() - started)
+
+    def _record_run_metrics(self, analysis: SwaggerAnalysis):
+        """Record counts and cache hit rates of the finished run"""
+        metrics = self.instrumentation
+        resolver = self.parser.resolver
+
+        metrics.count('endpoints', len(analysis.endpoints))
+        metrics.count('component_schemas', len(resolver.index))
+        metrics.count('resolved_schemas', resolver.resolved_count)
+        if analysis.change_set is not None:
+            metrics.count('reused_endpoints', len(analysis.change_set.unchanged))
+        if self.validation is not None:
+            metrics.count('validation_warnings', len(self.validation.warnings))
+
+        metrics.cache('ref_resolver', *resolver.stats())
+        if self.parser.cache is not None:
+            metrics.cache('spec_cache', self.parser.cache.hits, self.parser.cache.misses)
+        if self.snapshot_store is not None:
+            metrics.cache('snapshot_store', self.snapshot_store.hits, self.snapshot_store.misses)
+
+    def _iter_incremental_endpoints(self, stream: SpecStream,
+                                    previous: SwaggerAnalysis) -> Iterator[EndpointInfo]:
+        """Reuse unchanged endpoints of a previous analysis, re-analyze the rest.
+
+        Changed operations are expected to be few, so they are handled
+        serially regardless of the worker setting.
+        """
+        previous_endpoints = {ep.operation_id: ep for ep in previous.endpoints}
+
+        for path, path_item in self._checked_paths(stream):
+            path_parameters = path_item.get('parameters', [])
+            for method, operation in path_item.items():
+                if method.upper() not in [m.value for m in HttpMethod]:
+                    continue
+
+                method = method.upper()
+                fingerprint = self.parser.fingerprinter.fingerprint(path, method, operation, path_parameters)
+                old = previous_endpoints.get(self._operation_id(path, method, operation))
+
+                if old is not None and old.fingerprint == fingerprint:
+                    yield old
+                    continue
+
+                endpoint = self._parse_single_endpoint(path, method, operation, path_parameters, fingerprint)
+                if endpoint:
+                    yield self.analyzer.analyze_endpoint_requirements(endpoint)
+
     def _parse_all_endpoints(self, spec_data: Dict[str, Any]) -> List[EndpointInfo]:
         """Parse all endpoints from the specification"""
         endpoints = []
         paths = spec_data.get('paths', {})
 
         for path, path_item in paths.items():
-            for method, operation in path_item.items():
-                if method.upper() in [m.value for m in HttpMethod]:
-                    endpoint = self._parse_single_endpoint(path, method.upper(), operation)
-                    if endpoint:
-                        endpoints.append(endpoint)
+            endpoints.extend(self._parse_path_item(path, path_item))
+
+        return endpoints
+
+    def _parse_path_item(self, path: str, path_item: Dict[str, Any]) -> List[EndpointInfo]:
+        """Parse every operation of a single path item"""
+        endpoints = []
+        path_parameters = path_item.get('parameters', [])
+
+        for method, operation in path_item.items():
+            if method.upper() in [m.value for m in HttpMethod]:
+                endpoint = self._parse_single_endpoint(path, method.upper(), operation, path_parameters)
+                if endpoint:
+                    endpoints.append(endpoint)
 
         return endpoints
 
-    def _parse_single_endpoint(self, path: str, method: str, operation: Dict[str, Any]) -> EndpointInfo:
-        """Parse a single endpoint operation"""
+    def _parse_single_endpoint(self, path: str, method: str, operation: Dict[str, Any],
+                               path_parameters: List[Dict[str, Any]] = (),
+                               fingerprint: Optional[str] = None) -> EndpointInfo:
+        """Parse a single endpoint operation; path_parameters are the path item's shared ones"""
+        if fingerprint is None and self._needs_fingerprints():
+            fingerprint = self.parser.fingerprinter.fingerprint(path, method, operation, path_parameters)
+        parameters = self.parser.operation_parameters(path_parameters, operation)
 
         endpoint = EndpointInfo(
             path=path,
             method=HttpMethod(method),
-            operation_id=operation.get('operationId', f"{method}_{path}".replace('/', '_')),
+            operation_id=self._operation_id(path, method, operation),
             summary=operation.get('summary', ''),
             description=operation.get('description', ''),
             tags=operation.get('tags', []),
-            deprecated=operation.get('deprecated', False)
+            deprecated=operation.get('deprecated', False),
+            fingerprint=fingerprint or ''
         )
 
         # Parse parameters
-        if 'parameters' in operation:
-            endpoint.parameters = self.parser.parse_parameters(operation['parameters'])
+        if parameters:
+            endpoint.parameters = self.parser.parse_parameters(parameters)
 
-        # Parse request body
+        # Parse request body (Swagger 2.0 declares it as body/formData parameters)
         if 'requestBody' in operation:
             endpoint.request_body = self.parser.parse_request_body(operation['requestBody'])
+        elif parameters:
+            endpoint.request_body = self.parser.parse_body_parameters(
+                parameters, self.parser.media_types(operation, 'consumes'))
 
         # Parse responses
         if 'responses' in operation:
-            endpoint.responses = self.parser.parse_responses(operation['responses'])
+            endpoint.responses = self.parser.parse_responses(
+                operation['responses'], self.parser.media_types(operation, 'produces'))
 
         # Parse security (endpoint-specific)
         if 'security' in operation:
@@ -91,16 +358,30 @@ class InputInterpreterAgent:
 
         return endpoint
 
+    def _needs_fingerprints(self) -> bool:
+        return self.fingerprints or self.snapshot_store is not None
+
+    def _operation_id(self, path: str, method: str, operation: Dict[str, Any]) -> str:
+        """Return the declared operationId or one derived from method and path"""
+        return operation.get('operationId', f"{method}_{path}".replace('/', '_'))
+
     def _parse_endpoint_security(self, security: List[Dict[str, Any]]) -> List[SecurityRequirement]:
         """Parse endpoint-specific security requirements"""
         # Simplified - would need to reference global security definitions
         return []
 
     def get_endpoint_summary(self) -> Dict[str, Any]:
-        """Get a summary of all endpoints for the next agent"""
+        """Get a summary of all endpoints for the next agent.
+
+        The summary is cached on the analysis until it changes; treat it as
+        read-only.
+        """
         if not self.analysis_result:
             return {}
 
+        return self.analysis_result.cached('endpoint_summary', self._build_endpoint_summary)
+
+    def _build_endpoint_summary(self) -> Dict[str, Any]:
         summary = {
             'api_info': {
                 'title': self.analysis_result.title,
@@ -129,7 +410,11 @@ class InputInterpreterAgent:
         return summary
 
     def export_detailed_analysis(self) -> Dict[str, Any]:
-        """Export complete analysis for downstream agents"""
+        """Export complete analysis for downstream agents.
+
+        sample_data is a LazySampleData mapping: sample data is generated per
+        operation when it is first read (or all at once with materialize()).
+        """
         if not self.analysis_result:
             return {}
 
@@ -141,8 +426,230 @@ class InputInterpreterAgent:
                 ep.request_body.content_type for ep in self.analysis_result.endpoints
                 if ep.request_body
             ])),
-            'sample_data': {
-                ep.operation_id: self.analyzer.generate_sample_data(ep)
-                for ep in self.analysis_result.endpoints
-            }
-        }
\ No newline at end of file
+            'sample_data': LazySampleData(self.analysis_result, self.analyzer,
+                                          bulk=self._generate_all_sample_data)
+        }
+
+    def find_correlations(self, engine: Optional['CorrelationEngine'] = None) -> CorrelationGraph:
+        """Which response fields can feed which parameters (POST /pets $.id -> {petId}).
+
+        The default graph is cached on the analysis until its endpoints change.
+        """
+        if not self.analysis_result:
+            return CorrelationGraph()
+
+        from parsers.correlation import CorrelationEngine
+
+        analysis = self.analysis_result
+        with self.instrumentation.stage('correlate'):
+            if engine is None:
+                graph = analysis.cached('correlations',
+                                        lambda: CorrelationEngine().correlate(analysis.endpoints))
+            else:
+                graph = engine.correlate(analysis.endpoints)
+        self.instrumentation.count('correlations', len(graph.edges))
+        return graph
+
+    def validate_spec(self, source: str, level: str = FULL,
+                      background: bool = False) -> Union[ValidationReport, 'Future[ValidationReport]']:
+        """Validate a spec without analyzing it, 'structural' or 'full' (openapi-spec-validator).
+
+        Reports are cached by content hash, so an unchanged spec is validated
+        once. With background, the future of the report is returned at once.
+        """
+        stream = self.parser.open_stream(source, self.instrumentation)
+        if background:
+            return self.validator.submit(stream, level)
+
+        with stream, self.instrumentation.stage(f"validate_{level}"):
+            report = self.validator.validate(stream, level)
+        self.instrumentation.cache('spec_validation', self.validator.hits, self.validator.misses)
+        self.instrumentation.flush({'operation': 'validate_spec', 'source': source})
+
+        if report.valid:
+            print(f"✅ Spec is valid ({len(report.warnings)} warnings, {level} validation)")
+        else:
+            print(f"❌ Spec has {len(report.errors)} validation errors, first: {report.errors[0]}")
+        return report
+
+    def export_analysis(self, binary: bool = False) -> bytes:
+        """Serialize the current analysis (versioned JSON, or binary) for other processes"""
+        if not self.analysis_result:
+            return b''
+        from models.serialization import dumps_analysis
+        return dumps_analysis(self.analysis_result, binary=binary)
+
+    def load_analysis(self, data: bytes) -> SwaggerAnalysis:
+        """Load an analysis written by export_analysis instead of re-analyzing"""
+        from models.serialization import loads_analysis
+        self.analysis_result = loads_analysis(data)
+        return self.analysis_result
+
+    def export_data_files(self, output_dir: str, rows: int, shards: int = 1, seed: int = 0,
+                          batch_size: int = 10000, vectorized: bool = False) -> List[CsvWriteResult]:
+        """Write CSV Data Set files (rows per operation, split into shards) for JMeter threads.
+
+        vectorized=True draws numeric and enum columns with NumPy when it is
+        installed: faster, but not the same values as a run without NumPy.
+        """
+        if not self.analysis_result:
+            return []
+
+        from writers.csv_writer import CsvDataWriter
+        writer = CsvDataWriter(self.analyzer, batch_size=batch_size, seed=seed, vectorized=vectorized)
+        results = []
+
+        with self.instrumentation.stage('csv_write'):
+            for endpoint in self.analysis_result.endpoints:
+                result = writer.write(endpoint, output_dir, rows, shards=shards, workers=self.workers)
+                results.append(result)
+                self.instrumentation.count('csv_rows', result.rows)
+
+        total_rows = sum(r.rows for r in results)
+        total_seconds = sum(r.elapsed_seconds for r in results)
+        rate = total_rows / total_seconds if total_seconds else 0.0
+        print(f"✅ Wrote {total_rows} rows to {len(results) * max(1, shards)} files ({rate:,.0f} rows/s)")
+        self.instrumentation.flush({'operation': 'export_data_files'})
+
+        return results
+
+    def export_db_data(self, connect: Callable[[], Any], output_dir: str,
+                       mapping: Optional[Dict[str, str]] = None, limit: int = 0,
+                       sample: float = 1.0, seed: int = 0,
+                       chunk_rows: int = 10000) -> List[TableExtract]:
+        """Stream database rows into CSV Data Set files (users.email -> ${email}).
+
+        Parameters of the current analysis are bound to columns by name;
+        mapping ({variable: 'table.column'}) adds or overrides bindings.
+        """
+        from parsers.data_source import DataSource
+
+        source = DataSource(connect, chunk_rows=chunk_rows, seed=seed)
+        bindings = {}
+        if self.analysis_result:
+            with self.instrumentation.stage('db_introspect'):
+                bindings = source.map_parameters(self.analysis_result.endpoints)
+        bindings.update(mapping or {})
+        if not bindings:
+            print("⚠️ No parameters map to database columns")
+            return []
+
+        with self.instrumentation.stage('db_extract'):
+            results = source.extract(bindings, output_dir, limit=limit, sample=sample,
+                                     workers=self.workers)
+        for result in results:
+            self.instrumentation.count('db_rows', result.rows)
+        self.instrumentation.flush({'operation': 'export_db_data'})
+
+        print(f"✅ Wrote {sum(r.rows for r in results)} database rows for "
+              f"{len(bindings)} parameters to {len(results)} files")
+        return results
+
+    def optimize_plan(self, optimizer: Optional['PlanOptimizer'] = None) -> PlanOptimization:
+        """Optimized copy of the current analysis' endpoints, with its estimated cost"""
+        from writers.plan_optimizer import PlanOptimizer
+
+        endpoints = self.analysis_result.endpoints if self.analysis_result else []
+        return (optimizer or PlanOptimizer()).optimize(endpoints)
+
+    def export_jmx(self, output_path: str, source: Optional[str] = None, threads: int = 1,
+                   ramp_up: int = 1, loops: int = 1, csv_files: Iterable[str] = (),
+                   optimizer: Optional['PlanOptimizer'] = None,
+                   operation_csv_files: Optional[Dict[str, Sequence[str]]] = None) -> int:
+        """Write a JMeter test plan (.jmx) with one sampler per endpoint.
+
+        csv_files feed every sampler (e.g. export_db_data files); the files
+        of operation_csv_files ({operation_id: paths}, e.g. from
+        export_data_files) feed only their operation's sampler.
+
+        With a source, endpoints are streamed from the spec straight into the
+        file without building an analysis; otherwise the last analysis is used.
+        With an optimizer the plan is rewritten for a cheaper per-sample cost;
+        when streaming, headers are not hoisted since that needs every endpoint.
+        """
+        from writers.jmx_writer import write_jmx
+
+        options = {'threads': threads, 'ramp_up': ramp_up, 'loops': loops, 'csv_files': csv_files,
+                   'operation_csv_files': operation_csv_files}
+
+        if source is None:
+            if not self.analysis_result:
+                return 0
+            analysis = self.analysis_result
+            endpoints = analysis.endpoints
+            if optimizer is not None:
+                plan = optimizer.optimize(endpoints)
+                endpoints = plan.endpoints
+                options.update(shared_headers=plan.shared_headers,
+                               http_implementation=plan.http_implementation)
+            samplers = write_jmx(output_path, endpoints, test_name=analysis.title,
+                                 base_url=analysis.base_url, **options)
+        else:
+            with self.parser.open_stream(source, self.instrumentation) as stream:
+                spec_data = self.parser.load_spec(stream.header)
+                servers = self.parser.parse_servers(spec_data)
+                endpoints = self._iter_stream_endpoints(stream)
+                if optimizer is not None:
+                    endpoints = (optimizer.optimize_endpoint(ep, {}) for ep in endpoints)
+                    options['http_implementation'] = optimizer.http_implementation
+                samplers = write_jmx(output_path, endpoints,
+                                     test_name=spec_data.get('info', {}).get('title', 'API'),
+                                     base_url=servers[0] if servers else '', **options)
+
+        print(f"✅ Wrote {samplers} samplers to {output_path}")
+        return samplers
+
+    def export_sharded_plans(self, output_dir: str, nodes: int, target_rps: float,
+                             mix: Optional[Dict[str, float]] = None, rows: int = 0, seed: int = 0,
+                             latency_ms: float = 200.0,
+                             optimizer: Optional['PlanOptimizer'] = None) -> ShardPlan:
+        """Write one plan (and data shard) per JMeter worker node for a target rate and mix"""
+        if not self.analysis_result:
+            return ShardPlan(target_rps=target_rps)
+
+        from writers.plan_sharder import PlanSharder
+
+        analysis = self.analysis_result
+        sharder = PlanSharder(nodes, target_rps, mix=mix, latency_ms=latency_ms, optimizer=optimizer)
+        with self.instrumentation.stage('shard_plans'):
+            shard_plan = sharder.write(analysis.endpoints, output_dir, rows=rows, seed=seed,
+                                       test_name=analysis.title, base_url=analysis.base_url,
+                                       analyzer=self.analyzer)
+        self.instrumentation.flush({'operation': 'export_sharded_plans'})
+
+        print(f"✅ Wrote {nodes} node plans to {output_dir} (imbalance {shard_plan.imbalance:.3f})")
+        return shard_plan
+
+    def analyze_results(self, jtl_paths: Iterable[str], workers: Optional[int] = None,
+                        chunk_rows: int = 100_000, timestamp_format: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregate JMeter .jtl result files per operation of the current analysis"""
+        from parsers.jtl_parser import JtlParser
+
+        endpoints = self.analysis_result.endpoints if self.analysis_result else []
+        parser = JtlParser(endpoints, chunk_rows=chunk_rows, timestamp_format=timestamp_format)
+
+        with self.instrumentation.stage('jtl_ingest'):
+            stats = parser.parse_files(jtl_paths, workers=workers or self.workers)
+        self.instrumentation.flush({'operation': 'analyze_results'})
+
+        return parser.report(stats)
+
+    def _generate_all_sample_data(self, endpoints: List[EndpointInfo]) -> Dict[str, Dict[str, Any]]:
+        """Generate sample data per operation, in the pool for large analyses"""
+        if self.workers <= 1 or len(endpoints) < self.parallel_threshold:
+            with self.instrumentation.stage('sample_data'):
+                return {ep.operation_id: self.analyzer.generate_sample_data(ep) for ep in endpoints}
+
+        from utils import pipeline
+
+        sample_data = {}
+        with self.instrumentation.stage('sample_data'), \
+                pipeline.create_executor(self.executor, self.workers, self.parser.spec_data) as executor:
+            chunks = pipeline.chunked(endpoints, self.chunk_size)
+            results = pipeline.ordered_map(executor, pipeline.generate_sample_chunk,
+                                           chunks, self.workers * 2)
+            for chunk, samples in zip(pipeline.chunked(endpoints, self.chunk_size), results):
+                for ep, sample in zip(chunk, samples):
+                    sample_data[ep.operation_id] = sample
+
+        return sample_data
\ No newline at end of file
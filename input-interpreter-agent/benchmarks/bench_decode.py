@@ -0,0 +1,75 @@
+"""Decode benchmark: spec decoding time per format.
+
+Compares the previous Content-Type driven path (``response.text`` followed by
+``json.loads`` or pure-Python ``yaml.safe_load``) with ``decode_spec``, which
+sniffs the format from the bytes and uses orjson / libyaml when installed.
+
+    python benchmarks/bench_decode.py --paths 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+
+from benchmarks.spec_generator import generate_spec
+from parsers import spec_decoder
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--paths', type=int, default=1000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    spec = generate_spec(paths=args.paths)
+    payloads = {
+        'json': json.dumps(spec).encode('utf-8'),
+        'yaml': yaml.safe_dump(spec, sort_keys=False).encode('utf-8')
+    }
+
+    # Before: the decoder was picked from Content-Type, via response.text
+    legacy = {
+        'json (application/json)': lambda: json.loads(payloads['json'].decode('utf-8')),
+        'json (text/plain)': lambda: yaml.safe_load(payloads['json'].decode('utf-8')),
+        'yaml': lambda: yaml.safe_load(payloads['yaml'].decode('utf-8'))
+    }
+    current = {
+        'json (application/json)': lambda: spec_decoder.decode_spec(payloads['json']),
+        'json (text/plain)': lambda: spec_decoder.decode_spec(payloads['json']),
+        'yaml': lambda: spec_decoder.decode_spec(payloads['yaml'])
+    }
+
+    results = {
+        'json_decoder': 'orjson' if spec_decoder.orjson is not None else 'json',
+        'yaml_loader': getattr(yaml, 'CSafeLoader', yaml.SafeLoader).__name__,
+        'sizes_bytes': {fmt: len(data) for fmt, data in payloads.items()},
+        'formats': {}
+    }
+    for name in legacy:
+        before = best_of(legacy[name], args.repeat)
+        after = best_of(current[name], args.repeat)
+        results['formats'][name] = {
+            'before_s': round(before, 4),
+            'after_s': round(after, 4),
+            'speedup': round(before / after, 1) if after else None
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
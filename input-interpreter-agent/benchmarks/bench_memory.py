@@ -0,0 +1,97 @@
+"""Memory benchmark: retained bytes per analyzed endpoint.
+
+Runs the same synthetic spec through the agent twice: once with the current
+slotted/interned models and shared sub-objects, and once with plain
+(per-instance ``__dict__``) dataclasses and sharing disabled, which is how
+the models were laid out before.
+
+    python benchmarks/bench_memory.py --paths 5000
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent as agent_module
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from models import endpoint_model
+from parsers import swagger_parser
+
+
+def _plain_dataclass(cls):
+    """Re-declare a model as a regular dataclass without slots or interning"""
+    fields = [(f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+              for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(f"Plain{cls.__name__}", fields)
+
+
+@contextmanager
+def legacy_models():
+    """Swap in plain dataclasses and disable sub-object sharing"""
+    plain = {name: _plain_dataclass(getattr(endpoint_model, name))
+             for name in ('Parameter', 'RequestBody', 'Response', 'EndpointInfo')}
+
+    with mock.patch.object(swagger_parser, 'Parameter', plain['Parameter']), \
+            mock.patch.object(swagger_parser, 'RequestBody', plain['RequestBody']), \
+            mock.patch.object(swagger_parser, 'Response', plain['Response']), \
+            mock.patch.object(agent_module, 'EndpointInfo', plain['EndpointInfo']), \
+            mock.patch.object(swagger_parser.SwaggerParser, '_share', lambda self, key, build: build()):
+        yield
+
+
+def measure(spec_path: str) -> dict:
+    """Analyze the spec and report bytes retained by the endpoint objects"""
+    agent = InputInterpreterAgent()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    analysis = agent.process_swagger_url(spec_path)
+    # Drop per-spec parser state so only the analysis itself is counted
+    agent.parser.load_spec({})
+    gc.collect()
+
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {
+        'endpoints': len(analysis.endpoints),
+        'retained_bytes': retained,
+        'bytes_per_endpoint': round(retained / max(len(analysis.endpoints), 1), 1)
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--paths', type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        spec_path = os.path.join(tmp_dir, 'spec.json')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump(generate_spec(paths=args.paths), f)
+
+        with legacy_models():
+            before = measure(spec_path)
+        after = measure(spec_path)
+
+    result = {
+        'before': before,
+        'after': after,
+        'reduction': round(1 - after['retained_bytes'] / max(before['retained_bytes'], 1), 3)
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
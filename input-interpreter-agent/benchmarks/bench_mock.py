@@ -0,0 +1,111 @@
+"""Mock server benchmark: requests per second the local stub sustains.
+
+Analyzes a synthetic spec, serves it with utils.mock_server in a separate
+process and drives it from asyncio clients over keep-alive connections,
+each keeping --pipeline requests in flight.
+
+    python benchmarks/bench_mock.py --paths 200 --connections 64 --seconds 5
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from utils.mock_server import MockServer, LatencyModel, new_event_loop
+
+
+def serve(spec_path: str, latency: str, port_queue: multiprocessing.Queue):
+    """Child process: analyze the spec and serve it until terminated"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        analysis = InputInterpreterAgent().process_swagger_url(spec_path)
+    server = MockServer(analysis, LatencyModel(LatencyModel.parse(latency)) if latency else None)
+
+    loop = new_event_loop()
+    asyncio.set_event_loop(loop)
+    port_queue.put(loop.run_until_complete(server.start()))
+    loop.run_forever()
+
+
+async def drive(port: int, targets: List[bytes], connections: int, pipeline: int,
+                seconds: float) -> Tuple[int, List[float]]:
+    """Run clients for a while; returns (responses, per-batch latencies)"""
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+    counts = [0] * connections
+
+    async def client(index: int):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        requests = [b'GET ' + targets[(index + i) % len(targets)] + b' HTTP/1.1\r\nHost: mock\r\n\r\n'
+                    for i in range(pipeline)]
+        batch = b''.join(requests)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(batch)
+            for _ in range(pipeline):
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.lower().split(b'content-length:', 1)[1].split(b'\r\n', 1)[0])
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            counts[index] += pipeline
+        writer.close()
+
+    await asyncio.gather(*(client(i) for i in range(connections)))
+    return sum(counts), latencies
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--paths', type=int, default=200)
+    arg_parser.add_argument('--connections', type=int, default=64)
+    arg_parser.add_argument('--pipeline', type=int, default=8)
+    arg_parser.add_argument('--seconds', type=float, default=5)
+    arg_parser.add_argument('--latency', default='', help="e.g. 'lognormal:20:0.5' (default: none)")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        spec_path = os.path.join(tmp_dir, 'spec.json')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump(generate_spec(paths=args.paths), f)
+
+        port_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=serve, args=(spec_path, args.latency, port_queue),
+                                          daemon=True)
+        process.start()
+        try:
+            port = port_queue.get(timeout=60)
+            targets = [f"/api/resources{i}/{i + 1}".encode('ascii') for i in range(args.paths)]
+            loop = new_event_loop()
+            try:
+                responses, latencies = loop.run_until_complete(
+                    drive(port, targets, args.connections, args.pipeline, args.seconds))
+            finally:
+                loop.close()
+        finally:
+            process.terminate()
+            process.join()
+
+    latencies.sort()
+    print(json.dumps({
+        'connections': args.connections,
+        'pipeline': args.pipeline,
+        'latency': args.latency or None,
+        'responses': responses,
+        'requests_per_second': round(responses / args.seconds),
+        'batch_p50_ms': round(latencies[len(latencies) // 2] * 1000, 3) if latencies else None,
+        'batch_p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 3) if latencies else None
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
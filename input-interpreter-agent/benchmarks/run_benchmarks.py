@@ -0,0 +1,238 @@
+"""Offline benchmark suite for the Input Interpreter Agent.
+
+Generates a synthetic spec, serves it from a local HTTP server and times each
+stage of the pipeline: fetch, decode, _parse_all_endpoints, analyze,
+get_endpoint_summary, correlation detection, structural spec validation,
+export_detailed_analysis, analysis serialization and the end-to-end
+process_swagger_url, cold and warm from the snapshot store. Peak memory per
+stage is tracked with tracemalloc.
+
+    python benchmarks/run_benchmarks.py --paths 2000 --output results.json
+    python benchmarks/run_benchmarks.py --paths 2000 --save-baseline baseline.json
+    python benchmarks/run_benchmarks.py --paths 2000 --baseline baseline.json
+
+With --baseline the exit status is 1 when any stage is slower than the
+baseline by more than --threshold (default 20%).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from parsers.correlation import CorrelationEngine
+from parsers.snapshot_store import AnalysisSnapshotStore
+from parsers.spec_decoder import decode_spec
+from parsers.spec_validator import SpecValidator, STRUCTURAL
+from models.endpoint_model import ValidationReport
+
+
+@contextmanager
+def serve_bytes(payload: bytes, content_type: str = 'application/json') -> Iterator[str]:
+    """Serve a payload from a local HTTP server, yielding its URL"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/spec.json"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def measure(fn: Callable[[], Any], repeat: int, track_memory: bool) -> Dict[str, Any]:
+    """Best-of-N wall time, plus peak traced memory of one extra run"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    result = {'seconds': round(min(timings), 6)}
+
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result
+
+
+def run_suite(knobs: Dict[str, Any], repeat: int = 3, track_memory: bool = True) -> Dict[str, Any]:
+    """Run every stage against a spec generated from knobs"""
+    payload = json.dumps(generate_spec(**knobs)).encode('utf-8')
+    stages = {}
+
+    with serve_bytes(payload) as url:
+        session = requests.Session()
+        stages['fetch'] = measure(lambda: session.get(url, timeout=30).content, repeat, track_memory)
+        session.close()
+
+        stages['decode'] = measure(lambda: decode_spec(payload), repeat, track_memory)
+
+        agent = InputInterpreterAgent()
+        spec_data = agent.parser.load_spec(decode_spec(payload))
+        endpoints: List[Any] = []
+
+        def parse():
+            endpoints[:] = agent._parse_all_endpoints(spec_data)
+
+        def analyze():
+            for endpoint in endpoints:
+                agent.analyzer.analyze_endpoint_requirements(endpoint)
+
+        def validate():
+            # A fresh validator each time: the structural pass itself, not its cache
+            report = ValidationReport(level=STRUCTURAL)
+            for _ in SpecValidator().check(spec_data, spec_data['paths'].items(), report):
+                pass
+
+        stages['parse_all_endpoints'] = measure(parse, repeat, track_memory)
+        stages['analyze'] = measure(analyze, repeat, track_memory)
+        stages['validate_structural'] = measure(validate, repeat, track_memory)
+
+        # Quiet the progress output of the end-to-end runs
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                stages['process_swagger_url'] = measure(
+                    lambda: agent.process_swagger_url(url), repeat, track_memory)
+
+                # Snapshot store: cold runs analyze and store, warm runs only load
+                with tempfile.TemporaryDirectory() as snapshot_dir:
+                    store = AnalysisSnapshotStore(snapshot_dir)
+                    snapshot_agent = InputInterpreterAgent(snapshot_store=store)
+
+                    def cold_start():
+                        store.invalidate()
+                        snapshot_agent.process_swagger_url(url)
+
+                    stages['snapshot_cold_start'] = measure(cold_start, repeat, track_memory)
+                    stages['snapshot_warm_start'] = measure(
+                        lambda: snapshot_agent.process_swagger_url(url), repeat, track_memory)
+            finally:
+                sys.stdout = stdout
+
+        stages['get_endpoint_summary'] = measure(agent.get_endpoint_summary, repeat, track_memory)
+        stages['correlate'] = measure(lambda: CorrelationEngine().correlate(agent.analysis_result.endpoints),
+                                      repeat, track_memory)
+        stages['export_detailed_analysis'] = measure(
+            lambda: agent.export_detailed_analysis()['sample_data'].materialize(), repeat, track_memory)
+        stages['dump_analysis'] = measure(agent.export_analysis, repeat, track_memory)
+        stages['dump_analysis_binary'] = measure(lambda: agent.export_analysis(binary=True),
+                                                 repeat, track_memory)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'spec_bytes': len(payload),
+            'endpoints': len(endpoints),
+            'knobs': knobs
+        },
+        'stages': stages
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a message for every stage slower than baseline beyond threshold"""
+    regressions = []
+
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous or not previous.get('seconds'):
+            continue
+
+        ratio = current['seconds'] / previous['seconds']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{stage}: {previous['seconds']:.4f}s -> {current['seconds']:.4f}s ({ratio:.2f}x)")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--spec-version', default='3', choices=['2', '3'])
+    arg_parser.add_argument('--paths', type=int, default=500)
+    arg_parser.add_argument('--params', type=int, default=3)
+    arg_parser.add_argument('--depth', type=int, default=2)
+    arg_parser.add_argument('--ref-fanout', type=int, default=2)
+    arg_parser.add_argument('--response-variants', type=int, default=2)
+    arg_parser.add_argument('--models', type=int, default=50)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc peak tracking')
+    arg_parser.add_argument('--output', help='write results JSON to this file')
+    arg_parser.add_argument('--baseline', help='compare against a saved results JSON')
+    arg_parser.add_argument('--save-baseline', help='write results as the new baseline')
+    arg_parser.add_argument('--threshold', type=float, default=0.2)
+    args = arg_parser.parse_args(argv)
+
+    knobs = {
+        'version': args.spec_version,
+        'paths': args.paths,
+        'params': args.params,
+        'depth': args.depth,
+        'ref_fanout': args.ref_fanout,
+        'response_variants': args.response_variants,
+        'models': args.models
+    }
+    results = run_suite(knobs, repeat=args.repeat, track_memory=not args.no_memory)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('knobs') != knobs:
+            print("⚠️ Baseline was recorded with different generator knobs")
+
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"❌ Regression: {message}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
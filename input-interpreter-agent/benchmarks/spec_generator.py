@@ -0,0 +1,153 @@
+"""Synthetic OpenAPI 2/3 specification generator for benchmarks.
+
+Every knob scales one dimension of a real-world spec:
+
+* ``paths``             number of path items (each has a GET and a POST)
+* ``params``            query/header parameters per GET operation
+* ``depth``             nesting depth of inline objects inside each model
+* ``ref_fanout``        other models each model references
+* ``response_variants`` extra error responses per operation
+* ``models``            number of shared component schemas
+
+Both versions carry the same operations, parameters, bodies and response
+schemas in the constructs their parser consumes (path-level parameters,
+Swagger 2.0 body parameters, response schemas with produces), so every
+knob adds schema work to the parse rather than data the parser skips.
+Output is deterministic for a given set of knobs.
+"""
+from typing import Dict, Any, List
+
+
+def generate_spec(version: str = '3', paths: int = 100, params: int = 3, depth: int = 2,
+                  ref_fanout: int = 2, response_variants: int = 2, models: int = 50) -> Dict[str, Any]:
+    """Build an OpenAPI 3.0 (version='3') or Swagger 2.0 (version='2') spec"""
+    models = max(models, 1)
+    swagger2 = str(version).startswith('2')
+    ref_prefix = '#/definitions/' if swagger2 else '#/components/schemas/'
+    ref = '#/parameters/ResourceId' if swagger2 else '#/components/parameters/ResourceId'
+
+    schemas = {f"Model{k}": _model(k, models, depth, ref_fanout, ref_prefix) for k in range(models)}
+
+    path_items = {}
+    for i in range(paths):
+        model_ref = {'$ref': f"{ref_prefix}Model{i % models}"}
+        path_items[f"/resources{i}/{{resourceId}}"] = {
+            # Reaches both operations through the path-level parameters only
+            'parameters': [{'$ref': ref}],
+            'get': {
+                'operationId': f"getResource{i}",
+                'summary': f"Get resource {i}",
+                'tags': [f"group{i % 10}"],
+                'parameters': _parameters(params, swagger2),
+                'responses': _responses(model_ref, response_variants, swagger2)
+            },
+            'post': {
+                'operationId': f"createResource{i}",
+                'summary': f"Create resource {i}",
+                'tags': [f"group{i % 10}"],
+                **_request_body(model_ref, swagger2),
+                'responses': _responses(model_ref, response_variants, swagger2, success='201')
+            }
+        }
+
+    info = {'title': 'Synthetic API', 'version': '1.0.0', 'description': 'Generated for benchmarks'}
+
+    if swagger2:
+        return {
+            'swagger': '2.0',
+            'info': info,
+            'host': 'localhost:8080',
+            'basePath': '/api',
+            'schemes': ['http'],
+            'consumes': ['application/json'],
+            'produces': ['application/json', 'application/xml'],
+            'securityDefinitions': {'apiKey': {'type': 'apiKey', 'in': 'header', 'name': 'X-API-Key'}},
+            'paths': path_items,
+            'definitions': schemas,
+            'parameters': {'ResourceId': _path_parameter(swagger2)}
+        }
+
+    return {
+        'openapi': '3.0.0',
+        'info': info,
+        'servers': [{'url': 'http://localhost:8080/api'}],
+        'paths': path_items,
+        'components': {
+            'schemas': schemas,
+            'parameters': {'ResourceId': _path_parameter(swagger2)},
+            'securitySchemes': {'bearer': {'type': 'http', 'scheme': 'bearer'}}
+        }
+    }
+
+
+def _model(k: int, models: int, depth: int, ref_fanout: int, ref_prefix: str) -> Dict[str, Any]:
+    properties = {
+        'id': {'type': 'integer', 'format': 'int64'},
+        'name': {'type': 'string', 'example': f"name{k}"},
+        'status': {'type': 'string', 'enum': ['active', 'inactive', 'pending']},
+        'createdAt': {'type': 'string', 'format': 'date-time'}
+    }
+    for j in range(1, ref_fanout + 1):
+        properties[f"related{j}"] = {'$ref': f"{ref_prefix}Model{(k + j) % models}"}
+
+    node = properties
+    for level in range(depth):
+        child = {'value': {'type': 'number'}, 'label': {'type': 'string'}}
+        node[f"nested{level}"] = {'type': 'object', 'required': ['value'], 'properties': child}
+        node = child
+
+    return {'type': 'object', 'required': ['id', 'name'], 'properties': properties}
+
+
+def _path_parameter(swagger2: bool) -> Dict[str, Any]:
+    if swagger2:
+        return {'name': 'resourceId', 'in': 'path', 'required': True, 'type': 'integer'}
+    return {'name': 'resourceId', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}
+
+
+def _parameters(count: int, swagger2: bool) -> List[Dict[str, Any]]:
+    parameters = []
+
+    for p in range(count):
+        location = 'header' if p % 4 == 3 else 'query'
+        name = f"X-Param-{p}" if location == 'header' else f"param{p}"
+        schema = {'type': 'integer', 'minimum': 1, 'maximum': 100} if p % 2 else {'type': 'string'}
+        param = {'name': name, 'in': location, 'required': p % 3 == 0}
+        if swagger2:
+            param.update(schema)
+        else:
+            param['schema'] = schema
+        parameters.append(param)
+
+    return parameters
+
+
+def _request_body(model_ref: Dict[str, Any], swagger2: bool) -> Dict[str, Any]:
+    if swagger2:
+        return {'parameters': [{'name': 'body', 'in': 'body', 'required': True, 'schema': model_ref}]}
+    return {'requestBody': {'required': True, 'content': {'application/json': {'schema': model_ref}}}}
+
+
+def _responses(model_ref: Dict[str, Any], variants: int, swagger2: bool,
+               success: str = '200') -> Dict[str, Any]:
+    error_codes = ['400', '401', '403', '404', '409', '422', '429', '500', '503']
+    error_schema = {'type': 'object', 'properties': {
+        'code': {'type': 'integer'}, 'message': {'type': 'string'}}}
+
+    if swagger2:
+        # Media types come from the spec's produces
+        responses = {success: {'description': 'successful operation', 'schema': model_ref}}
+        for code in error_codes[:variants]:
+            responses[code] = {'description': f"Error {code}", 'schema': error_schema}
+        return responses
+
+    responses = {success: {'description': 'successful operation', 'content': {
+        'application/json': {'schema': model_ref},
+        'application/xml': {'schema': model_ref}
+    }}}
+    for code in error_codes[:variants]:
+        responses[code] = {'description': f"Error {code}", 'content': {
+            'application/json': {'schema': error_schema},
+            'application/xml': {'schema': error_schema}
+        }}
+    return responses
@@ -1,6 +1,16 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+import sys
+from dataclasses import dataclass, field, replace
+from itertools import count
+from typing import Dict, List, Optional, Any, Callable, Tuple, Union
 from enum import Enum
+from urllib.parse import urlsplit
+
+from utils.path_trie import PathTrie
+
+
+def _intern(value: Any) -> Any:
+    """Intern short, highly repeated strings such as locations and media types"""
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class HttpMethod(Enum):
@@ -21,7 +31,10 @@ class AuthType(Enum):
     OAUTH2 = "oauth2"
 
 
-@dataclass
+# Parameters and responses are shared between operations that reference the
+# same component, so they are frozen: give an endpoint a changed copy with
+# dataclasses.replace() instead of editing one in place.
+@dataclass(slots=True, frozen=True)
 class Parameter:
     name: str
     location: str  # query, header, path, body
@@ -32,17 +45,25 @@ class Parameter:
     enum_values: List[str] = field(default_factory=list)
     format: Optional[str] = None
     example: Any = None
+    schema: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        for name in ('name', 'location', 'type', 'format'):
+            object.__setattr__(self, name, _intern(getattr(self, name)))
 
-@dataclass
+
+@dataclass(slots=True)
 class RequestBody:
     content_type: str
     schema: Dict[str, Any]
     required: bool = True
     examples: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        self.content_type = _intern(self.content_type)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Response:
     status_code: str
     description: str
@@ -50,6 +71,10 @@ class Response:
     schema: Dict[str, Any] = field(default_factory=dict)
     headers: Dict[str, str] = field(default_factory=dict)
 
+    def __post_init__(self):
+        for name in ('status_code', 'description', 'content_type'):
+            object.__setattr__(self, name, _intern(getattr(self, name)))
+
 
 @dataclass
 class SecurityRequirement:
@@ -60,7 +85,7 @@ class SecurityRequirement:
     flows: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class EndpointInfo:
     path: str
     method: HttpMethod
@@ -79,13 +104,379 @@ class EndpointInfo:
     response_assertions: List[str] = field(default_factory=list)
     headers_required: Dict[str, str] = field(default_factory=dict)
 
+    # Content hash of the operation and the components it references
+    fingerprint: str = ""
+
+    def __post_init__(self):
+        self.path = _intern(self.path)
+
+
+@dataclass
+class ChangeSet:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'added': self.added,
+            'removed': self.removed,
+            'modified': self.modified,
+            'unchanged_count': len(self.unchanged)
+        }
+
+
+_versions = count(1)
+
+
+class EndpointList(list):
+    """A list of endpoints that changes its version on every mutation.
+
+    Versions come from one global counter, so replacing the list also
+    changes the version seen by whoever holds indexes built from it.
+    """
+
+    __slots__ = ('version',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = next(_versions)
+
+    def _mutated(self):
+        self.version = next(_versions)
+
+
+def _mutator(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._mutated()
+        return self if name in ('__iadd__', '__imul__') else result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(EndpointList, _name, _mutator(_name))
+
 
 @dataclass
 class SwaggerAnalysis:
+    """Result of analyzing one spec, with lazily built lookup indexes.
+
+    Indexes are rebuilt after endpoints are added, removed or replaced, or
+    after any other field is assigned. Editing an EndpointInfo in place
+    (e.g. changing its operation_id) is not observed: call
+    invalidate_indexes() afterwards.
+    """
+
     base_url: str
     title: str
     version: str
     description: str
     endpoints: List[EndpointInfo] = field(default_factory=list)
     global_security: List[SecurityRequirement] = field(default_factory=list)
-    servers: List[str] = field(default_factory=list)
\ No newline at end of file
+    servers: List[str] = field(default_factory=list)
+    change_set: Optional[ChangeSet] = None
+
+    def __setattr__(self, name: str, value: Any):
+        if name == 'endpoints' and not isinstance(value, EndpointList):
+            value = EndpointList(value)
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            self.invalidate_indexes()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if k not in ('_indexes', '_indexed_version')}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def invalidate_indexes(self):
+        """Drop every index; they are rebuilt on next use"""
+        object.__setattr__(self, '_indexes', {})
+        object.__setattr__(self, '_indexed_version', None)
+
+    def cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """Memoize a value derived from this analysis until it changes"""
+        indexes = self.__dict__.get('_indexes')
+        if indexes is None or self._indexed_version != self.endpoints.version:
+            self.invalidate_indexes()
+            object.__setattr__(self, '_indexed_version', self.endpoints.version)
+            indexes = self._indexes
+
+        value = indexes.get(name)
+        if value is None:
+            value = indexes[name] = build()
+        return value
+
+    def get_endpoint(self, operation_id: str) -> Optional[EndpointInfo]:
+        """Endpoint by operation_id"""
+        return self.cached('operation_id', self._build_operation_index).get(operation_id)
+
+    def endpoints_by_tag(self, tag: str) -> Tuple[EndpointInfo, ...]:
+        return self.cached('tag', self._build_tag_index).get(tag, ())
+
+    def endpoints_by_method(self, method: Union[str, HttpMethod]) -> Tuple[EndpointInfo, ...]:
+        key = method.value if isinstance(method, HttpMethod) else method.upper()
+        return self.cached('method', self._build_method_index).get(key, ())
+
+    def match_path(self, path: str, method: Union[str, HttpMethod, None] = None
+                   ) -> Optional[Tuple[EndpointInfo, Dict[str, str]]]:
+        """Match a concrete path or URL (``/pets/42``) to its endpoint and path parameters.
+
+        The base URL's path prefix and any query string are ignored. Without a
+        method the first operation declared on the matching path is returned.
+        """
+        if '://' in path or '?' in path:
+            path = urlsplit(path).path
+        base_path, trie = self.cached('router', self._build_router)
+        if base_path and (path == base_path or path.startswith(base_path + '/')):
+            path = path[len(base_path):]
+
+        found = trie.match(path)
+        if found is None:
+            return None
+
+        operations, params = found
+        if method is None:
+            return next(iter(operations.values())), params
+
+        key = method.value if isinstance(method, HttpMethod) else method.upper()
+        endpoint = operations.get(key)
+        return (endpoint, params) if endpoint is not None else None
+
+    def _build_operation_index(self) -> Dict[str, EndpointInfo]:
+        return {ep.operation_id: ep for ep in self.endpoints}
+
+    def _build_tag_index(self) -> Dict[str, Tuple[EndpointInfo, ...]]:
+        index: Dict[str, List[EndpointInfo]] = {}
+        for ep in self.endpoints:
+            for tag in ep.tags:
+                index.setdefault(tag, []).append(ep)
+        return {tag: tuple(eps) for tag, eps in index.items()}
+
+    def _build_method_index(self) -> Dict[str, Tuple[EndpointInfo, ...]]:
+        index: Dict[str, List[EndpointInfo]] = {}
+        for ep in self.endpoints:
+            index.setdefault(ep.method.value, []).append(ep)
+        return {method: tuple(eps) for method, eps in index.items()}
+
+    def _build_router(self) -> Tuple[str, PathTrie]:
+        operations: Dict[str, Dict[str, EndpointInfo]] = {}
+        for ep in self.endpoints:
+            operations.setdefault(ep.path, {}).setdefault(ep.method.value, ep)
+
+        trie = PathTrie()
+        for template, by_method in operations.items():
+            trie.insert(template, by_method)
+        return urlsplit(self.base_url).path.rstrip('/'), trie
+
+
+@dataclass
+class BatchResult:
+    url: str
+    analysis: Optional[SwaggerAnalysis] = None
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class CsvWriteResult:
+    operation_id: str
+    files: List[str] = field(default_factory=list)
+    rows: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class TableExtract:
+    """One table streamed into a CSV Data Set file"""
+
+    table: str
+    path: str
+    columns: Dict[str, str] = field(default_factory=dict)  # JMeter variable -> column
+    rows: int = 0
+    scanned: int = 0  # rows read from the database before sampling
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.scanned / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class PlanOptimization:
+    """A JMeter plan rewritten for a cheaper per-sample cost on the injector.
+
+    Costs are relative estimates in microseconds of injector CPU per sample
+    (network and server time excluded), averaged over the plan's samplers.
+    """
+
+    endpoints: List[EndpointInfo] = field(default_factory=list)
+    shared_headers: Dict[str, str] = field(default_factory=dict)
+    http_implementation: str = ''
+    jmeter_properties: Dict[str, str] = field(default_factory=dict)
+    cost_before_us: float = 0.0
+    cost_after_us: float = 0.0
+    changes: List[str] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float:
+        return self.cost_before_us / self.cost_after_us if self.cost_after_us else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'samplers': len(self.endpoints),
+            'shared_headers': self.shared_headers,
+            'http_implementation': self.http_implementation,
+            'jmeter_properties': self.jmeter_properties,
+            'cost_before_us': round(self.cost_before_us, 1),
+            'cost_after_us': round(self.cost_after_us, 1),
+            'speedup': round(self.speedup, 2),
+            'changes': self.changes
+        }
+
+
+@dataclass
+class NodeShard:
+    """What one JMeter worker node runs: its operations and their request rates"""
+
+    node: int
+    operations: Dict[str, float] = field(default_factory=dict)  # operation_id -> requests/s
+    threads: int = 1
+    load_us: float = 0.0  # estimated injector CPU per second of load
+    plan_path: str = ''
+    data_files: List[str] = field(default_factory=list)
+
+    @property
+    def rps(self) -> float:
+        return sum(self.operations.values())
+
+
+@dataclass
+class ShardPlan:
+    target_rps: float
+    nodes: List[NodeShard] = field(default_factory=list)
+
+    @property
+    def imbalance(self) -> float:
+        """Most loaded node relative to the mean (1.0 is perfectly even)"""
+        loads = [node.load_us for node in self.nodes]
+        mean = sum(loads) / len(loads) if loads else 0.0
+        return max(loads) / mean if mean else 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'target_rps': self.target_rps,
+            'imbalance': round(self.imbalance, 4),
+            'nodes': [{
+                'node': node.node,
+                'rps': round(node.rps, 3),
+                'threads': node.threads,
+                'load_us': round(node.load_us, 1),
+                'operations': {op: round(rps, 3) for op, rps in node.operations.items()},
+                'plan_path': node.plan_path,
+                'data_files': node.data_files
+            } for node in self.nodes]
+        }
+
+
+@dataclass
+class Correlation:
+    """A response value of one operation that can feed a parameter of another"""
+
+    producer: str  # operation_id
+    source: str  # JSON Path into the producer's response, e.g. $.id
+    consumer: str  # operation_id
+    target: str  # parameter name, or JSON Path into the request body
+    location: str  # path, query, header, cookie, body
+    kind: str  # 'qualified' (petId <- $.id of /pets) or 'name' (petId <- $.petId)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'producer': self.producer, 'source': self.source, 'consumer': self.consumer,
+                'target': self.target, 'location': self.location, 'kind': self.kind}
+
+
+@dataclass
+class CorrelationGraph:
+    edges: List[Correlation] = field(default_factory=list)
+
+    def producers_of(self, operation_id: str) -> List[Correlation]:
+        """Edges feeding the parameters of operation_id, best producer first per target"""
+        return [edge for edge in self.edges if edge.consumer == operation_id]
+
+    def consumers_of(self, operation_id: str) -> List[Correlation]:
+        return [edge for edge in self.edges if edge.producer == operation_id]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'edges': [edge.to_dict() for edge in self.edges]}
+
+
+@dataclass
+class ValidationIssue:
+    location: str  # e.g. 'GET /pets/{petId} responses.200', or 'info'
+    message: str
+    severity: str = 'error'  # 'error' breaks parsing (or the full validator), 'warning' does not
+
+    def __str__(self) -> str:
+        return f"{self.location}: {self.message}" if self.location else self.message
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'location': self.location, 'message': self.message, 'severity': self.severity}
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating one spec at one level ('structural' or 'full')"""
+
+    level: str
+    digest: str = ''  # SHA-256 of the spec content; reports are cached under it
+    issues: List[ValidationIssue] = field(default_factory=list)
+    operations: int = 0
+    elapsed_seconds: float = 0.0
+    cached: bool = False
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == 'error']
+
+    @property
+    def warnings(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == 'warning']
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def copy(self, **changes) -> 'ValidationReport':
+        return replace(self, issues=list(self.issues), **changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'level': self.level,
+            'digest': self.digest,
+            'valid': self.valid,
+            'operations': self.operations,
+            'elapsed_seconds': round(self.elapsed_seconds, 4),
+            'issues': [issue.to_dict() for issue in self.issues]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ValidationReport':
+        return cls(level=data['level'], digest=data['digest'], operations=data['operations'],
+                   elapsed_seconds=data['elapsed_seconds'],
+                   issues=[ValidationIssue(**issue) for issue in data['issues']])
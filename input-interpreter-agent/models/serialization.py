@@ -0,0 +1,245 @@
+import json
+import marshal
+from typing import Dict, Any, List
+
+from models.endpoint_model import *
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+
+FORMAT_NAME = 'swagger-analysis'
+FORMAT_VERSION = 1
+BINARY_MAGIC = b'SWA\x01'
+SHARED = '$shared'
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def dumps_analysis(analysis: SwaggerAnalysis, binary: bool = False) -> bytes:
+    """Serialize an analysis to compact JSON, or to a faster binary form.
+
+    The binary form is ``marshal`` data and is meant for processes running
+    the same Python version, e.g. a local cache or a worker pool.
+    """
+    data = analysis_to_dict(analysis)
+    if binary:
+        return BINARY_MAGIC + marshal.dumps(data)
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def loads_analysis(data: bytes) -> SwaggerAnalysis:
+    """Load an analysis written by dumps_analysis (either form)"""
+    if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return analysis_from_dict(marshal.loads(memoryview(data)[len(BINARY_MAGIC):]))
+    return analysis_from_dict(orjson.loads(data) if orjson is not None else json.loads(data))
+
+
+def analysis_to_dict(analysis: SwaggerAnalysis) -> Dict[str, Any]:
+    """Plain-data form of an analysis.
+
+    Parameters and responses shared between endpoints are stored once and
+    referenced by index, and schema nodes reached more than once (resolved
+    components) are stored once in a node table, so shared structure stays
+    shared after a round trip.
+    """
+    encoder = _SharedEncoder()
+    parameters: List[Parameter] = []
+    responses: List[Response] = []
+    parameter_ids: Dict[int, int] = {}
+    response_ids: Dict[int, int] = {}
+
+    for endpoint in analysis.endpoints:
+        for param in endpoint.parameters:
+            if id(param) not in parameter_ids:
+                parameter_ids[id(param)] = len(parameters)
+                parameters.append(param)
+                encoder.scan(param.schema)
+        for response in endpoint.responses:
+            if id(response) not in response_ids:
+                response_ids[id(response)] = len(responses)
+                responses.append(response)
+                encoder.scan(response.schema)
+                encoder.scan(response.headers)
+        if endpoint.request_body:
+            encoder.scan(endpoint.request_body.schema)
+            encoder.scan(endpoint.request_body.examples)
+
+    return {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'base_url': analysis.base_url,
+        'title': analysis.title,
+        'api_version': analysis.version,
+        'description': analysis.description,
+        'servers': list(analysis.servers),
+        'global_security': [_security_to_dict(s, encoder) for s in analysis.global_security],
+        'change_set': _change_set_to_dict(analysis.change_set),
+        'parameters': [[p.name, p.location, p.type, p.required, encoder.encode(p.default_value),
+                        p.description, encoder.encode(list(p.enum_values)), p.format,
+                        encoder.encode(p.example), encoder.encode(p.schema)]
+                       for p in parameters],
+        'responses': [[r.status_code, r.description, r.content_type, encoder.encode(r.schema),
+                       encoder.encode(r.headers)] for r in responses],
+        'endpoints': [{
+            'path': ep.path,
+            'method': ep.method.value,
+            'operation_id': ep.operation_id,
+            'summary': ep.summary,
+            'description': ep.description,
+            'tags': list(ep.tags),
+            'parameters': [parameter_ids[id(p)] for p in ep.parameters],
+            'request_body': _request_body_to_list(ep.request_body, encoder),
+            'responses': [response_ids[id(r)] for r in ep.responses],
+            'security': [_security_to_dict(s, encoder) for s in ep.security],
+            'deprecated': ep.deprecated,
+            'expected_response_codes': list(ep.expected_response_codes),
+            'response_assertions': list(ep.response_assertions),
+            'headers_required': dict(ep.headers_required),
+            'fingerprint': ep.fingerprint
+        } for ep in analysis.endpoints],
+        'nodes': encoder.table
+    }
+
+
+def analysis_from_dict(data: Dict[str, Any]) -> SwaggerAnalysis:
+    if data.get('format') != FORMAT_NAME:
+        raise ValueError("Not a serialized SwaggerAnalysis")
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported analysis format version: {data.get('version')}")
+
+    decoder = _SharedDecoder(data['nodes'])
+    parameters = [
+        Parameter(name=p[0], location=p[1], type=p[2], required=p[3], default_value=decoder.decode(p[4]),
+                  description=p[5], enum_values=decoder.decode(p[6]), format=p[7],
+                  example=decoder.decode(p[8]), schema=decoder.decode(p[9]))
+        for p in data['parameters']]
+    responses = [
+        Response(status_code=r[0], description=r[1], content_type=r[2],
+                 schema=decoder.decode(r[3]), headers=decoder.decode(r[4]))
+        for r in data['responses']]
+
+    endpoints = []
+    for ep in data['endpoints']:
+        body = ep['request_body']
+        endpoints.append(EndpointInfo(
+            path=ep['path'],
+            method=HttpMethod(ep['method']),
+            operation_id=ep['operation_id'],
+            summary=ep['summary'],
+            description=ep['description'],
+            tags=ep['tags'],
+            parameters=[parameters[i] for i in ep['parameters']],
+            request_body=RequestBody(content_type=body[0], schema=decoder.decode(body[1]),
+                                     required=body[2], examples=decoder.decode(body[3]))
+            if body else None,
+            responses=[responses[i] for i in ep['responses']],
+            security=[_security_from_dict(s, decoder) for s in ep['security']],
+            deprecated=ep['deprecated'],
+            expected_response_codes=ep['expected_response_codes'],
+            response_assertions=ep['response_assertions'],
+            headers_required=ep['headers_required'],
+            fingerprint=ep['fingerprint']
+        ))
+
+    change_set = data['change_set']
+    return SwaggerAnalysis(
+        base_url=data['base_url'],
+        title=data['title'],
+        version=data['api_version'],
+        description=data['description'],
+        endpoints=endpoints,
+        global_security=[_security_from_dict(s, decoder) for s in data['global_security']],
+        servers=data['servers'],
+        change_set=ChangeSet(**change_set) if change_set is not None else None
+    )
+
+
+class _SharedEncoder:
+    """Encodes a DAG of dicts/lists, storing nodes reached more than once in a table"""
+
+    def __init__(self):
+        self.seen: Dict[int, int] = {}
+        self.refs: Dict[int, int] = {}
+        self.table: List[Any] = []
+        self._keep: List[Any] = []
+
+    def scan(self, value: Any):
+        stack = [value]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, (dict, list)):
+                continue
+            key = id(node)
+            if key in self.seen:
+                self.seen[key] += 1
+                continue
+            self.seen[key] = 1
+            self._keep.append(node)
+            stack.extend(node.values() if isinstance(node, dict) else node)
+
+    def encode(self, value: Any) -> Any:
+        if not isinstance(value, (dict, list)):
+            # YAML may produce dates and other scalars neither format stores
+            return value if isinstance(value, _SCALARS) else str(value)
+
+        key = id(value)
+        if self.seen.get(key, 0) > 1:
+            index = self.refs.get(key)
+            if index is None:
+                index = self.refs[key] = len(self.table)
+                self.table.append(None)
+                self.table[index] = self._encode_node(value)
+            return {SHARED: index}
+
+        return self._encode_node(value)
+
+    def _encode_node(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {str(k): self.encode(v) for k, v in value.items()}
+        return [self.encode(v) for v in value]
+
+
+class _SharedDecoder:
+    def __init__(self, table: List[Any]):
+        self.table = table
+        self.decoded: Dict[int, Any] = {}
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and SHARED in value:
+                index = value[SHARED]
+                node = self.decoded.get(index)
+                if node is None:
+                    node = self.decoded[index] = self.decode(self.table[index])
+                return node
+            return {k: self.decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        return value
+
+
+def _request_body_to_list(body: Optional[RequestBody], encoder: _SharedEncoder) -> Optional[List[Any]]:
+    if body is None:
+        return None
+    return [body.content_type, encoder.encode(body.schema), body.required, encoder.encode(body.examples)]
+
+
+def _security_to_dict(security: SecurityRequirement, encoder: _SharedEncoder) -> Dict[str, Any]:
+    return {'type': security.type.value, 'name': security.name, 'location': security.location,
+            'scheme': security.scheme, 'flows': encoder.encode(security.flows)}
+
+
+def _security_from_dict(data: Dict[str, Any], decoder: _SharedDecoder) -> SecurityRequirement:
+    return SecurityRequirement(type=AuthType(data['type']), name=data['name'], location=data['location'],
+                               scheme=data['scheme'], flows=decoder.decode(data['flows']))
+
+
+def _change_set_to_dict(change_set: Optional[ChangeSet]) -> Optional[Dict[str, Any]]:
+    if change_set is None:
+        return None
+    return {'added': list(change_set.added), 'removed': list(change_set.removed),
+            'modified': list(change_set.modified), 'unchanged': list(change_set.unchanged)}
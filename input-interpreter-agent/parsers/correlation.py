@@ -0,0 +1,227 @@
+import heapq
+import re
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.endpoint_model import Correlation, CorrelationGraph, EndpointInfo
+from utils.helpers import normalize_name, singular
+
+MAX_DEPTH = 3
+
+# Operations that create a resource are the most natural producers of its identifiers
+METHOD_RANK = {'POST': 0, 'PUT': 1, 'GET': 2, 'PATCH': 3}
+
+# Ranks of methods are spaced so that field depth only breaks ties within a method
+RANK_STRIDE = 100
+
+# Names too generic to correlate on their own; they only match qualified by a resource
+GENERIC_NAMES = frozenset({'id', 'name', 'type', 'value', 'key', 'code', 'data'})
+
+# Request body fields are only correlated when they look like references to other resources
+REFERENCE_SUFFIXES = ('id', 'ids', 'key', 'token', 'uuid', 'guid', 'ref', 'slug')
+
+# Index entries kept per key beyond max_producers, for candidates the consumer rejects
+SCAN_SLACK = 8
+
+SIMPLE_KEY = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# (JSON Path suffix, normalized name, normalized singular owning property ('' at the top), type, depth)
+Field = Tuple[str, str, str, str, int]
+
+# (operation_id, JSON Path, type) of a response field
+Entry = Tuple[str, str, str]
+
+
+class CorrelationEngine:
+    """Finds which response fields can feed which parameters.
+
+    Fields of successful responses are indexed once by normalized name, both
+    bare (``petId``) and qualified by the resource owning them (``id`` in a
+    response of ``/pets`` or inside a ``pet`` property gives ``petid``).
+    Every path, query, header and cookie parameter, and every request body
+    field that looks like a reference (``ownerId``, ``token``), is resolved
+    by lookups of its own name, and a bare ``id`` by the resource it
+    addresses (``/pets/{id}``). The cost is one pass over the responses plus
+    a few lookups per input, instead of comparing every response with every
+    operation; schemas shared between operations are walked once.
+
+    Each input keeps at most ``max_producers`` producers: qualified matches
+    before bare ones, then creating operations and shallow fields first.
+    """
+
+    def __init__(self, max_producers: int = 3, max_depth: int = MAX_DEPTH):
+        self.max_producers = max_producers
+        self.max_depth = max_depth
+        self._fields: Dict[Tuple[int, int, str], Tuple[Dict[str, Any], List[Field]]] = {}
+
+    def correlate(self, endpoints: Iterable[EndpointInfo]) -> CorrelationGraph:
+        endpoints = list(endpoints)
+        qualified, bare = self._build_index(endpoints)
+        graph = CorrelationGraph()
+
+        for consumer in endpoints:
+            for target, location, key, type_, owner in self._inputs(consumer):
+                candidates = []
+                for lookup in (key, owner + key if owner else None):
+                    candidates.extend((entry, 'qualified') for entry in qualified.get(lookup, ()))
+                if key not in GENERIC_NAMES:
+                    candidates.extend((entry, 'name') for entry in bare.get(key, ()))
+
+                seen = set()
+                for (producer, source, producer_type), kind in candidates:
+                    if producer == consumer.operation_id or (producer, source) in seen \
+                            or not _compatible(producer_type, type_):
+                        continue
+                    seen.add((producer, source))
+                    graph.edges.append(Correlation(producer=producer, source=source,
+                                                   consumer=consumer.operation_id, target=target,
+                                                   location=location, kind=kind))
+                    if len(seen) >= self.max_producers:
+                        break
+
+        return graph
+
+    def _build_index(self, endpoints: List[EndpointInfo]) -> Tuple[Dict[str, List[Entry]], Dict[str, List[Entry]]]:
+        """Normalized field name -> best (operation_id, JSON Path, type) first, qualified and bare"""
+        qualified: Dict[str, List[Tuple[int, Entry]]] = {}
+        bare: Dict[str, List[Tuple[int, Entry]]] = {}
+
+        for endpoint in endpoints:
+            resource = _owner(_resource(endpoint.path))
+            method_rank = METHOD_RANK.get(endpoint.method.value, len(METHOD_RANK)) * RANK_STRIDE
+            sources = set()
+
+            for response in endpoint.responses:
+                if not response.status_code.startswith('2') or not response.schema:
+                    continue
+                for suffix, key, owner, type_, depth in self._schema_fields(response.schema, 0, 'writeOnly'):
+                    if suffix in sources:
+                        continue
+                    sources.add(suffix)
+
+                    ranked = (method_rank + depth, (endpoint.operation_id, '$' + suffix, type_))
+                    if key not in GENERIC_NAMES:
+                        bare.setdefault(key, []).append(ranked)
+                    owner = owner or resource
+                    if owner:
+                        qualified.setdefault(owner + key, []).append(ranked)
+
+        limit = self.max_producers + SCAN_SLACK
+        return _top(qualified, limit), _top(bare, limit)
+
+    def _inputs(self, endpoint: EndpointInfo) -> Iterator[Tuple[str, str, str, str, str]]:
+        """(target, location, normalized name, type, normalized owner) of every value the operation sends"""
+        for param in endpoint.parameters:
+            if param.location == 'body':
+                yield from self._body_inputs(endpoint, param.schema)
+            else:
+                name = param.name
+                if param.location == 'header' and name[:2].lower() == 'x-':
+                    name = name[2:]  # X-Session-Token carries a sessionToken
+                yield (param.name, param.location, normalize_name(name), param.type,
+                       _owner(_resource(endpoint.path, param.name if param.location == 'path' else None)))
+
+        if endpoint.request_body is not None:
+            yield from self._body_inputs(endpoint, endpoint.request_body.schema)
+
+    def _body_inputs(self, endpoint: EndpointInfo,
+                     schema: Dict[str, Any]) -> Iterator[Tuple[str, str, str, str, str]]:
+        resource = _owner(_resource(endpoint.path))
+        for suffix, key, owner, type_, _ in self._schema_fields(schema or {}, 0, 'readOnly'):
+            if key.endswith(REFERENCE_SUFFIXES):
+                yield '$' + suffix, 'body', key, type_, owner or resource
+
+    def _schema_fields(self, schema: Dict[str, Any], depth: int, skip: str) -> List[Field]:
+        """Scalar fields of an object (or array of objects) schema, memoized per shared schema node.
+
+        Properties flagged ``skip`` (readOnly in requests, writeOnly in
+        responses) are left out.
+        """
+        key = (id(schema), depth, skip)
+        cached = self._fields.get(key)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        fields: List[Field] = []
+        for variant in _variants(schema):
+            if variant.get('type') == 'array' or 'items' in variant:
+                items = variant.get('items')
+                if isinstance(items, dict) and depth < self.max_depth:
+                    fields.extend(('[0]' + suffix, key, owner, type_, level + 1)
+                                  for suffix, key, owner, type_, level in self._schema_fields(items, depth + 1, skip))
+                continue
+
+            properties = variant.get('properties')
+            if not isinstance(properties, dict):
+                continue
+            for name, prop in properties.items():
+                if not isinstance(prop, dict) or prop.get(skip):
+                    continue
+                step = f".{name}" if SIMPLE_KEY.match(name) else f"['{name}']"
+                type_ = _type(prop)
+                if type_ not in ('object', 'array'):
+                    fields.append((step, normalize_name(name), '', type_, 0))
+                if depth < self.max_depth:
+                    owner = _owner(name)
+                    fields.extend((step + suffix, key, child_owner or owner, child_type, level + 1)
+                                  for suffix, key, child_owner, child_type, level
+                                  in self._schema_fields(prop, depth + 1, skip))
+
+        # Keep the schema alive so its id() cannot be reused by another node
+        self._fields[key] = (schema, fields)
+        return fields
+
+
+def _top(index: Dict[str, List[Tuple[int, Entry]]], limit: int) -> Dict[str, List[Entry]]:
+    """Best limit entries per key; nsmallest is stable, so ties keep operation order"""
+    rank = itemgetter(0)
+    return {key: [entry for _, entry in heapq.nsmallest(limit, ranked, key=rank)]
+            for key, ranked in index.items()}
+
+
+def _owner(noun: str) -> str:
+    return normalize_name(singular(noun)) if noun else ''
+
+
+def _variants(schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The schema itself, every allOf part and the first oneOf/anyOf alternative"""
+    variants = [schema]
+    for part in schema.get('allOf') or ():
+        if isinstance(part, dict):
+            variants.extend(_variants(part))
+    for key in ('oneOf', 'anyOf'):
+        alternatives = schema.get(key)
+        if alternatives and isinstance(alternatives[0], dict):
+            variants.extend(_variants(alternatives[0]))
+    return variants
+
+
+def _type(schema: Dict[str, Any]) -> str:
+    type_ = schema.get('type', '')
+    if not type_:
+        if 'properties' in schema:
+            return 'object'
+        if 'items' in schema:
+            return 'array'
+    return type_ if isinstance(type_, str) else ''
+
+
+def _compatible(producer_type: str, consumer_type: str) -> bool:
+    if not producer_type or not consumer_type or producer_type == consumer_type:
+        return True
+    if consumer_type == 'string':
+        # Numeric identifiers are routinely sent as strings in paths and queries
+        return producer_type in ('integer', 'number')
+    return consumer_type == 'number' and producer_type == 'integer'
+
+
+def _resource(path: str, param: Optional[str] = None) -> str:
+    """Last literal path segment, before {param} when given: /pets/{petId}/photos -> photos, pets"""
+    segments = [segment for segment in path.split('/') if segment]
+    marker = f"{{{param}}}"
+    if param is not None and marker in segments:
+        segments = segments[:segments.index(marker)]
+    for segment in reversed(segments):
+        if not segment.startswith('{'):
+            return segment
+    return ''
@@ -0,0 +1,384 @@
+import csv
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, List, Optional, Iterable, Iterator, FrozenSet, Tuple
+
+from models.endpoint_model import EndpointInfo
+
+try:
+    import numpy as np
+except ImportError:  # optional, aggregation falls back to pure Python
+    np = None
+
+
+# Default column order of a JMeter CSV results file
+JTL_COLUMNS = ['timeStamp', 'elapsed', 'label', 'responseCode', 'responseMessage', 'threadName',
+               'dataType', 'success', 'failureMessage', 'bytes', 'sentBytes', 'grpThreads',
+               'allThreads', 'URL', 'Latency', 'IdleTime', 'Connect']
+
+# Histogram buckets: exact milliseconds below LINEAR_LIMIT, then 1% wide
+# log buckets up to MAX_ELAPSED_MS (larger values land in the last bucket)
+LINEAR_LIMIT = 1024
+GROWTH = 1.01
+MAX_ELAPSED_MS = 3_600_000
+_LOG_GROWTH = math.log(GROWTH)
+LOG_BUCKETS = int(math.ceil(math.log(MAX_ELAPSED_MS / LINEAR_LIMIT) / _LOG_GROWTH)) + 1
+BUCKETS = LINEAR_LIMIT + LOG_BUCKETS
+
+PERCENTILES = (50, 90, 95, 99)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def bucket_index(elapsed_ms: int) -> int:
+    if elapsed_ms < LINEAR_LIMIT:
+        return max(elapsed_ms, 0)
+    return LINEAR_LIMIT + min(int(math.log(elapsed_ms / LINEAR_LIMIT) / _LOG_GROWTH), LOG_BUCKETS - 1)
+
+
+def bucket_value(index: int) -> float:
+    """Lower bound (in ms) of a bucket"""
+    if index < LINEAR_LIMIT:
+        return float(index)
+    return LINEAR_LIMIT * GROWTH ** (index - LINEAR_LIMIT)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; histograms from any source merge by adding counts"""
+
+    __slots__ = ('counts',)
+
+    def __init__(self):
+        self.counts = np.zeros(BUCKETS, dtype=np.int64) if np is not None else [0] * BUCKETS
+
+    def add(self, elapsed_ms: int):
+        self.counts[bucket_index(elapsed_ms)] += 1
+
+    def merge(self, other: 'LatencyHistogram'):
+        if np is not None:
+            self.counts += other.counts
+        else:
+            self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def percentile(self, q: float) -> float:
+        total = int(sum(self.counts)) if np is None else int(self.counts.sum())
+        if not total:
+            return 0.0
+
+        rank = max(1, int(math.ceil(total * q / 100.0)))
+        if np is not None:
+            return bucket_value(int(np.searchsorted(np.cumsum(self.counts), rank)))
+
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return bucket_value(index)
+        return bucket_value(BUCKETS - 1)
+
+
+class OperationStats:
+    """Aggregated results of one sampler label (operation_id)"""
+
+    __slots__ = ('samples', 'errors', 'elapsed_sum', 'elapsed_min', 'elapsed_max',
+                 'first_start', 'last_end', 'histogram')
+
+    def __init__(self):
+        self.samples = 0
+        self.errors = 0
+        self.elapsed_sum = 0
+        self.elapsed_min = None
+        self.elapsed_max = None
+        self.first_start = None
+        self.last_end = None
+        self.histogram = LatencyHistogram()
+
+    def merge(self, other: 'OperationStats'):
+        if not other.samples:
+            return
+        self.samples += other.samples
+        self.errors += other.errors
+        self.elapsed_sum += other.elapsed_sum
+        self.elapsed_min = _min(self.elapsed_min, other.elapsed_min)
+        self.elapsed_max = _max(self.elapsed_max, other.elapsed_max)
+        self.first_start = _min(self.first_start, other.first_start)
+        self.last_end = _max(self.last_end, other.last_end)
+        self.histogram.merge(other.histogram)
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = (self.last_end - self.first_start) / 1000.0 if self.samples else 0.0
+        result = {
+            'samples': self.samples,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.samples, 6) if self.samples else 0.0,
+            'throughput_per_second': round(self.samples / duration, 3) if duration > 0 else 0.0,
+            'mean_ms': round(self.elapsed_sum / self.samples, 3) if self.samples else 0.0,
+            'min_ms': self.elapsed_min,
+            'max_ms': self.elapsed_max
+        }
+        for q in PERCENTILES:
+            result[f"p{q}_ms"] = self.histogram.percentile(q)
+        return result
+
+
+class JtlParser:
+    """Aggregates JMeter CSV result files (.jtl) per operation.
+
+    Files are read in chunks of ``chunk_rows`` rows and each chunk is folded
+    into per-label OperationStats, so memory is bounded by one chunk plus a
+    fixed-size histogram per label. Rows are read by a Python loop over the
+    csv module; that loop, not the aggregation, bounds the speed at roughly
+    0.2-0.3 M rows/s per core for JMeter's default columns. NumPy, when
+    installed, vectorizes only the aggregation, which trims the total by
+    about a fifth. Use ``parse_files`` with workers to scale across files.
+
+    A sample counts as an error when its response code is not one of its
+    endpoint's expected_response_codes; labels that match no endpoint fall
+    back to JMeter's own success flag.
+
+    timeStamp is epoch milliseconds by default. A file written with a date
+    ``jmeter.save.saveservice.timestamp_format`` is read as well: ISO-like
+    dates ('2024/01/31 12:00:00.123', '2024-01-31T12:00:00') are recognized,
+    and other layouts need their ``timestamp_format`` (a strptime format).
+    Dates without a UTC offset are taken as UTC; only differences between
+    timestamps enter the report. A value that does not parse raises a
+    ValueError naming the file and data row.
+    """
+
+    def __init__(self, endpoints: Iterable[EndpointInfo] = (), chunk_rows: int = 100_000,
+                 timestamp_format: Optional[str] = None):
+        self.expected_codes: Dict[str, FrozenSet[str]] = {
+            ep.operation_id: frozenset(ep.expected_response_codes) for ep in endpoints}
+        self.chunk_rows = chunk_rows
+        self.timestamp_format = timestamp_format
+
+    def parse_file(self, path: str) -> Dict[str, OperationStats]:
+        """Aggregate one .jtl file"""
+        names: List[str] = []
+        accumulator = _ArrayAccumulator(names) if np is not None else _RowAccumulator(names)
+        for chunk in self.iter_chunks(path, names):
+            accumulator.add(*chunk)
+        return accumulator.stats()
+
+    def parse_files(self, paths: Iterable[str], workers: int = 1) -> Dict[str, OperationStats]:
+        """Aggregate several files, one process per file when workers > 1"""
+        paths = list(paths)
+        total: Dict[str, OperationStats] = {}
+
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partials = executor.map(_parse_file_task, paths, [self.expected_codes] * len(paths),
+                                        [self.chunk_rows] * len(paths),
+                                        [self.timestamp_format] * len(paths))
+                for partial in partials:
+                    merge_stats(total, partial)
+        else:
+            for path in paths:
+                merge_stats(total, self.parse_file(path))
+
+        return total
+
+    def report(self, stats: Dict[str, OperationStats]) -> Dict[str, Any]:
+        """Per-operation metrics plus a total across every label"""
+        overall = OperationStats()
+        for operation_stats in stats.values():
+            overall.merge(operation_stats)
+
+        return {
+            'operations': {label: s.to_dict() for label, s in sorted(stats.items())},
+            'unknown_labels': sorted(label for label in stats if label not in self.expected_codes),
+            'total': overall.to_dict()
+        }
+
+    def iter_chunks(self, path: str, names: List[str]
+                    ) -> Iterator[Tuple[List[int], List[int], List[int], List[bool]]]:
+        """Yield (label ids, elapsed, timestamps, errors) column chunks.
+
+        Labels are numbered in order of appearance; names[i] is label i.
+        """
+        with open(path, 'r', newline='', encoding='utf-8', errors='replace') as f:
+            reader = csv.reader(f)
+            first = next(reader, None)
+            if first is None:
+                return
+
+            columns = first if 'elapsed' in first else JTL_COLUMNS
+            ts_col, elapsed_col = columns.index('timeStamp'), columns.index('elapsed')
+            label_col, code_col = columns.index('label'), columns.index('responseCode')
+            success_col = columns.index('success')
+            width = max(ts_col, elapsed_col, label_col, code_col, success_col)
+
+            rows = reader if columns is first else _prepend(first, reader)
+            label_ids = {name: i for i, name in enumerate(names)}
+            expected_by_id = [self.expected_codes.get(name) for name in names]
+            parse_timestamp = None
+            ids, elapsed, timestamps, errors = [], [], [], []
+
+            try:
+                for row in rows:
+                    if len(row) <= width:
+                        continue  # truncated last line of a run still in progress
+                    if parse_timestamp is None:
+                        parse_timestamp = _timestamp_parser(row[ts_col], self.timestamp_format)
+
+                    label = row[label_col]
+                    label_id = label_ids.get(label)
+                    if label_id is None:
+                        label_id = label_ids[label] = len(names)
+                        names.append(label)
+                        expected_by_id.append(self.expected_codes.get(label))
+
+                    expected = expected_by_id[label_id]
+                    ids.append(label_id)
+                    elapsed.append(int(row[elapsed_col]))
+                    timestamps.append(parse_timestamp(row[ts_col]))
+                    errors.append(row[code_col] not in expected if expected is not None
+                                  else row[success_col] != 'true')
+
+                    if len(ids) >= self.chunk_rows:
+                        yield ids, elapsed, timestamps, errors
+                        ids, elapsed, timestamps, errors = [], [], [], []
+            except ValueError as e:
+                raise ValueError(f"{path}, line {reader.line_num}: {e}; a timeStamp written with a "
+                                 f"date format may need JtlParser(timestamp_format=...)") from None
+
+            if ids:
+                yield ids, elapsed, timestamps, errors
+
+
+def merge_stats(total: Dict[str, OperationStats], partial: Dict[str, OperationStats]):
+    for label, stats in partial.items():
+        if label in total:
+            total[label].merge(stats)
+        else:
+            total[label] = stats
+
+
+class _RowAccumulator:
+    """Pure Python aggregation, one row at a time"""
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.by_id: List[OperationStats] = []
+
+    def add(self, ids: List[int], elapsed: List[int], timestamps: List[int], errors: List[bool]):
+        by_id = self.by_id
+        while len(by_id) < len(self.names):
+            by_id.append(OperationStats())
+
+        for label_id, ms, ts, error in zip(ids, elapsed, timestamps, errors):
+            s = by_id[label_id]
+            s.samples += 1
+            s.errors += error
+            s.elapsed_sum += ms
+            s.elapsed_min = ms if s.elapsed_min is None or ms < s.elapsed_min else s.elapsed_min
+            s.elapsed_max = ms if s.elapsed_max is None or ms > s.elapsed_max else s.elapsed_max
+            s.first_start = ts if s.first_start is None or ts < s.first_start else s.first_start
+            s.last_end = ts + ms if s.last_end is None or ts + ms > s.last_end else s.last_end
+            s.histogram.counts[bucket_index(ms)] += 1
+
+    def stats(self) -> Dict[str, OperationStats]:
+        return dict(zip(self.names, self.by_id))
+
+
+class _ArrayAccumulator:
+    """NumPy aggregation: one vectorized pass per chunk into per-label arrays"""
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.size = 0
+        self.samples = np.zeros(0, dtype=np.int64)
+        self.errors = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros(0, dtype=np.int64)
+        self.mins = np.zeros(0, dtype=np.int64)
+        self.maxs = np.zeros(0, dtype=np.int64)
+        self.firsts = np.zeros(0, dtype=np.int64)
+        self.lasts = np.zeros(0, dtype=np.int64)
+        self.histograms = np.zeros((0, BUCKETS), dtype=np.int64)
+
+    def _grow(self, size: int):
+        extra = size - self.size
+        big, small = np.iinfo(np.int64).max, np.iinfo(np.int64).min
+        for name, fill in (('samples', 0), ('errors', 0), ('sums', 0), ('mins', big),
+                           ('maxs', small), ('firsts', big), ('lasts', small)):
+            setattr(self, name, np.concatenate([getattr(self, name), np.full(extra, fill, dtype=np.int64)]))
+        self.histograms = np.vstack([self.histograms, np.zeros((extra, BUCKETS), dtype=np.int64)])
+        self.size = size
+
+    def add(self, ids: List[int], elapsed: List[int], timestamps: List[int], errors: List[bool]):
+        if len(self.names) > self.size:
+            self._grow(len(self.names))
+
+        ids_arr = np.asarray(ids, dtype=np.int64)
+        elapsed_arr = np.asarray(elapsed, dtype=np.int64)
+        ts_arr = np.asarray(timestamps, dtype=np.int64)
+
+        self.samples += np.bincount(ids_arr, minlength=self.size)
+        self.errors += np.bincount(ids_arr, weights=np.asarray(errors, dtype=np.int64),
+                                   minlength=self.size).astype(np.int64)
+        self.sums += np.bincount(ids_arr, weights=elapsed_arr, minlength=self.size).astype(np.int64)
+        np.minimum.at(self.mins, ids_arr, elapsed_arr)
+        np.maximum.at(self.maxs, ids_arr, elapsed_arr)
+        np.minimum.at(self.firsts, ids_arr, ts_arr)
+        np.maximum.at(self.lasts, ids_arr, ts_arr + elapsed_arr)
+
+        clipped = np.maximum(elapsed_arr, 0)
+        log_part = np.log(np.maximum(clipped, LINEAR_LIMIT) / LINEAR_LIMIT) / _LOG_GROWTH
+        buckets = np.where(clipped < LINEAR_LIMIT, clipped,
+                           LINEAR_LIMIT + np.minimum(log_part.astype(np.int64), LOG_BUCKETS - 1))
+        cells, counts = np.unique(ids_arr * BUCKETS + buckets, return_counts=True)
+        self.histograms.reshape(-1)[cells] += counts
+
+    def stats(self) -> Dict[str, OperationStats]:
+        result = {}
+        for i, name in enumerate(self.names):
+            s = OperationStats()
+            s.samples = int(self.samples[i])
+            s.errors = int(self.errors[i])
+            s.elapsed_sum = int(self.sums[i])
+            s.elapsed_min = int(self.mins[i])
+            s.elapsed_max = int(self.maxs[i])
+            s.first_start = int(self.firsts[i])
+            s.last_end = int(self.lasts[i])
+            s.histogram.counts = self.histograms[i].copy()
+            result[name] = s
+        return result
+
+
+def _parse_file_task(path: str, expected_codes: Dict[str, FrozenSet[str]], chunk_rows: int,
+                     timestamp_format: Optional[str]) -> Dict[str, OperationStats]:
+    parser = JtlParser(chunk_rows=chunk_rows, timestamp_format=timestamp_format)
+    parser.expected_codes = expected_codes
+    return parser.parse_file(path)
+
+
+def _timestamp_parser(sample: str, timestamp_format: Optional[str]) -> Callable[[str], int]:
+    """Converter of a file's timeStamp column to epoch milliseconds, chosen from its first value"""
+    if timestamp_format:
+        return lambda value: _epoch_ms(datetime.strptime(value, timestamp_format))
+    if sample.lstrip('-').isdigit():
+        return int
+    return lambda value: _epoch_ms(datetime.fromisoformat(value.replace('/', '-')))
+
+
+def _epoch_ms(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - _EPOCH) // _MILLISECOND
+
+
+_MILLISECOND = datetime.resolution * 1000
+
+
+def _prepend(first: List[str], rows: Iterator[List[str]]) -> Iterator[List[str]]:
+    yield first
+    yield from rows
+
+
+def _min(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _max(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return b if a is None else a if b is None else max(a, b)
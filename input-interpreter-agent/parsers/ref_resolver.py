@@ -0,0 +1,183 @@
+from typing import Dict, Any, List, Optional, Tuple
+
+
+COMPONENT_ROOTS = [
+    ('components', 'schemas'),
+    ('components', 'parameters'),
+    ('components', 'responses'),
+    ('components', 'requestBodies'),
+    ('components', 'headers'),
+    ('definitions',),
+    ('parameters',),
+    ('responses',),
+]
+
+
+class RefResolver:
+    """Resolves local $ref pointers against a single specification.
+
+    The JSON-pointer index of shared components is built once per spec and
+    every resolved component is memoized, so resolving the same component a
+    second time is a dict lookup. Resolved schemas are shared between callers
+    and must be treated as read-only.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec or {}
+        self.index = self._build_index(self.spec)
+        self._resolved: Dict[str, Dict[str, Any]] = {}
+        self._resolving: List[str] = []
+        self.hits = 0
+        self.misses = 0
+
+    def _build_index(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the pointer -> node index for all shared components"""
+        index = {}
+
+        for root in COMPONENT_ROOTS:
+            node = spec
+            for key in root:
+                node = node.get(key) if isinstance(node, dict) else None
+            if not isinstance(node, dict):
+                continue
+
+            prefix = '#/' + '/'.join(root) + '/'
+            for name, component in node.items():
+                index[prefix + _escape_pointer(name)] = component
+
+        return index
+
+    def lookup(self, ref: str) -> Optional[Any]:
+        """Return the raw (unresolved) node a pointer refers to"""
+        if ref in self.index:
+            return self.index[ref]
+
+        if not ref.startswith('#/'):
+            return None  # External references are not supported
+
+        node = self.spec
+        for token in ref[2:].split('/'):
+            token = _unescape_pointer(token)
+            if isinstance(node, dict) and token in node:
+                node = node[token]
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                return None
+
+        self.index[ref] = node
+        return node
+
+    def deref(self, node: Any) -> Any:
+        """Follow a chain of $ref pointers on a parameter/response/body object"""
+        seen = set()
+        while isinstance(node, dict) and '$ref' in node:
+            ref = node['$ref']
+            if ref in seen:
+                break
+            seen.add(ref)
+            target = self.lookup(ref)
+            if target is None:
+                break
+            node = target
+        return node
+
+    def resolve(self, schema: Any) -> Any:
+        """Return the schema with every $ref followed and allOf merged"""
+        if not isinstance(schema, dict):
+            return schema
+
+        if '$ref' in schema:
+            return self.resolve_ref(schema['$ref'])
+
+        return self._resolve_inline(schema)
+
+    def resolve_ref(self, ref: str) -> Dict[str, Any]:
+        """Resolve a single pointer, memoized per pointer"""
+        resolved = self._resolved.get(ref)
+        if resolved is not None:
+            self.hits += 1
+            return resolved
+
+        # Recursive model: cut the cycle with a marker instead of recursing
+        if ref in self._resolving:
+            return {'$ref': ref, 'x-circular-ref': True}
+
+        target = self.lookup(ref)
+        if not isinstance(target, dict):
+            return {'$ref': ref, 'x-unresolved-ref': True}
+
+        self.misses += 1
+        self._resolving.append(ref)
+        try:
+            resolved = self.resolve(target)
+        finally:
+            self._resolving.pop()
+
+        self._resolved[ref] = resolved
+        return resolved
+
+    def _resolve_inline(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve the children of an inline schema"""
+        resolved = {}
+        changed = False
+
+        for key, value in schema.items():
+            if key in ('properties', 'patternProperties', 'definitions') and isinstance(value, dict):
+                new_value = {name: self.resolve(sub) for name, sub in value.items()}
+            elif key in ('items', 'additionalProperties', 'not') and isinstance(value, dict):
+                new_value = self.resolve(value)
+            elif key in ('allOf', 'oneOf', 'anyOf') and isinstance(value, list):
+                new_value = [self.resolve(sub) for sub in value]
+            else:
+                new_value = value
+
+            if new_value is not value:
+                changed = True
+            resolved[key] = new_value
+
+        if 'allOf' in resolved:
+            return self._merge_all_of(resolved)
+
+        return resolved if changed else schema
+
+    def _merge_all_of(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge allOf members into a single object schema"""
+        merged = {key: value for key, value in schema.items() if key != 'allOf'}
+        properties = dict(merged.get('properties', {}))
+        required = list(merged.get('required', []))
+
+        for member in schema['allOf']:
+            if not isinstance(member, dict):
+                continue
+            for key, value in member.items():
+                if key == 'properties':
+                    properties.update(value)
+                elif key == 'required':
+                    required.extend(r for r in value if r not in required)
+                elif key not in merged:
+                    merged[key] = value
+
+        if properties:
+            merged['properties'] = properties
+            merged.setdefault('type', 'object')
+        if required:
+            merged['required'] = required
+
+        return merged
+
+    @property
+    def resolved_count(self) -> int:
+        return len(self._resolved)
+
+    def stats(self) -> Tuple[int, int]:
+        """Return (hits, misses) of the resolved-schema cache"""
+        return self.hits, self.misses
+
+
+def _escape_pointer(token: str) -> str:
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def _unescape_pointer(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
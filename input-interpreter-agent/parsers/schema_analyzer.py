@@ -1,9 +1,21 @@
-from typing import Dict, Any, List, Tuple
-from models.endpoint_model import EndpointInfo, Parameter
+import random
+import sys
+from collections.abc import Mapping
+from typing import Dict, Any, List, Sequence, Callable, Collection, Iterator, Optional
+from models.endpoint_model import EndpointInfo, Parameter, Response, SwaggerAnalysis
+from parsers.schema_compiler import SchemaCompiler, load_numpy
+
+BATCH_LOCATIONS = ('path', 'query', 'header')
+
+# Bump whenever analysis output changes, so stored snapshots are not reused
+ANALYZER_VERSION = '3'
 
 
 class SchemaAnalyzer:
 
+    def __init__(self):
+        self.compiler = SchemaCompiler()
+
     def analyze_endpoint_requirements(self, endpoint: EndpointInfo) -> EndpointInfo:
         """Analyze endpoint and enhance with JMeter-specific requirements"""
 
@@ -16,6 +28,9 @@ class SchemaAnalyzer:
         # Set expected response codes
         endpoint.expected_response_codes = self._extract_expected_codes(endpoint)
 
+        # Assertion texts repeat across endpoints; keep one copy of each
+        endpoint.response_assertions = [sys.intern(a) for a in endpoint.response_assertions]
+
         return endpoint
 
     def _extract_required_headers(self, endpoint: EndpointInfo) -> Dict[str, str]:
@@ -61,7 +76,7 @@ class SchemaAnalyzer:
                     response.status_code.startswith('2') and
                     response.schema):
 
-                required_fields = response.schema.get('required', [])
+                required_fields = self._select_variant(response.schema).get('required', [])
                 if required_fields:
                     for field in required_fields[:3]:  # Limit to top 3 fields
                         assertions.append(f"JSON Path: $.{field}")
@@ -100,61 +115,107 @@ class SchemaAnalyzer:
 
         return sample_data
 
-    def _generate_sample_value(self, param: Parameter) -> Any:
-        """Generate sample value for a parameter"""
-        if param.example is not None:
-            return param.example
+    def generate_response_samples(self, response: Response, n: int = 1, seed: int = 0) -> List[Any]:
+        """Generate n example bodies for a response (the schema example first, then random draws)"""
+        if not response.schema:
+            return []
+        compiled = self.compiler.compile(response.schema)
+        rng = random.Random(seed)
+        return [compiled.sample()] + [compiled.draw(rng) for _ in range(n - 1)]
+
+    def generate_columns(self, endpoint: EndpointInfo, n: int, seed: int = 0,
+                         skip: Collection[str] = (), vectorized: bool = False) -> Dict[str, Sequence[Any]]:
+        """Generate n random values per parameter (and request body), column-wise.
+
+        Same seed, same columns. With vectorized=True and NumPy installed,
+        numeric, boolean and enum columns are drawn by NumPy and come back as
+        arrays; that is faster but draws different values, so the default
+        keeps output identical whether or not NumPy is installed. Every other
+        column is a list. Parameters named in skip are left out without
+        drawing their values.
+        """
+        rng = random.Random(seed)
+        np = load_numpy() if vectorized else None
+        np_rng = np.random.default_rng(seed) if np is not None else None
+        columns = {}
 
-        if param.default_value is not None:
-            return param.default_value
+        for param in endpoint.parameters:
+            if param.location in BATCH_LOCATIONS and param.name not in skip:
+                compiled = self.compiler.compile_parameter(param)
+                columns[param.name] = compiled.column(n, rng, np_rng)
 
-        if param.enum_values:
-            return param.enum_values[0]
+        if endpoint.request_body and endpoint.request_body.schema:
+            body = self.compiler.compile(endpoint.request_body.schema)
+            columns['request_body'] = [body.draw(rng) for _ in range(n)]
 
-        # Type-based defaults
-        type_defaults = {
-            'string': 'sample_string',
-            'integer': 1,
-            'number': 1.0,
-            'boolean': True,
-            'array': [],
-            'object': {}
-        }
+        return columns
 
-        return type_defaults.get(param.type, 'sample_value')
+    def generate_batch(self, endpoint: EndpointInfo, n: int, seed: int = 0,
+                       vectorized: bool = False) -> List[Dict[str, Any]]:
+        """Generate n random rows of test data for the endpoint (see generate_columns)"""
+        columns = self.generate_columns(endpoint, n, seed, vectorized=vectorized)
+        names = list(columns)
+        values = [_to_list(column) for column in columns.values()]
 
-    def _generate_sample_from_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate sample data from JSON schema"""
-        if schema.get('type') != 'object':
-            return {}
+        return [dict(zip(names, row)) for row in zip(*values)] if names else [{} for _ in range(n)]
 
-        sample = {}
-        properties = schema.get('properties', {})
-        required = schema.get('required', [])
+    def _generate_sample_value(self, param: Parameter) -> Any:
+        """Generate sample value for a parameter"""
+        return self.compiler.compile_parameter(param).sample()
 
-        for prop_name, prop_schema in properties.items():
-            if prop_name in required:  # Only required fields for now
-                sample[prop_name] = self._generate_value_from_schema(prop_schema)
+    def _generate_sample_from_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate sample data from JSON schema"""
+        sample = self.compiler.compile(schema).sample()
+        return sample if isinstance(sample, dict) else {}
 
-        return sample
+    def _select_variant(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Use the first oneOf/anyOf alternative of a resolved schema"""
+        for key in ('oneOf', 'anyOf'):
+            if schema.get(key) and 'type' not in schema:
+                return schema[key][0]
+        return schema
 
     def _generate_value_from_schema(self, schema: Dict[str, Any]) -> Any:
         """Generate value from property schema"""
-        schema_type = schema.get('type', 'string')
+        return self.compiler.compile(schema).sample()
+
+
+def _to_list(column: Sequence[Any]) -> List[Any]:
+    """NumPy columns to plain Python values"""
+    return column.tolist() if hasattr(column, 'tolist') else list(column)
 
-        if 'example' in schema:
-            return schema['example']
 
-        if 'enum' in schema:
-            return schema['enum'][0]
+class LazySampleData(Mapping):
+    """operation_id -> sample data, generated on first access and then kept.
+
+    ``materialize()`` fills in every missing entry at once through ``bulk``
+    (e.g. the agent's pooled generator) and returns a plain dict.
+    """
+
+    def __init__(self, analysis: SwaggerAnalysis, analyzer: SchemaAnalyzer,
+                 bulk: Optional[Callable[[List[EndpointInfo]], Dict[str, Dict[str, Any]]]] = None):
+        self._analysis = analysis
+        self._analyzer = analyzer
+        self._bulk = bulk
+        self._generated: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, operation_id: str) -> Dict[str, Any]:
+        sample = self._generated.get(operation_id)
+        if sample is None:
+            endpoint = self._analysis.get_endpoint(operation_id)
+            if endpoint is None:
+                raise KeyError(operation_id)
+            sample = self._generated[operation_id] = self._analyzer.generate_sample_data(endpoint)
+        return sample
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys(ep.operation_id for ep in self._analysis.endpoints))
 
-        type_generators = {
-            'string': lambda: 'sample_string',
-            'integer': lambda: 1,
-            'number': lambda: 1.0,
-            'boolean': lambda: True,
-            'array': lambda: [],
-            'object': lambda: {}
-        }
+    def __len__(self) -> int:
+        return len(dict.fromkeys(ep.operation_id for ep in self._analysis.endpoints))
 
-        return type_generators.get(schema_type, lambda: 'sample_value')()
\ No newline at end of file
+    def materialize(self) -> Dict[str, Dict[str, Any]]:
+        missing = [self._analysis.get_endpoint(op_id) for op_id in self if op_id not in self._generated]
+        if missing and self._bulk is not None:
+            self._generated.update(self._bulk(missing))
+        return {op_id: self[op_id] for op_id in self}
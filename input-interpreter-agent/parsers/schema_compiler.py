@@ -0,0 +1,578 @@
+import base64
+import ipaddress
+import random
+import re
+import string
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Callable, Sequence, Tuple
+
+# The regex parser is private to the re module and changes between CPython
+# releases; without it (or when it misbehaves) patterns are not generated
+# and pattern-constrained strings fall back to the plain string generator.
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
+
+_numpy: Any = False  # not imported yet
+
+
+def load_numpy() -> Any:
+    """NumPy for the column fast path, or None when it is not installed.
+
+    Imported on first use: only bulk data generation needs it, and commands
+    that merely analyze a spec should not pay for loading it.
+    """
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:  # optional, columns fall back to pure Python
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+MAX_DEPTH = 8
+# Optional properties are generated this many object levels deep; below
+# that only required ones, so mutually referencing models stay small
+OPTIONAL_DEPTH = 2
+DEFAULT_INT_RANGE = (1, 100000)
+DEFAULT_NUMBER_RANGE = (0.0, 1000.0)
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Deterministic sample values, used when the schema gives no example
+FORMAT_SAMPLES = {
+    'uuid': '3fa85f64-5717-4562-b3fc-2c963f66afa6',
+    'date-time': '2024-01-01T00:00:00Z',
+    'date': '2024-01-01',
+    'time': '00:00:00',
+    'email': 'user@example.com',
+    'uri': 'https://example.com/resource',
+    'url': 'https://example.com/resource',
+    'hostname': 'example.com',
+    'ipv4': '192.0.2.1',
+    'ipv6': '2001:db8::1',
+    'byte': 'c2FtcGxl',
+    'password': 'P@ssw0rd!',
+}
+
+
+class CompiledSchema:
+    """A schema turned into value generators once, ready to be called many times.
+
+    ``sample()`` returns the canonical deterministic value (examples first),
+    ``draw(rng)`` a random value and ``column(n, rng)`` n random values at
+    once, vectorized with NumPy for numeric and enum schemas. ``unique(index,
+    namespace)`` maps distinct indexes to distinct valid values and raises
+    ValueError once the schema runs out of them.
+    """
+
+    kind = 'any'
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.example = schema.get('example', schema.get('default'))
+        self.has_example = 'example' in schema or 'default' in schema
+
+    def sample(self) -> Any:
+        return self.example if self.has_example else self._sample()
+
+    def _sample(self) -> Any:
+        return 'sample_value'
+
+    def draw(self, rng: random.Random) -> Any:
+        return self.sample()
+
+    def column(self, n: int, rng: random.Random, np_rng: Any = None) -> Sequence[Any]:
+        return [self.draw(rng) for _ in range(n)]
+
+    def unique(self, index: int, namespace: uuid.UUID) -> Any:
+        raise ValueError(f"{self.kind} values cannot be unique")
+
+
+class EnumSchema(CompiledSchema):
+    kind = 'enum'
+
+    def __init__(self, schema: Dict[str, Any]):
+        super().__init__(schema)
+        self.values = list(schema['enum'])
+
+    def _sample(self) -> Any:
+        return self.values[0]
+
+    def draw(self, rng: random.Random) -> Any:
+        return self.values[rng.randrange(len(self.values))]
+
+    def column(self, n: int, rng: random.Random, np_rng: Any = None) -> Sequence[Any]:
+        if np_rng is not None and all(isinstance(v, (str, int, float)) for v in self.values):
+            return load_numpy().asarray(self.values)[np_rng.integers(0, len(self.values), size=n)]
+        return super().column(n, rng)
+
+    def unique(self, index: int, namespace: uuid.UUID) -> Any:
+        if index >= len(self.values):
+            raise ValueError(f"allows only {len(self.values)} unique values")
+        return self.values[index]
+
+
+class IntegerSchema(CompiledSchema):
+    kind = 'integer'
+
+    def __init__(self, schema: Dict[str, Any]):
+        super().__init__(schema)
+        low = schema.get('minimum', DEFAULT_INT_RANGE[0] if 'maximum' not in schema else None)
+        high = schema.get('maximum', DEFAULT_INT_RANGE[1] if 'minimum' not in schema else None)
+        if low is None:
+            low = int(high) - DEFAULT_INT_RANGE[1]
+        if high is None:
+            high = int(low) + DEFAULT_INT_RANGE[1]
+        low, high = int(low), int(high)
+        if schema.get('exclusiveMinimum') is True:
+            low += 1
+        if schema.get('exclusiveMaximum') is True:
+            high -= 1
+        self.low, self.high = low, max(low, high)
+        self.bounded = 'maximum' in schema
+        self.multiple_of = int(schema['multipleOf']) if schema.get('multipleOf') else 1
+
+    def _sample(self) -> Any:
+        return self._align(min(max(1, self.low), self.high))
+
+    def _align(self, value: int) -> int:
+        if self.multiple_of > 1:
+            value -= value % self.multiple_of
+            if value < self.low:
+                value += self.multiple_of
+        return value
+
+    def draw(self, rng: random.Random) -> Any:
+        return self._align(rng.randint(self.low, self.high))
+
+    def column(self, n: int, rng: random.Random, np_rng: Any = None) -> Sequence[Any]:
+        if np_rng is None:
+            return super().column(n, rng)
+        values = np_rng.integers(self.low, self.high + 1, size=n, dtype=load_numpy().int64)
+        if self.multiple_of > 1:
+            values -= values % self.multiple_of
+            values[values < self.low] += self.multiple_of
+        return values
+
+    def unique(self, index: int, namespace: uuid.UUID) -> Any:
+        value = self._align(self.low) + index * self.multiple_of
+        if self.bounded and value > self.high:
+            capacity = (self.high - self._align(self.low)) // self.multiple_of + 1
+            raise ValueError(f"allows only {capacity} unique values")
+        return value
+
+
+class NumberSchema(CompiledSchema):
+    kind = 'number'
+
+    def __init__(self, schema: Dict[str, Any]):
+        super().__init__(schema)
+        self.low = float(schema.get('minimum', DEFAULT_NUMBER_RANGE[0]))
+        self.high = float(schema.get('maximum', max(self.low, 0.0) + DEFAULT_NUMBER_RANGE[1]))
+
+    def _sample(self) -> Any:
+        return min(max(1.0, self.low), self.high)
+
+    def draw(self, rng: random.Random) -> Any:
+        return round(rng.uniform(self.low, self.high), 4)
+
+    def column(self, n: int, rng: random.Random, np_rng: Any = None) -> Sequence[Any]:
+        if np_rng is None:
+            return super().column(n, rng)
+        return load_numpy().round(np_rng.uniform(self.low, self.high, size=n), 4)
+
+    def unique(self, index: int, namespace: uuid.UUID) -> Any:
+        # Same 4 decimal resolution as draw()
+        value = round(self.low + index / 10 ** 4, 4)
+        if value > self.high:
+            capacity = int((self.high - self.low) * 10 ** 4) + 1
+            raise ValueError(f"allows only {capacity} unique values")
+        return value
+
+
+class BooleanSchema(CompiledSchema):
+    kind = 'boolean'
+
+    def _sample(self) -> Any:
+        return True
+
+    def draw(self, rng: random.Random) -> Any:
+        return rng.random() < 0.5
+
+    def column(self, n: int, rng: random.Random, np_rng: Any = None) -> Sequence[Any]:
+        if np_rng is None:
+            return super().column(n, rng)
+        return np_rng.random(size=n) < 0.5
+
+    def unique(self, index: int, namespace: uuid.UUID) -> Any:
+        if index > 1:
+            raise ValueError("allows only 2 unique values")
+        return bool(index)
+
+
+class StringSchema(CompiledSchema):
+    kind = 'string'
+
+    def __init__(self, schema: Dict[str, Any]):
+        super().__init__(schema)
+        self.format = schema.get('format')
+        self.min_length = int(schema.get('minLength', 0))
+        self.max_length = int(schema.get('maxLength', max(self.min_length, 16)))
+        self.pattern = compile_pattern(schema['pattern']) if schema.get('pattern') else None
+        self._random = FORMAT_GENERATORS.get(self.format)
+
+    def _sample(self) -> Any:
+        if self.pattern is not None:
+            return self.pattern(None)
+        if self.format in FORMAT_SAMPLES:
+            return FORMAT_SAMPLES[self.format]
+        return self._fit('sample_string')
+
+    def _fit(self, value: str) -> str:
+        if len(value) < self.min_length:
+            value = value + 'x' * (self.min_length - len(value))
+        return value[:self.max_length] if self.max_length else value
+
+    def draw(self, rng: random.Random) -> Any:
+        if self.pattern is not None:
+            return self.pattern(rng)
+        if self._random is not None:
+            return self._random(rng)
+        low, high = self._length_range()
+        return ''.join(rng.choices(ALPHANUMERIC, k=rng.randint(low, high)))
+
+    def _length_range(self) -> Tuple[int, int]:
+        low = max(self.min_length, 1)
+        return low, max(low, min(self.max_length, 16))
+
+    def column(self, n: int, rng: random.Random, np_rng: Any = None) -> Sequence[Any]:
+        if self.pattern is not None or self._random is not None:
+            return super().column(n, rng)
+
+        # Draw all characters at once and slice them into strings
+        low, high = self._length_range()
+        lengths = [rng.randint(low, high) for _ in range(n)]
+        chars = ''.join(rng.choices(ALPHANUMERIC, k=sum(lengths)))
+        values = []
+        position = 0
+        for length in lengths:
+            values.append(chars[position:position + length])
+            position += length
+        return values
+
+    def unique(self, index: int, namespace: uuid.UUID) -> Any:
+        if self.pattern is not None:
+            return self.pattern(_IndexedChoices(index))
+        if self.format == 'uuid':
+            return str(uuid.uuid5(namespace, str(index)))
+        if self.format in FORMAT_UNIQUE:
+            capacity, value = FORMAT_UNIQUE[self.format]
+            if capacity is not None and index >= capacity:
+                raise ValueError(f"{self.format} allows only {capacity} unique values")
+            return value(index)
+
+        # index in base 62, padded to the minimum length
+        low, high = max(self.min_length, 1), max(self.max_length, 1)
+        digits = []
+        while index or len(digits) < low:
+            index, digit = divmod(index, len(ALPHANUMERIC))
+            digits.append(ALPHANUMERIC[digit])
+        if len(digits) > high:
+            raise ValueError(f"maxLength {high} allows only {len(ALPHANUMERIC) ** high} unique values")
+        return ''.join(reversed(digits))
+
+
+class ArraySchema(CompiledSchema):
+    kind = 'array'
+
+    def __init__(self, schema: Dict[str, Any], items: CompiledSchema):
+        super().__init__(schema)
+        self.items = items
+        self.min_items = int(schema.get('minItems', 1))
+        self.max_items = int(schema.get('maxItems', max(self.min_items, 3)))
+
+    def _sample(self) -> Any:
+        return [self.items.sample() for _ in range(min(max(self.min_items, 1), self.max_items))]
+
+    def draw(self, rng: random.Random) -> Any:
+        count = rng.randint(self.min_items, max(self.min_items, self.max_items))
+        return [self.items.draw(rng) for _ in range(count)]
+
+
+class ObjectSchema(CompiledSchema):
+    kind = 'object'
+
+    def __init__(self, schema: Dict[str, Any], properties: List[Tuple[str, 'CompiledSchema']]):
+        super().__init__(schema)
+        self.properties = properties
+
+    def _sample(self) -> Any:
+        return {name: prop.sample() for name, prop in self.properties}
+
+    def draw(self, rng: random.Random) -> Any:
+        return {name: prop.draw(rng) for name, prop in self.properties}
+
+
+class SchemaCompiler:
+    """Compiles schemas into generators, cached by schema identity.
+
+    Resolved schemas are shared objects (see RefResolver), so a component used
+    by many operations is compiled once per nesting level bucket. Cached
+    entries pin their schema so its id cannot be reused while alive; the
+    cache keeps the max_entries most recently used, so an agent analyzing
+    spec after spec does not keep every old spec's schemas alive.
+    """
+
+    def __init__(self, max_entries: int = 8192):
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[int, int], Tuple[Any, CompiledSchema]]' = OrderedDict()
+
+    def compile(self, schema: Optional[Dict[str, Any]], depth: int = 0) -> CompiledSchema:
+        if not isinstance(schema, dict):
+            schema = {}
+
+        key = (id(schema), min(depth, OPTIONAL_DEPTH))
+        compiled = self._lookup(key, schema)
+        if compiled is None:
+            compiled = self._compile(schema, depth)
+            self._remember(key, schema, compiled)
+        return compiled
+
+    def compile_parameter(self, param: Any) -> CompiledSchema:
+        """Compile a Parameter, whose type/enum/format override its schema"""
+        key = (id(param), -1)
+        compiled = self._lookup(key, param)
+        if compiled is not None:
+            return compiled
+
+        schema = dict(param.schema or {})
+        schema['type'] = param.type
+        if param.enum_values:
+            schema['enum'] = param.enum_values
+        if param.format:
+            schema['format'] = param.format
+        if param.example is not None:
+            schema['example'] = param.example
+        elif param.default_value is not None:
+            schema['default'] = param.default_value
+
+        compiled = self._compile(schema, 0)
+        self._remember(key, param, compiled)
+        return compiled
+
+    def _lookup(self, key: Tuple[int, int], owner: Any) -> Optional[CompiledSchema]:
+        entry = self._cache.get(key)
+        if entry is None or entry[0] is not owner:
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _remember(self, key: Tuple[int, int], owner: Any, compiled: CompiledSchema):
+        self._cache[key] = (owner, compiled)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _compile(self, schema: Dict[str, Any], depth: int) -> CompiledSchema:
+        for key in ('oneOf', 'anyOf'):
+            if schema.get(key) and 'type' not in schema:
+                return self.compile(schema[key][0], depth)
+
+        if schema.get('enum'):
+            return EnumSchema(schema)
+
+        schema_type = schema.get('type')
+        if isinstance(schema_type, list):  # OpenAPI 3.1 type arrays
+            schema_type = next((t for t in schema_type if t != 'null'), 'string')
+        if schema_type is None:
+            if 'properties' in schema:
+                schema_type = 'object'
+            elif 'items' in schema:
+                schema_type = 'array'
+            else:
+                schema_type = 'string'
+
+        if schema_type == 'integer':
+            return IntegerSchema(schema)
+        if schema_type == 'number':
+            return NumberSchema(schema)
+        if schema_type == 'boolean':
+            return BooleanSchema(schema)
+        if schema_type == 'array':
+            # Arrays do not count as an object level
+            items = self.compile(schema.get('items'), depth) if depth < MAX_DEPTH else CompiledSchema({})
+            return ArraySchema(schema, items)
+        if schema_type == 'object':
+            properties = []
+            required = schema.get('required', [])
+            if depth < MAX_DEPTH:
+                for name, prop in schema.get('properties', {}).items():
+                    if depth >= OPTIONAL_DEPTH and name not in required:
+                        continue
+                    # Recursive models are cut by the resolver; leave them out
+                    if isinstance(prop, dict) and prop.get('x-circular-ref'):
+                        continue
+                    properties.append((name, self.compile(prop, depth + 1)))
+            return ObjectSchema(schema, properties)
+        if schema_type == 'string':
+            return StringSchema(schema)
+
+        return CompiledSchema(schema)
+
+
+ALPHANUMERIC = string.ascii_letters + string.digits
+
+
+def _random_datetime(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+
+FORMAT_GENERATORS: Dict[str, Callable[[random.Random], str]] = {
+    'uuid': lambda rng: str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+    'date-time': lambda rng: _random_datetime(rng).strftime('%Y-%m-%dT%H:%M:%SZ'),
+    'date': lambda rng: _random_datetime(rng).strftime('%Y-%m-%d'),
+    'time': lambda rng: _random_datetime(rng).strftime('%H:%M:%S'),
+    'email': lambda rng: f"user{rng.randrange(10 ** 8)}@example.com",
+    'uri': lambda rng: f"https://example.com/resource/{rng.randrange(10 ** 8)}",
+    'url': lambda rng: f"https://example.com/resource/{rng.randrange(10 ** 8)}",
+    'hostname': lambda rng: f"host{rng.randrange(10 ** 6)}.example.com",
+    'ipv4': lambda rng: '.'.join(str(rng.randrange(1, 255)) for _ in range(4)),
+    'byte': lambda rng: base64.b64encode(rng.getrandbits(96).to_bytes(12, 'big')).decode('ascii'),
+    'password': lambda rng: ''.join(rng.choices(ALPHANUMERIC, k=12)),
+}
+
+_DAYS_LEFT = (datetime(9999, 12, 31, tzinfo=timezone.utc) - EPOCH).days + 1
+
+# Format -> (number of distinct values or None, index -> value) for unique columns
+FORMAT_UNIQUE: Dict[str, Tuple[Optional[int], Callable[[int], str]]] = {
+    'date-time': (_DAYS_LEFT * 24 * 3600,
+                  lambda i: (EPOCH + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ')),
+    'date': (_DAYS_LEFT, lambda i: (EPOCH + timedelta(days=i)).strftime('%Y-%m-%d')),
+    'time': (24 * 3600, lambda i: (EPOCH + timedelta(seconds=i)).strftime('%H:%M:%S')),
+    'email': (None, lambda i: f"user{i}@example.com"),
+    'uri': (None, lambda i: f"https://example.com/resource/{i}"),
+    'url': (None, lambda i: f"https://example.com/resource/{i}"),
+    'hostname': (None, lambda i: f"host{i}.example.com"),
+    'ipv4': (1 << 24, lambda i: f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}"),
+    'ipv6': (1 << 96, lambda i: str(ipaddress.IPv6Address((0x20010db8 << 96) + i))),
+    'byte': (1 << 96, lambda i: base64.b64encode(i.to_bytes(12, 'big')).decode('ascii')),
+}
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: string.digits,
+    sre_parse.CATEGORY_WORD: ALPHANUMERIC + '_',
+    sre_parse.CATEGORY_SPACE: ' ',
+} if sre_parse is not None else {}
+_PRINTABLE = ALPHANUMERIC + '-_.'
+MAX_PATTERN_REPEAT = 8
+
+
+def compile_pattern(pattern: str) -> Optional[Callable[[Optional[random.Random]], str]]:
+    """Turn a regex into a string generator; rng=None gives the minimal match.
+
+    Returns None when the pattern cannot be generated here: the private
+    regex parser is missing, rejects the pattern, or yields a parse tree
+    whose minimal match does not satisfy the pattern.
+    """
+    if sre_parse is None:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern)
+        if re.search(pattern, ''.join(_emit(parsed, None))) is None:
+            return None
+    except Exception:
+        return None
+
+    def generate(rng: Any) -> str:
+        value = ''.join(_emit(parsed, rng))
+        if isinstance(rng, _IndexedChoices):
+            rng.check()
+        return value
+
+    return generate
+
+
+class _IndexedChoices:
+    """Stands in for the rng of a pattern generator, spelling out an index.
+
+    Every choice takes the next mixed-radix digit of the index and repeats
+    run to their maximum, so distinct indexes give distinct matches until
+    the pattern runs out of them.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.remaining = index
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        if isinstance(seq, str):
+            seq = ''.join(dict.fromkeys(seq))
+        self.remaining, digit = divmod(self.remaining, len(seq))
+        return seq[digit]
+
+    def randint(self, low: int, high: int) -> int:
+        return high
+
+    def check(self):
+        if self.remaining:
+            raise ValueError(f"pattern has fewer than {self.index + 1} unique matches")
+
+
+def _emit(parsed: Any, rng: Optional[random.Random]) -> List[str]:
+    out = []
+
+    for op, arg in parsed:
+        if op == sre_parse.LITERAL:
+            out.append(chr(arg))
+        elif op == sre_parse.NOT_LITERAL:
+            out.append('a' if chr(arg) != 'a' else 'b')
+        elif op == sre_parse.ANY:
+            out.append(rng.choice(_PRINTABLE) if rng else 'a')
+        elif op == sre_parse.IN:
+            chars = _charset(arg)
+            out.append(rng.choice(chars) if rng else chars[0])
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = arg
+            high = min(high, low + MAX_PATTERN_REPEAT)
+            count = rng.randint(low, high) if rng else low
+            for _ in range(count):
+                out.extend(_emit(sub, rng))
+        elif op == sre_parse.SUBPATTERN:
+            out.extend(_emit(arg[-1], rng))
+        elif op == sre_parse.BRANCH:
+            branches = arg[1]
+            out.extend(_emit(rng.choice(branches) if rng else branches[0], rng))
+        elif op == sre_parse.CATEGORY:
+            chars = _CATEGORIES.get(arg, 'a')
+            out.append(rng.choice(chars) if rng else chars[0])
+        # AT (anchors) and other zero-width ops emit nothing
+
+    return out
+
+
+def _charset(items: Any) -> str:
+    chars = []
+    negate = False
+
+    for op, arg in items:
+        if op == sre_parse.NEGATE:
+            negate = True
+        elif op == sre_parse.LITERAL:
+            chars.append(chr(arg))
+        elif op == sre_parse.RANGE:
+            chars.extend(chr(c) for c in range(arg[0], min(arg[1], arg[0] + 255) + 1))
+        elif op == sre_parse.CATEGORY:
+            chars.extend(_CATEGORIES.get(arg, ''))
+
+    if negate:
+        excluded = set(chars)
+        chars = [c for c in _PRINTABLE if c not in excluded]
+
+    return ''.join(chars) or 'a'
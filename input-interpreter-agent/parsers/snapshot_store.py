@@ -0,0 +1,97 @@
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from typing import Optional, List
+
+from models.endpoint_model import SwaggerAnalysis
+from models.serialization import dumps_analysis, loads_analysis, FORMAT_VERSION
+from parsers.schema_analyzer import ANALYZER_VERSION
+
+
+class AnalysisSnapshotStore:
+    """On-disk store of finished analyses keyed by spec content hash.
+
+    Snapshots use the binary serialization form and are read back through a
+    memory map, so a hit costs one decode instead of a parse and analyze
+    pass. The key also covers the analyzer version, the serialization format
+    and the Python version (the binary form is ``marshal`` data), so stale
+    snapshots are simply never found. Size and entry count are bounded;
+    least recently used snapshots are evicted first.
+    """
+
+    SUFFIX = '.snapshot'
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024, max_entries: int = 256):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._version = (f"a{ANALYZER_VERSION}-f{FORMAT_VERSION}"
+                         f"-py{sys.version_info[0]}{sys.version_info[1]}")
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}-{self._version}{self.SUFFIX}")
+
+    def load(self, digest: str) -> Optional[SwaggerAnalysis]:
+        """Return the stored analysis of a spec, or None"""
+        path = self._path(digest)
+        with self._lock:
+            try:
+                with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    analysis = loads_analysis(mm)
+            except (OSError, ValueError, EOFError, TypeError):
+                # Missing, empty or unreadable snapshots are treated as misses
+                self.misses += 1
+                return None
+
+            os.utime(path)
+            self.hits += 1
+            return analysis
+
+    def store(self, digest: str, analysis: SwaggerAnalysis):
+        """Save an analysis under its spec's content hash"""
+        data = dumps_analysis(analysis, binary=True)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(digest))
+            self._evict()
+
+    def _snapshots(self) -> List[os.DirEntry]:
+        with os.scandir(self.cache_dir) as entries:
+            return [e for e in entries if e.name.endswith(self.SUFFIX)]
+
+    def total_bytes(self) -> int:
+        return sum(e.stat().st_size for e in self._snapshots())
+
+    def _evict(self):
+        """Drop least recently used snapshots until both bounds hold"""
+        snapshots = sorted(self._snapshots(), key=lambda e: e.stat().st_mtime_ns)
+        total = sum(e.stat().st_size for e in snapshots)
+        while len(snapshots) > 1 and (len(snapshots) > self.max_entries or total > self.max_bytes):
+            oldest = snapshots.pop(0)
+            total -= oldest.stat().st_size
+            try:
+                os.remove(oldest.path)
+            except OSError:
+                pass
+
+    def invalidate(self, digest: Optional[str] = None):
+        """Forget one spec's snapshot, or every snapshot when no digest is given"""
+        with self._lock:
+            if digest is not None:
+                paths = [e.path for e in self._snapshots() if e.name.startswith(digest + '-')]
+            else:
+                paths = [e.path for e in self._snapshots()]
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,294 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Any, Iterable, Optional, Callable, Tuple
+
+
+class SpecCache:
+    """Content-addressed on-disk cache of fetched and parsed specifications.
+
+    Each source (URL or local path) maps to an index entry holding its HTTP
+    validators (ETag/Last-Modified, or mtime/size for local files) and the
+    SHA-256 digest of its raw content. Raw bytes and the parsed spec are stored
+    once per digest, so identical specs served from different URLs share
+    storage. Streamed sources also keep their decoded header (see
+    SpecStream.state), so a 304 skips the header pass too. Total blob size
+    is bounded; least recently used entries are evicted first. Parsed specs
+    and headers are also kept in memory, for the ``max_parsed`` most
+    recently used digests.
+    """
+
+    INDEX_FILE = 'index.json'
+    BLOB_SUFFIXES = ('raw', 'pickle', 'header')
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, max_parsed: int = 16):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_parsed = max_parsed
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._parsed: 'OrderedDict[str, Any]' = OrderedDict()  # digest -> parsed spec, per process
+        self._headers: 'OrderedDict[str, Any]' = OrderedDict()  # digest -> SpecStream state, per process
+
+        os.makedirs(os.path.join(cache_dir, 'blobs'), exist_ok=True)
+        self._index = self._read_index()
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, os.path.join(self.cache_dir, self.INDEX_FILE))
+
+    def _blob_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', f"{digest}.{suffix}")
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry for a source, if present"""
+        with self._lock:
+            return self._index.get(key)
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a cached URL"""
+        entry = self.entry(key)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def raw_path(self, key: str) -> Optional[str]:
+        """Return the path of the cached raw content for a source"""
+        entry = self.entry(key)
+        if entry:
+            path = self._blob_path(entry['digest'], 'raw')
+            if os.path.exists(path):
+                return path
+        return None
+
+    def open_raw(self, key: str) -> Optional[Tuple[BinaryIO, str]]:
+        """Open the cached raw content of a source, returning it with its digest"""
+        with self._lock:
+            entry = self._index.get(key)
+            try:
+                fileobj = open(self._blob_path(entry['digest'], 'raw'), 'rb') if entry else None
+            except OSError:
+                fileobj = None
+            if fileobj is None:
+                self.misses += 1
+                return None
+
+            entry['accessed'] = time.time()
+            self._write_index()
+            self.hits += 1
+            return fileobj, entry['digest']
+
+    def load(self, key: str) -> Optional[Any]:
+        """Return the parsed spec for a source without re-parsing it"""
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                self.misses += 1
+                return None
+
+            spec = self._load_digest(entry['digest'])
+            if spec is None:
+                self.misses += 1
+                return None
+
+            entry['accessed'] = time.time()
+            self._write_index()
+            self.hits += 1
+            return spec
+
+    def _load_digest(self, digest: str) -> Optional[Any]:
+        if digest in self._parsed:
+            self._parsed.move_to_end(digest)
+            return self._parsed[digest]
+
+        try:
+            with open(self._blob_path(digest, 'pickle'), 'rb') as f:
+                spec = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        self._remember(self._parsed, digest, spec)
+        return spec
+
+    def _remember(self, table: 'OrderedDict[str, Any]', digest: str, value: Any):
+        """Keep a decoded value in memory, dropping the least recently used past max_parsed"""
+        table[digest] = value
+        table.move_to_end(digest)
+        while len(table) > self.max_parsed:
+            table.popitem(last=False)
+
+    def store(self, key: str, raw: bytes, decode: Callable[[bytes], Any], etag: Optional[str] = None,
+              last_modified: Optional[str] = None, validator: Optional[str] = None) -> Any:
+        """Record fresh content for a source and return its parsed spec.
+
+        ``decode`` is only called when no other source already stored the same
+        content, so a re-published but unchanged spec is never re-parsed.
+        """
+        digest = hashlib.sha256(raw).hexdigest()
+
+        with self._lock:
+            spec = self._load_digest(digest)
+            if spec is None:
+                spec = decode(raw)
+                self._write_blob(digest, 'raw', raw)
+                self._write_blob(digest, 'pickle', pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL))
+                self._remember(self._parsed, digest, spec)
+
+            self._record(key, digest, etag, last_modified, validator)
+
+        return spec
+
+    def _record(self, key: str, digest: str, etag: Optional[str], last_modified: Optional[str],
+                validator: Optional[str]):
+        """Point a source at stored content; called with the lock held"""
+        previous = self._index.get(key)
+        self._index[key] = {
+            'digest': digest,
+            'etag': etag,
+            'last_modified': last_modified,
+            'validator': validator,
+            'size': self._digest_size(digest),
+            'accessed': time.time()
+        }
+        if previous and previous['digest'] != digest:
+            self._drop_if_unused(previous['digest'])
+        self._evict()
+        self._write_index()
+
+    def store_stream(self, key: str, chunks: Iterable[bytes], etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Tuple[BinaryIO, str]:
+        """Record fresh content streamed in chunks, returning it opened for reading and its digest.
+
+        The body is written straight into the blob store and hashed on the
+        way, so it is never held in memory and nothing is decoded here.
+        """
+        blob_dir = os.path.join(self.cache_dir, 'blobs')
+        sha = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=blob_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    sha.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        digest = sha.hexdigest()
+
+        with self._lock:
+            os.replace(tmp_path, self._blob_path(digest, 'raw'))
+            # Opened before eviction can run, so the content stays readable
+            fileobj = open(self._blob_path(digest, 'raw'), 'rb')
+            self._record(key, digest, etag, last_modified, None)
+        return fileobj, digest
+
+    def header(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Decoded header state (see SpecStream.state) of stored content"""
+        with self._lock:
+            state = self._headers.get(digest)
+            if state is None:
+                try:
+                    with open(self._blob_path(digest, 'header'), 'rb') as f:
+                        state = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    return None
+            self._remember(self._headers, digest, state)
+            return state
+
+    def store_header(self, digest: str, state: Dict[str, Any]):
+        """Keep the decoded header of stored content for the next 304"""
+        with self._lock:
+            entries = [e for e in self._index.values() if e['digest'] == digest]
+            if not entries:
+                return  # Evicted meanwhile
+            self._write_blob(digest, 'header', pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            self._remember(self._headers, digest, state)
+            for entry in entries:
+                entry['size'] = self._digest_size(digest)
+            self._evict()
+            self._write_index()
+
+    def _write_blob(self, digest: str, suffix: str, data: bytes):
+        path = self._blob_path(digest, suffix)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _digest_size(self, digest: str) -> int:
+        size = 0
+        for suffix in self.BLOB_SUFFIXES:
+            try:
+                size += os.path.getsize(self._blob_path(digest, suffix))
+            except OSError:
+                pass
+        return size
+
+    def total_bytes(self) -> int:
+        """Size of all stored blobs, counting shared content once"""
+        sizes = {}
+        for entry in self._index.values():
+            sizes[entry['digest']] = entry.get('size', 0)
+        return sum(sizes.values())
+
+    def _evict(self):
+        """Drop least recently used sources until the size bound holds"""
+        while len(self._index) > 1 and self.total_bytes() > self.max_bytes:
+            oldest_key = min(self._index, key=lambda k: self._index[k].get('accessed', 0))
+            self._drop_if_unused(self._index.pop(oldest_key)['digest'])
+
+    def _drop_if_unused(self, digest: str):
+        """Remove stored content no source refers to any more"""
+        if any(e['digest'] == digest for e in self._index.values()):
+            return
+
+        self._parsed.pop(digest, None)
+        self._headers.pop(digest, None)
+        for suffix in self.BLOB_SUFFIXES:
+            try:
+                os.remove(self._blob_path(digest, suffix))
+            except OSError:
+                pass
+
+    def invalidate(self, key: Optional[str] = None):
+        """Forget one source, or every source when no key is given"""
+        with self._lock:
+            keys = [key] if key is not None else list(self._index)
+            for k in keys:
+                self._index.pop(k, None)
+            self._remove_orphans()
+            self._write_index()
+
+    def _remove_orphans(self):
+        live = {e['digest'] for e in self._index.values()}
+        blob_dir = os.path.join(self.cache_dir, 'blobs')
+        for name in os.listdir(blob_dir):
+            if name.endswith('.tmp'):
+                continue  # Another writer's content, not yet moved into place
+            digest = name.split('.', 1)[0]
+            if digest not in live:
+                self._parsed.pop(digest, None)
+                self._headers.pop(digest, None)
+                try:
+                    os.remove(os.path.join(blob_dir, name))
+                except OSError:
+                    pass
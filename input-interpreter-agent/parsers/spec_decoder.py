@@ -0,0 +1,55 @@
+import json
+from typing import Dict, Any
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib decoder
+    orjson = None
+
+
+_BOM = b'\xef\xbb\xbf'
+_WHITESPACE = b' \t\r\n'
+
+
+def sniff_format(data: bytes) -> str:
+    """Return 'json' or 'yaml' from the first non-whitespace byte"""
+    start = 3 if data[:3] == _BOM else 0
+    for i in range(start, min(len(data), start + 4096)):
+        byte = data[i:i + 1]
+        if byte in (b'{', b'['):
+            return 'json'
+        if byte not in _WHITESPACE:
+            return 'yaml'
+    return 'yaml'
+
+
+def loads_json(data: bytes) -> Any:
+    """Decode JSON bytes with the fastest available decoder"""
+    if data[:3] == _BOM:
+        data = data[3:]
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_yaml(data: bytes) -> Any:
+    """Decode YAML bytes, using libyaml when it is installed"""
+    # Imported here: JSON-only runs should not pay for loading yaml
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)  # libyaml bindings
+    return yaml.load(data, Loader=loader)
+
+
+def decode_spec(data: bytes) -> Dict[str, Any]:
+    """Decode raw spec bytes, choosing the decoder from the content itself.
+
+    The Content-Type header is not trusted: JSON served as text/plain must
+    not end up in the (much slower) YAML parser.
+    """
+    if sniff_format(data) == 'json':
+        try:
+            return loads_json(data)
+        except ValueError:
+            pass  # YAML flow mappings also start with '{'
+
+    return loads_yaml(data)
@@ -0,0 +1,109 @@
+import hashlib
+import json
+from typing import Dict, Any, List, Tuple
+
+from models.endpoint_model import SwaggerAnalysis, ChangeSet
+from parsers.ref_resolver import RefResolver
+
+
+class OperationFingerprinter:
+    """Content fingerprints for operations and the components they use.
+
+    An operation's fingerprint covers its own subtree, the path-level
+    parameters it inherits and every component it transitively references,
+    so editing a shared schema changes the fingerprint of each operation
+    that (indirectly) uses it. Per-component hashes and direct reference
+    lists are memoized per spec.
+    """
+
+    def __init__(self, resolver: RefResolver):
+        self.resolver = resolver
+        self._component_hashes: Dict[str, str] = {}
+        self._component_refs: Dict[str, Tuple[str, ...]] = {}
+
+    def fingerprint(self, path: str, method: str, operation: Dict[str, Any],
+                    path_parameters: List[Dict[str, Any]] = ()) -> str:
+        """Fingerprint one operation including its path-level parameters and referenced components"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{method} {path}\n".encode('utf-8'))
+        digest.update(_canonical(operation))
+        refs = _collect_refs(operation)
+        if path_parameters:
+            digest.update(b"\nparameters=")
+            digest.update(_canonical(path_parameters))
+            refs.extend(_collect_refs(path_parameters))
+
+        for ref in self._closure(refs):
+            digest.update(f"\n{ref}=".encode('utf-8'))
+            digest.update(self._component_hash(ref).encode('ascii'))
+
+        return digest.hexdigest()
+
+    def _closure(self, refs: List[str]) -> List[str]:
+        """All components reachable from refs, in a stable order"""
+        seen = set()
+        stack = list(refs)
+
+        while stack:
+            ref = stack.pop()
+            if ref in seen:
+                continue
+            seen.add(ref)
+            stack.extend(self._direct_refs(ref))
+
+        return sorted(seen)
+
+    def _direct_refs(self, ref: str) -> Tuple[str, ...]:
+        refs = self._component_refs.get(ref)
+        if refs is None:
+            refs = tuple(_collect_refs(self.resolver.lookup(ref)))
+            self._component_refs[ref] = refs
+        return refs
+
+    def _component_hash(self, ref: str) -> str:
+        component_hash = self._component_hashes.get(ref)
+        if component_hash is None:
+            component_hash = hashlib.blake2b(_canonical(self.resolver.lookup(ref)),
+                                             digest_size=16).hexdigest()
+            self._component_hashes[ref] = component_hash
+        return component_hash
+
+
+def diff_analyses(previous: SwaggerAnalysis, current: SwaggerAnalysis) -> ChangeSet:
+    """Compare two analyses operation by operation"""
+    before = {ep.operation_id: ep.fingerprint for ep in previous.endpoints}
+    after = {ep.operation_id: ep.fingerprint for ep in current.endpoints}
+
+    change_set = ChangeSet()
+    for operation_id, fingerprint in after.items():
+        if operation_id not in before:
+            change_set.added.append(operation_id)
+        elif not fingerprint or before[operation_id] != fingerprint:
+            change_set.modified.append(operation_id)
+        else:
+            change_set.unchanged.append(operation_id)
+
+    change_set.removed = [op_id for op_id in before if op_id not in after]
+    return change_set
+
+
+def _canonical(node: Any) -> bytes:
+    return json.dumps(node, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _collect_refs(node: Any) -> List[str]:
+    """Collect every $ref string inside a node"""
+    refs = []
+    stack = [node]
+
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get('$ref')
+            if isinstance(ref, str):
+                refs.append(ref)
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+    return refs
@@ -0,0 +1,211 @@
+import hashlib
+import json
+from array import array
+import mmap
+import os
+import re
+from typing import Dict, Any, Iterator, List, Tuple, Optional, BinaryIO, Container
+
+from parsers.spec_decoder import loads_json, loads_yaml
+
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+
+MIN_WINDOW = 64 * 1024
+
+
+class SpecStream:
+    """Incremental reader for a specification stored in a seekable file.
+
+    JSON specs are memory-mapped and never decoded as a whole: every
+    top-level member except ``paths`` is decoded into ``header`` (info,
+    servers, components, ...), while path items are decoded one at a time by
+    ``iter_paths``. Peak memory is therefore bounded by the header plus the
+    largest single path item (and the byte span of each path item, recorded
+    while the header pass steps over ``paths`` so that ``iter_paths`` decodes
+    exact slices instead of scanning the document a second time). Those
+    slices go through ``loads_json``, so orjson decodes them when it is
+    installed. YAML has no cheap incremental form, so YAML specs are loaded
+    whole and then iterated.
+
+    ``state`` (from ``state()`` of an earlier stream over the same content)
+    skips the header pass of a JSON spec.
+    """
+
+    def __init__(self, fileobj: BinaryIO, state: Optional[Dict[str, Any]] = None):
+        self._file = fileobj
+        self._mm: Optional[mmap.mmap] = None
+        self._decoder = json.JSONDecoder()
+        self._window = MIN_WINDOW
+        self._path_keys: List[str] = []
+        self._path_spans = array('q')  # start, end byte offsets of each path item
+        self._yaml_paths: Optional[Dict[str, Any]] = None
+        self.header: Dict[str, Any] = {}
+
+        fileobj.seek(0, 2)
+        if fileobj.tell() == 0:
+            fileobj.close()
+            raise ValueError("Specification is empty")
+
+        self._mm = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            start = self._skip_whitespace(3 if self._mm[:3] == b'\xef\xbb\xbf' else 0)
+
+            if self._mm[start:start + 1] == b'{':
+                if state is not None:
+                    self.header = state['header']
+                    self._path_keys = state['path_keys']
+                    self._path_spans = state['path_spans']
+                else:
+                    self._read_header(start)
+            else:
+                self._read_yaml()
+        except Exception:
+            self.close()
+            raise
+
+    def _skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self._mm, pos).end()
+
+    def _read_yaml(self):
+        """Fallback for YAML: decode everything, then split off paths"""
+        spec = loads_yaml(self._mm[:]) or {}
+        self._yaml_paths = spec.pop('paths', None) or {}
+        self.header = spec
+
+    def _read_header(self, start: int):
+        for key, value, _, _ in self._iter_members(start, skip=('paths',)):
+            if key != 'paths':
+                self.header[key] = value
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        """Decoded header and path item spans of a JSON spec, to reopen the same content without a header pass"""
+        if self._yaml_paths is not None:
+            return None
+        return {'header': self.header, 'path_keys': self._path_keys, 'path_spans': self._path_spans}
+
+    def iter_paths(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (path, path_item) pairs, decoding one path item at a time"""
+        if self._yaml_paths is not None:
+            yield from self._yaml_paths.items()
+            return
+
+        mm, spans = self._mm, self._path_spans
+        for i, path in enumerate(self._path_keys):
+            yield path, loads_json(mm[spans[2 * i]:spans[2 * i + 1]])
+
+    def _iter_members(self, pos: int, skip: Container[str] = ()) -> Iterator[Tuple[str, Any, int, int]]:
+        """Yield (key, value, value_start, value_end) for the object at pos.
+
+        Values of keys in ``skip`` are stepped over member by member without
+        being kept (see _index_at), and are yielded as None.
+        """
+        mm = self._mm
+        pos = self._skip_whitespace(pos + 1)
+
+        if mm[pos:pos + 1] == b'}':
+            return
+
+        while True:
+            key_match = _STRING.match(mm, pos)
+            if not key_match:
+                raise ValueError(f"Expected object key at byte {pos}")
+            key = json.loads(key_match.group())
+
+            pos = self._skip_whitespace(key_match.end())
+            if mm[pos:pos + 1] != b':':
+                raise ValueError(f"Expected ':' at byte {pos}")
+
+            value_start = self._skip_whitespace(pos + 1)
+            if key in skip:
+                value, value_end = None, self._index_at(value_start)
+            else:
+                value, value_end = self._decode_at(value_start)
+            yield key, value, value_start, value_end
+
+            pos = self._skip_whitespace(value_end)
+            separator = mm[pos:pos + 1]
+            if separator == b'}':
+                return
+            if separator != b',':
+                raise ValueError(f"Expected ',' or '}}' at byte {pos}")
+            pos = self._skip_whitespace(pos + 1)
+
+    def _index_at(self, pos: int) -> int:
+        """Return the end offset of the value at pos without holding it whole.
+
+        The key and byte span of every member are recorded for iter_paths.
+        """
+        if self._mm[pos:pos + 1] != b'{':
+            return self._decode_at(pos)[1]
+
+        end = pos + 1
+        for key, _, start, end in self._iter_members(pos):
+            self._path_keys.append(key)
+            self._path_spans.extend((start, end))
+        return self._skip_whitespace(end) + 1
+
+    def _decode_at(self, pos: int) -> Tuple[Any, int]:
+        """Decode the JSON value starting at pos, returning (value, end offset).
+
+        Only a window of the file is turned into text. The window doubles
+        until the value fits and then adapts to the size of recent values, so
+        the C decoder does the scanning without the document in memory.
+        Invalid UTF-8 raises ValueError; only a character cut in half by the
+        window edge is left for the next, larger window.
+        """
+        mm = self._mm
+        size = self._window
+
+        while True:
+            end = min(pos + size, len(mm))
+            chunk = mm[pos:end]
+            try:
+                text = chunk.decode('utf-8')
+            except UnicodeDecodeError as e:
+                if end == len(mm) or e.reason != 'unexpected end of data':
+                    raise ValueError(f"Invalid UTF-8 at byte {pos + e.start}") from None
+                chunk = chunk[:e.start]
+                text = chunk.decode('utf-8')
+
+            try:
+                value, char_end = self._decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                if end == len(mm):
+                    raise
+                size *= 2
+                continue
+
+            # A value ending exactly at the window edge may be a truncated scalar
+            if char_end == len(text) and end < len(mm):
+                size *= 2
+                continue
+
+            if chunk.isascii():
+                byte_end = pos + char_end
+            else:
+                byte_end = pos + len(text[:char_end].encode('utf-8'))
+
+            self._window = max(MIN_WINDOW, 2 * (byte_end - pos))
+            return value, byte_end
+
+    def digest(self) -> str:
+        """SHA-256 of the raw spec content, hashed from the memory map"""
+        return hashlib.sha256(self._mm).hexdigest()
+
+    def reopen(self) -> 'SpecStream':
+        """Independent stream over the same content (e.g. for another thread), without refetching"""
+        return SpecStream(os.fdopen(os.dup(self._file.fileno()), 'rb'))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> 'SpecStream':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,483 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from models.endpoint_model import HttpMethod, ValidationIssue, ValidationReport
+from parsers.ref_resolver import RefResolver
+from parsers.spec_stream import SpecStream
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+STRUCTURAL = 'structural'
+FULL = 'full'
+
+# Bump when the structural checks change, so cached reports are not reused
+VALIDATOR_VERSION = 2
+
+METHODS = frozenset(m.value.lower() for m in HttpMethod)
+
+# Top-level members only used through $refs; left out of the per-shard metaschema check
+COMPONENT_KEYS = ('components', 'definitions', 'parameters', 'responses', 'securityDefinitions')
+
+# Reported by the structural tier across the whole spec (as errors at the full
+# level), not only within one shard
+SHARD_LOCAL_ERRORS = ('DuplicateOperationIDError',)
+
+# ShardValidator.validate_paths relies on openapi-spec-validator internals
+# (keyword_validators_registry, schema_ids_registry, schema_path) tested with
+# these releases, [low, high); other releases validate the whole document at once
+SHARDED_VALIDATOR_VERSIONS = ((0, 7), (0, 8))
+
+_TEMPLATE = re.compile(r'\{([^{}/]+)\}')
+
+
+class SpecValidator:
+    """Tiered validation of OpenAPI/Swagger specifications.
+
+    The structural tier runs inline while path items are streamed to the
+    parser: it only looks at the shapes the parser relies on and raises a
+    ``ValueError`` naming the offending location before parsing fails deep
+    inside, and collects warnings (missing responses, undeclared path
+    parameters, dangling ``$ref`` ...) on the way.
+
+    The full tier runs openapi-spec-validator, sharded so that large specs
+    use every core: the header and components are validated once, path items
+    in chunks of ``chunk_paths`` across ``workers`` processes (on the library
+    releases in SHARDED_VALIDATOR_VERSIONS; others are validated unsharded,
+    through its public API only). Duplicate operationIds, which no single
+    shard can see, are errors at this level. It can run on
+    a background thread with ``submit``. Reports are cached by the spec's
+    content hash, in memory and, with a cache_dir, on disk, so an unchanged
+    spec is never validated twice.
+    """
+
+    def __init__(self, workers: int = 1, chunk_paths: int = 64, cache_dir: Optional[str] = None,
+                 full: bool = False):
+        self.workers = workers
+        self.chunk_paths = chunk_paths
+        self.cache_dir = cache_dir
+        self.full = full  # also run the full tier in the background for every analyzed spec
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._reports: Dict[Tuple[str, str], ValidationReport] = {}
+        self._background: Optional['ThreadPoolExecutor'] = None
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def check(self, header: Dict[str, Any], path_items: Iterable[Tuple[str, Dict[str, Any]]],
+              report: ValidationReport, resolver: Optional[RefResolver] = None,
+              strict: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Pass path items through, checking each one structurally as it goes by.
+
+        Issues are added to report; when strict, the first path item with an
+        error raises ValueError instead of being passed on.
+        """
+        started = time.perf_counter()
+        resolver = resolver or RefResolver(header)
+        operation_ids: Dict[str, str] = {}
+        duplicate_severity = 'error' if report.level == FULL else 'warning'
+
+        issues = check_header(header)
+        for path, path_item in path_items:
+            issues.extend(check_path_item(path, path_item, resolver, operation_ids, duplicate_severity))
+            report.operations += sum(1 for key in path_item if key in METHODS) \
+                if isinstance(path_item, dict) else 0
+            report.issues.extend(issues)
+            if strict:
+                _raise_errors(issues)
+            issues = []
+
+            report.elapsed_seconds += time.perf_counter() - started
+            yield path, path_item
+            started = time.perf_counter()
+
+        report.issues.extend(issues)
+        report.elapsed_seconds += time.perf_counter() - started
+        if strict:
+            _raise_errors(issues)
+
+    def validate(self, stream: SpecStream, level: str = FULL) -> ValidationReport:
+        """Validate a spec at the given level, or return the cached report of the same content"""
+        if level not in (STRUCTURAL, FULL):
+            raise ValueError(f"Unknown validation level: {level}")
+
+        digest = stream.digest()
+        cached = self._load(digest, level)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        report = ValidationReport(level=level, digest=digest)
+        for _ in self.check(stream.header, stream.iter_paths(), report, strict=False):
+            pass
+
+        if level == FULL:
+            report.issues.extend(self._full_issues(stream))
+
+        report.elapsed_seconds = time.perf_counter() - started
+        self._store(report)
+        return report
+
+    def submit(self, stream: SpecStream, level: str = FULL) -> 'Future[ValidationReport]':
+        """Validate on a background thread; the stream is closed once validated"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='validation')
+            executor = self._background
+
+        def run() -> ValidationReport:
+            with stream:
+                return self.validate(stream, level)
+
+        try:
+            return executor.submit(run)
+        except BaseException:
+            stream.close()
+            raise
+
+    def close(self):
+        """Wait for background validation to finish"""
+        with self._lock:
+            executor, self._background = self._background, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def remember(self, report: ValidationReport):
+        """Cache a complete report produced elsewhere, e.g. by the inline check() pass"""
+        if report.digest:
+            self._store(report)
+
+    def _full_issues(self, stream: SpecStream) -> List[ValidationIssue]:
+        """openapi-spec-validator over the components shard, then path chunks in order"""
+        # Only full validation needs the pool; the inline structural checks do not
+        from concurrent.futures import ProcessPoolExecutor
+        from utils import pipeline
+
+        header = stream.header
+        if not sharding_supported():
+            return validate_unsharded(header, stream.iter_paths())
+        chunks = pipeline.chunked(stream.iter_paths(), self.chunk_paths)
+
+        if self.workers <= 1:
+            shard = ShardValidator(header)
+            issues = shard.validate_header()
+            for chunk in chunks:
+                issues.extend(shard.validate_paths(chunk))
+            return issues
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                 initargs=(header,)) as executor:
+            header_issues = executor.submit(validate_header_shard)
+            issues = []
+            for chunk_issues in pipeline.ordered_map(executor, validate_paths_shard,
+                                                     chunks, self.workers * 2):
+                issues.extend(chunk_issues)
+            return header_issues.result() + issues
+
+    def _key(self, digest: str, level: str) -> str:
+        version = f"v{VALIDATOR_VERSION}"
+        if level == FULL:
+            from importlib.metadata import version as package_version
+            version += f"-osv{package_version('openapi-spec-validator')}"
+        return f"{digest}-{level}-{version}"
+
+    def _load(self, digest: str, level: str) -> Optional[ValidationReport]:
+        with self._lock:
+            report = self._reports.get((digest, level))
+        if report is None and self.cache_dir:
+            try:
+                with open(self._path(digest, level), 'r', encoding='utf-8') as f:
+                    report = ValidationReport.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                report = None
+            if report is not None:
+                with self._lock:
+                    self._reports[(digest, level)] = report
+
+        with self._lock:
+            if report is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return report.copy(cached=True)
+
+    def _store(self, report: ValidationReport):
+        with self._lock:
+            self._reports[(report.digest, report.level)] = report
+        if self.cache_dir:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(report.to_dict(), f)
+            os.replace(tmp_path, self._path(report.digest, report.level))
+
+    def _path(self, digest: str, level: str) -> str:
+        return os.path.join(self.cache_dir, self._key(digest, level) + '.json')
+
+
+def check_header(header: Dict[str, Any]) -> List[ValidationIssue]:
+    """Structural issues of the top-level members other than paths"""
+    issues = []
+    if not isinstance(header, dict):
+        return [ValidationIssue('', 'specification is not a mapping')]
+
+    if 'openapi' not in header and 'swagger' not in header:
+        issues.append(_warning('', "no 'openapi' or 'swagger' version field"))
+    if not isinstance(header.get('info', {}), dict):
+        issues.append(ValidationIssue('info', 'is not a mapping'))
+    elif 'info' not in header:
+        issues.append(_warning('info', 'is missing'))
+
+    servers = header.get('servers', [])
+    if not isinstance(servers, list) or not all(isinstance(server, dict) for server in servers):
+        issues.append(ValidationIssue('servers', 'is not a list of mappings'))
+
+    components = header.get('components', {})
+    if not isinstance(components, dict):
+        issues.append(ValidationIssue('components', 'is not a mapping'))
+        components = {}
+    for location, schemes in (('components.securitySchemes', components.get('securitySchemes', {})),
+                              ('securityDefinitions', header.get('securityDefinitions', {}))):
+        if not isinstance(schemes, dict) or not all(isinstance(s, dict) for s in schemes.values()):
+            issues.append(ValidationIssue(location, 'is not a mapping of security schemes'))
+
+    return issues
+
+
+def check_path_item(path: str, path_item: Any, resolver: RefResolver,
+                    operation_ids: Optional[Dict[str, str]] = None,
+                    duplicate_severity: str = 'warning') -> List[ValidationIssue]:
+    """Structural issues of one path item.
+
+    operation_ids (operationId -> location) is shared across calls to find
+    duplicates over the whole spec, reported with duplicate_severity.
+    """
+    if not isinstance(path_item, dict):
+        return [ValidationIssue(path, 'path item is not a mapping')]
+
+    issues = []
+    if not path.startswith('/'):
+        issues.append(_warning(path, "path does not start with '/'"))
+
+    shared = _check_parameters([path], path_item.get('parameters', []), resolver, issues)
+    templated = _TEMPLATE.findall(path)
+
+    for method, operation in path_item.items():
+        if method not in METHODS:
+            continue
+        location = f"{method.upper()} {path}"
+        if not isinstance(operation, dict):
+            issues.append(ValidationIssue(location, 'operation is not a mapping'))
+            continue
+
+        declared = shared | _check_parameters([location, 'parameters'],
+                                              operation.get('parameters', []), resolver, issues)
+        for name in templated:
+            if name not in declared:
+                issues.append(_warning(location, f"path parameter '{name}' is not declared"))
+
+        operation_id = operation.get('operationId')
+        if operation_ids is not None and operation_id is not None:
+            first = operation_ids.setdefault(operation_id, location)
+            if first != location:
+                issues.append(ValidationIssue(location, f"operationId '{operation_id}' is already used by {first}",
+                                              severity=duplicate_severity))
+
+        if 'requestBody' in operation:
+            body = _deref(resolver, operation['requestBody'], [location, 'requestBody'], issues)
+            if not isinstance(body, dict):
+                issues.append(ValidationIssue(_location([location, 'requestBody']), 'is not a mapping'))
+            else:
+                _check_content([location, 'requestBody'], body, issues)
+
+        if 'responses' not in operation:
+            issues.append(_warning(location, 'no responses'))
+            continue
+        responses = operation['responses']
+        if not isinstance(responses, dict):
+            issues.append(ValidationIssue(_location([location, 'responses']), 'is not a mapping'))
+            continue
+        for status_code, response in responses.items():
+            parts = [location, 'responses', status_code]
+            response = _deref(resolver, response, parts, issues)
+            if not isinstance(response, dict):
+                issues.append(ValidationIssue(_location(parts), 'response is not a mapping'))
+            else:
+                _check_content(parts, response, issues)
+
+    return issues
+
+
+def _check_parameters(parts: List[str], params: Any, resolver: RefResolver,
+                      issues: List[ValidationIssue]) -> set:
+    """Check a parameter list, returning the names of the path parameters it declares"""
+    if not isinstance(params, list):
+        issues.append(ValidationIssue(_location(parts), 'parameters is not a list'))
+        return set()
+
+    declared = set()
+    for index, param in enumerate(params):
+        if not isinstance(param, dict):
+            issues.append(ValidationIssue(_location(parts + [index]), 'parameter is not a mapping'))
+            continue
+        param = _deref(resolver, param, parts + [index], issues)
+        if not isinstance(param, dict) or '$ref' in param:
+            continue
+        if 'name' not in param or 'in' not in param:
+            issues.append(_warning(_location(parts + [index]), "parameter has no 'name' or 'in'"))
+        elif param['in'] == 'path':
+            declared.add(param['name'])
+    return declared
+
+
+def _check_content(parts: List[Any], owner: Dict[str, Any], issues: List[ValidationIssue]):
+    content = owner.get('content', {})
+    if not isinstance(content, dict):
+        issues.append(ValidationIssue(_location(parts + ['content']), 'is not a mapping'))
+        return
+    for media_type, media in content.items():
+        if not isinstance(media, dict):
+            issues.append(ValidationIssue(_location(parts + ['content', media_type]), 'is not a mapping'))
+
+
+def _deref(resolver: RefResolver, node: Any, parts: List[Any], issues: List[ValidationIssue]) -> Any:
+    """Follow a local $ref, warning when it points nowhere"""
+    if isinstance(node, dict) and isinstance(node.get('$ref'), str) and node['$ref'].startswith('#/'):
+        target = resolver.deref(node)
+        if isinstance(target, dict) and '$ref' in target:
+            issues.append(_warning(_location(parts), f"unresolved $ref {target['$ref']}"))
+        return target
+    return node
+
+
+def _raise_errors(issues: List[ValidationIssue]):
+    errors = [issue for issue in issues if issue.severity == 'error']
+    if errors:
+        more = f" (and {len(errors) - 1} more)" if len(errors) > 1 else ''
+        raise ValueError(f"Invalid spec: {errors[0]}{more}")
+
+
+def _warning(location: str, message: str) -> ValidationIssue:
+    return ValidationIssue(location, message, severity='warning')
+
+
+def _location(parts: Iterable[Any]) -> str:
+    """Readable location: ['paths', '/pets', 'get', 'responses', '200'] -> 'GET /pets responses.200'"""
+    parts = [str(part) for part in parts]
+    if len(parts) > 1 and parts[0] == 'paths':
+        parts = parts[1:]
+        if len(parts) > 1 and parts[1] in METHODS:
+            parts = [f"{parts[1].upper()} {parts[0]}"] + parts[2:]
+    if not parts:
+        return ''
+    return parts[0] + (' ' + '.'.join(parts[1:]) if len(parts) > 1 else '')
+
+
+class ShardValidator:
+    """openapi-spec-validator bound to one spec header, validating it piecewise"""
+
+    def __init__(self, header: Dict[str, Any]):
+        from openapi_spec_validator.shortcuts import get_validator_cls  # heavy import
+
+        self.header = header
+        self.validator_cls = get_validator_cls(dict(header, paths={}))
+        self.light_header = {key: value for key, value in header.items() if key not in COMPONENT_KEYS}
+        # The metaschema validator is reused across chunks, keeping its $ref resolution caches warm
+        self.schema_validator = self.validator_cls(dict(header, paths={})).schema_validator
+
+        # Component schemas are checked once by validate_header, not again per referencing path
+        schemas = [(header.get('components') or {}).get('schemas'), header.get('definitions')]
+        self.component_ids = [id(schema) for group in schemas if isinstance(group, dict)
+                              for schema in group.values()]
+
+    def validate_header(self) -> List[ValidationIssue]:
+        """Metaschema and semantic checks of everything but the path items"""
+        validator = self.validator_cls(dict(self.header, paths={}))
+        return _collect(validator.iter_errors(), 'components')
+
+    def validate_paths(self, chunk: List[Tuple[str, Any]]) -> List[ValidationIssue]:
+        """Metaschema and semantic checks of a chunk of path items.
+
+        Components are present for $ref resolution, but only the path items
+        are checked against the metaschema here.
+        """
+        paths = dict(chunk)
+        validator = self.validator_cls(dict(self.header, paths=paths))
+        validator.keyword_validators_registry['schema'].schema_ids_registry = _SeenSchemas(self.component_ids)
+        errors = self.schema_validator.iter_errors(dict(self.light_header, paths=paths))
+        issues = _collect((error for error in errors if list(error.absolute_path)[:1] == ['paths']), '')
+
+        path_validator = validator.keyword_validators_registry['path']
+        paths_path = validator.schema_path / 'paths'
+        for url in paths:
+            issues.extend(_collect(path_validator(url, paths_path / url), url))
+        return issues
+
+
+def sharding_supported(version: Optional[str] = None) -> bool:
+    """Whether this openapi-spec-validator release (default: the installed one) can be sharded"""
+    if version is None:
+        from importlib.metadata import version as package_version
+        version = package_version('openapi-spec-validator')
+    try:
+        release = tuple(int(part) for part in version.split('.')[:2])
+    except ValueError:
+        return False
+    low, high = SHARDED_VALIDATOR_VERSIONS
+    return low <= release < high
+
+
+def validate_unsharded(header: Dict[str, Any], path_items: Iterable[Tuple[str, Any]]) -> List[ValidationIssue]:
+    """One validator over the whole document, through the library's public API only"""
+    from openapi_spec_validator.shortcuts import get_validator_cls  # heavy import
+
+    spec = dict(header, paths=dict(path_items))
+    return _collect(get_validator_cls(spec)(spec).iter_errors(), '')
+
+
+class _SeenSchemas(set):
+    """Set standing in for the library's list of visited schema ids, which it only appends to"""
+
+    append = set.add
+
+
+def _collect(errors: Iterator[Any], location: str) -> List[ValidationIssue]:
+    """Issues from a validator's errors; an exception ends the walk as one more issue"""
+    issues = []
+    try:
+        for error in errors:
+            if type(error).__name__ in SHARD_LOCAL_ERRORS:
+                continue
+            parts = list(error.absolute_path)
+            issues.append(ValidationIssue(_location(parts) if parts else location, error.message))
+    except Exception as e:
+        # referencing's errors quote the whole document; name the reference instead
+        ref = getattr(e, 'ref', None)
+        reason = f"unresolvable $ref {ref}" if ref else type(e).__name__
+        issues.append(ValidationIssue(location, f"validation aborted: {reason}"))
+    return issues
+
+
+_worker_shard: Optional[ShardValidator] = None
+
+
+def init_worker(header: Dict[str, Any]):
+    """Bind the worker process to the spec header, sent once instead of per chunk"""
+    global _worker_shard
+    _worker_shard = ShardValidator(header)
+
+
+def validate_header_shard() -> List[ValidationIssue]:
+    return _worker_shard.validate_header()
+
+
+def validate_paths_shard(chunk: List[Tuple[str, Any]]) -> List[ValidationIssue]:
+    return _worker_shard.validate_paths(chunk)
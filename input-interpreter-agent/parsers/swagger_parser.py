@@ -1,36 +1,210 @@
-import requests
-import yaml
-import json
-from typing import Dict, Any, List, Optional
+import os
+import tempfile
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, BinaryIO, Tuple, TYPE_CHECKING
 from urllib.parse import urlparse
 from models.endpoint_model import *
+from parsers.ref_resolver import RefResolver
+from parsers.spec_cache import SpecCache
+from parsers.spec_decoder import decode_spec
+from parsers.spec_diff import OperationFingerprinter
+from parsers.spec_stream import SpecStream
+from utils.http_pool import HostLimiter
+from utils.metrics import Instrumentation, NULL_INSTRUMENTATION
+
+if TYPE_CHECKING:
+    import requests
+
+# Swagger 2.0 carries the request body as parameters in these locations
+BODY_LOCATIONS = ('body', 'formData')
+FORM_MEDIA_TYPES = ('application/x-www-form-urlencoded', 'multipart/form-data')
+DEFAULT_MEDIA_TYPES = ['application/json']
 
 
 class SwaggerParser:
-    def __init__(self):
+    def __init__(self, cache: Optional[SpecCache] = None, session: Optional['requests.Session'] = None,
+                 timeout: float = 30, host_limiter: Optional[HostLimiter] = None):
         self.spec_data = None
         self.base_url = ""
+        self.resolver = RefResolver({})
+        self.fingerprinter = OperationFingerprinter(self.resolver)
+        self.cache = cache
+        self._http = session
+        self.timeout = timeout
+        self.host_limiter = host_limiter
+        self._shared: Dict[Any, Any] = {}
+
+    @property
+    def http(self):
+        """HTTP client; requests is only imported once a remote spec is fetched"""
+        if self._http is None:
+            import requests
+            self._http = requests
+        return self._http
+
+    @http.setter
+    def http(self, session):
+        self._http = session
 
     def fetch_spec(self, swagger_url: str) -> Dict[str, Any]:
-        """Fetch Swagger specification from URL"""
+        """Fetch Swagger specification from URL, file:// URL or local path"""
         try:
-            response = requests.get(swagger_url, timeout=30)
-            response.raise_for_status()
+            local_path = self._local_path(swagger_url)
+            if local_path is not None:
+                spec_data = self._fetch_local(local_path)
+            else:
+                spec_data = self._fetch_remote(swagger_url)
 
-            # Determine if JSON or YAML
-            content_type = response.headers.get('content-type', '').lower()
+            return self.load_spec(spec_data)
 
-            if 'json' in content_type:
-                self.spec_data = response.json()
-            else:
-                # Try YAML parsing
-                self.spec_data = yaml.safe_load(response.text)
+        except Exception as e:
+            raise Exception(f"Failed to fetch Swagger spec: {str(e)}")
 
-            return self.spec_data
+    def _local_path(self, source: str) -> Optional[str]:
+        """Return the filesystem path for file:// URLs and plain paths"""
+        parsed = urlparse(source)
+        if parsed.scheme == 'file':
+            from urllib.request import url2pathname  # pulls in http.client and ssl
+            return url2pathname(parsed.path)
+        if parsed.scheme in ('http', 'https'):
+            return None
+        return source
+
+    def _fetch_local(self, path: str) -> Dict[str, Any]:
+        """Read a spec from disk, reusing the cached parse if the file is unchanged"""
+        if self.cache is None:
+            with open(path, 'rb') as f:
+                return decode_spec(f.read())
+
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        validator = f"{stat.st_mtime_ns}:{stat.st_size}"
+
+        entry = self.cache.entry(key)
+        if entry and entry.get('validator') == validator:
+            spec_data = self.cache.load(key)
+            if spec_data is not None:
+                return spec_data
+
+        with open(path, 'rb') as f:
+            return self.cache.store(key, f.read(), decode_spec, validator=validator)
+
+    def _fetch_remote(self, url: str) -> Dict[str, Any]:
+        """Download a spec, revalidating against the cache with a conditional GET"""
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+
+        with self._host_slot(url):
+            response = self.http.get(url, headers=headers, timeout=self.timeout)
+
+            if response.status_code == 304 and self.cache is not None:
+                spec_data = self.cache.load(url)
+                if spec_data is not None:
+                    return spec_data
+                # Cached copy vanished: fetch again unconditionally
+                response = self.http.get(url, timeout=self.timeout)
+
+        response.raise_for_status()
+
+        # JSON vs YAML is sniffed from the bytes, not the Content-Type header
+        if self.cache is None:
+            return decode_spec(response.content)
+
+        return self.cache.store(
+            url, response.content, decode_spec,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+
+    def open_stream(self, source: str, metrics: Instrumentation = NULL_INSTRUMENTATION) -> SpecStream:
+        """Open a spec for incremental reading without decoding it whole"""
+        try:
+            with metrics.stage('fetch'):
+                fileobj, digest = self._open_source(source)
+            with metrics.stage('decode_header'):
+                # Remote content in the cache comes with its decoded header after the first run
+                state = self.cache.header(digest) if digest else None
+                try:
+                    stream = SpecStream(fileobj, state=state)
+                except Exception:
+                    fileobj.close()
+                    raise
+                if digest and state is None and stream.state() is not None:
+                    self.cache.store_header(digest, stream.state())
+                return stream
 
         except Exception as e:
             raise Exception(f"Failed to fetch Swagger spec: {str(e)}")
 
+    def open_source(self, source: str) -> BinaryIO:
+        """Return a seekable binary file holding the raw spec content"""
+        return self._open_source(source)[0]
+
+    def _open_source(self, source: str) -> Tuple[BinaryIO, Optional[str]]:
+        """Seekable raw content, with its cache digest when it is held by the spec cache.
+
+        With a cache, remote bodies are streamed into it (so the next fetch
+        is a conditional GET) instead of into a temporary file.
+        """
+        local_path = self._local_path(source)
+        if local_path is not None:
+            return open(local_path, 'rb'), None
+
+        headers = self.cache.conditional_headers(source) if self.cache else {}
+
+        with self._host_slot(source):
+            response = self.http.get(source, headers=headers, timeout=self.timeout, stream=True)
+
+            if response.status_code == 304 and self.cache is not None:
+                response.close()
+                cached = self.cache.open_raw(source)
+                if cached is not None:
+                    return cached
+                # Cached copy vanished: fetch again unconditionally
+                response = self.http.get(source, timeout=self.timeout, stream=True)
+
+            response.raise_for_status()
+
+            with response:
+                chunks = response.iter_content(chunk_size=1024 * 1024)
+                if self.cache is not None:
+                    return self.cache.store_stream(source, chunks,
+                                                   etag=response.headers.get('ETag'),
+                                                   last_modified=response.headers.get('Last-Modified'))
+
+                # Spool to disk so the body can be memory-mapped instead of held in memory
+                spool = tempfile.TemporaryFile()
+                for chunk in chunks:
+                    spool.write(chunk)
+            spool.flush()
+
+        return spool, None
+
+    def _host_slot(self, url: str):
+        """Per-host concurrency slot, or a no-op when no limiter is configured"""
+        return self.host_limiter.slot(url) if self.host_limiter else nullcontext()
+
+    def load_spec(self, spec_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Use an already decoded specification and index its components"""
+        self.spec_data = spec_data
+        self.resolver = RefResolver(spec_data)
+        self.fingerprinter = OperationFingerprinter(self.resolver)
+        self._shared = {}
+        return spec_data
+
+    def _share(self, key: Optional[tuple], build):
+        """Return one model instance per key so equal sub-objects are shared.
+
+        Only keys derived from component references or plain values are used;
+        inline spec nodes are transient when streaming and never keyed by id.
+        """
+        if key is None:
+            return build()
+
+        obj = self._shared.get(key)
+        if obj is None:
+            obj = self._shared[key] = build()
+        return obj
+
     def parse_servers(self, spec: Dict[str, Any]) -> List[str]:
         """Extract server URLs"""
         servers = []
@@ -103,33 +277,96 @@ class SwaggerParser:
 
         return None
 
+    def media_types(self, operation: Dict[str, Any], key: str) -> List[str]:
+        """Swagger 2.0 consumes/produces of an operation, falling back to the spec's"""
+        spec = self.spec_data or {}
+        return operation.get(key) or spec.get(key) or DEFAULT_MEDIA_TYPES
+
+    def operation_parameters(self, path_parameters: List[Dict[str, Any]],
+                             operation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Raw parameters of an operation: the path-level ones it does not override, then its own"""
+        own = operation.get('parameters', [])
+        if not path_parameters:
+            return own
+
+        overridden = {self._parameter_key(param) for param in own}
+        return [param for param in path_parameters if self._parameter_key(param) not in overridden] + own
+
+    def _parameter_key(self, param: Dict[str, Any]) -> Tuple[Any, Any]:
+        param = self.resolver.deref(param)
+        return param.get('name'), param.get('in')
+
     def parse_parameters(self, params: List[Dict[str, Any]]) -> List[Parameter]:
-        """Parse endpoint parameters"""
+        """Parse endpoint parameters; Swagger 2.0 body parameters go to parse_body_parameters"""
         parameters = []
 
         for param in params:
-            param_obj = Parameter(
-                name=param.get('name', ''),
-                location=param.get('in', 'query'),
-                type=param.get('type', param.get('schema', {}).get('type', 'string')),
-                required=param.get('required', False),
-                description=param.get('description', ''),
-                example=param.get('example'),
-                default_value=param.get('default')
-            )
+            if self.resolver.deref(param).get('in') in BODY_LOCATIONS:
+                continue
+            key = ('parameter', param['$ref']) if '$ref' in param else None
+            parameters.append(self._share(key, lambda: self._parse_parameter(param)))
 
-            # Handle enum values
-            if 'enum' in param:
-                param_obj.enum_values = param['enum']
-            elif 'schema' in param and 'enum' in param['schema']:
-                param_obj.enum_values = param['schema']['enum']
+        return parameters
 
-            parameters.append(param_obj)
+    def parse_body_parameters(self, params: List[Dict[str, Any]],
+                              consumes: List[str]) -> Optional[RequestBody]:
+        """Swagger 2.0 request body from an in: body parameter or the in: formData ones"""
+        params = [self.resolver.deref(param) for param in params]
 
-        return parameters
+        for param in params:
+            if param.get('in') == 'body':
+                return RequestBody(
+                    content_type=consumes[0],
+                    schema=self.resolver.resolve(param.get('schema', {})),
+                    required=param.get('required', False)
+                )
+
+        form = [param for param in params if param.get('in') == 'formData']
+        if not form:
+            return None
+
+        properties = {}
+        for param in form:
+            schema = {key: value for key, value in param.items()
+                      if key not in ('name', 'in', 'required', 'description', 'allowEmptyValue')}
+            if schema.get('type') == 'file':
+                schema = {'type': 'string', 'format': 'binary'}
+            properties[param.get('name', '')] = schema
+
+        content_type = next((media for media in consumes if media in FORM_MEDIA_TYPES), None)
+        if content_type is None:
+            has_file = any(param.get('type') == 'file' for param in form)
+            content_type = FORM_MEDIA_TYPES[1] if has_file else FORM_MEDIA_TYPES[0]
+
+        return RequestBody(
+            content_type=content_type,
+            schema={'type': 'object', 'properties': properties,
+                    'required': [param['name'] for param in form if param.get('required')]},
+            required=any(param.get('required') for param in form)
+        )
+
+    def _parse_parameter(self, param: Dict[str, Any]) -> Parameter:
+        """Parse a single parameter definition"""
+        param = self.resolver.deref(param)
+        # Swagger 2.0 keeps type constraints (minimum, pattern, ...) on the parameter itself
+        schema = self.resolver.resolve(param['schema']) if 'schema' in param else param
+
+        return Parameter(
+            name=param.get('name', ''),
+            location=param.get('in', 'query'),
+            type=param.get('type', schema.get('type', 'string')),
+            required=param.get('required', False),
+            description=param.get('description', ''),
+            example=param.get('example'),
+            default_value=param.get('default'),
+            enum_values=param.get('enum', schema.get('enum', [])),
+            format=param.get('format', schema.get('format')),
+            schema=schema
+        )
 
     def parse_request_body(self, request_body: Dict[str, Any]) -> Optional[RequestBody]:
         """Parse request body definition"""
+        request_body = self.resolver.deref(request_body)
         if not request_body:
             return None
 
@@ -139,7 +376,7 @@ class SwaggerParser:
         content_type = list(content.keys())[0] if content else 'application/json'
 
         if content_type in content:
-            schema = content[content_type].get('schema', {})
+            schema = self.resolver.resolve(content[content_type].get('schema', {}))
             examples = content[content_type].get('examples', {})
 
             return RequestBody(
@@ -151,31 +388,62 @@ class SwaggerParser:
 
         return None
 
-    def parse_responses(self, responses: Dict[str, Any]) -> List[Response]:
-        """Parse response definitions"""
+    def parse_responses(self, responses: Dict[str, Any],
+                        produces: List[str] = DEFAULT_MEDIA_TYPES) -> List[Response]:
+        """Parse response definitions; produces applies to Swagger 2.0 response schemas"""
         response_list = []
 
         for status_code, response_def in responses.items():
+            ref = response_def.get('$ref')
+            response_def = self.resolver.deref(response_def)
             content = response_def.get('content', {})
+            if not content and 'schema' in response_def:
+                content = {media: {'schema': response_def['schema']} for media in produces}
+            headers = response_def.get('headers', {})
 
             # Handle multiple content types
             for content_type, content_def in content.items():
-                response_obj = Response(
-                    status_code=status_code,
-                    description=response_def.get('description', ''),
-                    content_type=content_type,
-                    schema=content_def.get('schema', {}),
-                    headers=response_def.get('headers', {})
+                schema = content_def.get('schema', {})
+                response_obj = self._share(
+                    self._response_key(ref, status_code, response_def, content_type, schema),
+                    lambda: Response(
+                        status_code=status_code,
+                        description=response_def.get('description', ''),
+                        content_type=content_type,
+                        schema=self.resolver.resolve(schema),
+                        headers=headers
+                    )
                 )
                 response_list.append(response_obj)
 
             # If no content, create basic response
             if not content:
-                response_obj = Response(
-                    status_code=status_code,
-                    description=response_def.get('description', ''),
-                    content_type='text/plain'
+                response_obj = self._share(
+                    self._response_key(ref, status_code, response_def, 'text/plain', {}),
+                    lambda: Response(
+                        status_code=status_code,
+                        description=response_def.get('description', ''),
+                        content_type='text/plain'
+                    )
                 )
                 response_list.append(response_obj)
 
-        return response_list
\ No newline at end of file
+        return response_list
+
+    def _response_key(self, ref: Optional[str], status_code: str, response_def: Dict[str, Any],
+                      content_type: str, schema: Dict[str, Any]) -> Optional[tuple]:
+        """Sharing key for responses that are fully described by references/values"""
+        if ref:
+            return ('response', ref, status_code, content_type)
+
+        if response_def.get('headers'):
+            return None
+
+        if not schema:
+            schema_ref = None
+        elif len(schema) == 1 and '$ref' in schema:
+            schema_ref = schema['$ref']
+        else:
+            return None
+
+        return ('response', status_code, response_def.get('description', ''), content_type, schema_ref)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Thread-safe analysis service for long-lived processes.
+
+One AnalysisService is shared by every session of a front end (e.g. held
+by Streamlit's ``st.cache_resource``) instead of building an agent per
+session:
+
+    service = AnalysisService(max_workers=4, ttl=600)
+    analysis = service.analyze('https://petstore.swagger.io/v2/swagger.json')
+    summary = service.summary('https://petstore.swagger.io/v2/swagger.json')
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from agent import InputInterpreterAgent
+from models.endpoint_model import CorrelationGraph, SwaggerAnalysis
+from parsers.snapshot_store import AnalysisSnapshotStore
+from parsers.spec_cache import SpecCache
+from utils.http_pool import create_session, HostLimiter
+from utils.single_flight import SingleFlight
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the service already has as many analyses running and queued as it accepts"""
+
+
+class AnalysisCache:
+    """In-memory LRU of analyses, each expiring ttl seconds after it was stored"""
+
+    def __init__(self, max_entries: int = 64, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, SwaggerAnalysis]]' = OrderedDict()
+
+    def get(self, key: str) -> Optional[SwaggerAnalysis]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, analysis: SwaggerAnalysis):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one source, or every entry"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class AnalysisService:
+    """Reentrant front end to the agent for many concurrent callers.
+
+    No per-call state is kept on the service: every analysis runs on a
+    fresh agent in a bounded worker pool, sharing the HTTP connection pool,
+    per-host limits and the optional on-disk spec cache and snapshot store.
+    Finished analyses are kept in an in-memory TTL + LRU cache, and
+    concurrent requests for the same source while it is being analyzed are
+    coalesced into that one run.
+
+    At most ``max_workers`` analyses run and ``max_pending`` more wait;
+    beyond that ``ServiceBusy`` is raised at once rather than queueing
+    without bound. Returned analyses are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16, ttl: float = 300.0,
+                 max_entries: int = 64, per_host_limit: int = 4, timeout: float = 30,
+                 spec_cache: Optional[SpecCache] = None,
+                 snapshot_store: Optional[AnalysisSnapshotStore] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.spec_cache = spec_cache
+        self.snapshot_store = snapshot_store
+        self.cache = AnalysisCache(max_entries=max_entries, ttl=ttl, clock=clock)
+        self.rejected = 0
+
+        self._flights = SingleFlight()
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis')
+        self._host_limiter = HostLimiter(per_host_limit)
+        self._per_host_limit = per_host_limit
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def analyze(self, source: str, refresh: bool = False,
+                timeout: Optional[float] = None) -> SwaggerAnalysis:
+        """Analysis of a spec URL or path, from the cache when fresh"""
+        return self.submit(source, refresh=refresh).result(timeout)
+
+    def submit(self, source: str, refresh: bool = False) -> 'Future[SwaggerAnalysis]':
+        """Future of the analysis: cached, joined to the run in flight, or newly queued"""
+        if not refresh:
+            analysis = self.cache.get(source)
+            if analysis is not None:
+                future: 'Future[SwaggerAnalysis]' = Future()
+                future.set_result(analysis)
+                return future
+        return self._flights.submit(source, lambda: self._schedule(source))
+
+    def summary(self, source: str) -> Dict[str, Any]:
+        """Endpoint summary of a source (see InputInterpreterAgent.get_endpoint_summary)"""
+        return self._view(self.analyze(source)).get_endpoint_summary()
+
+    def correlations(self, source: str) -> CorrelationGraph:
+        """Producer -> consumer correlations of a source"""
+        return self._view(self.analyze(source)).find_correlations()
+
+    def invalidate(self, source: Optional[str] = None):
+        self.cache.invalidate(source)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            rejected = self.rejected
+        return {
+            'cached': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+            'in_flight': self._flights.in_flight(),
+            'started': self._flights.started,
+            'coalesced': self._flights.coalesced,
+            'rejected': rejected
+        }
+
+    def close(self):
+        """Wait for running analyses and release the pool and connections"""
+        self._executor.shutdown(wait=True)
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self) -> 'AnalysisService':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _schedule(self, source: str) -> 'Future[SwaggerAnalysis]':
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise ServiceBusy(f"{self.max_workers} analyses running and {self.max_pending} "
+                              f"queued; try again later")
+        try:
+            return self._executor.submit(self._run, source)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _run(self, source: str) -> SwaggerAnalysis:
+        # The slot is released before the future completes, so a caller woken
+        # by the result can be accepted straight away
+        try:
+            agent = InputInterpreterAgent(spec_cache=self.spec_cache, snapshot_store=self.snapshot_store)
+            agent.parser.timeout = self.timeout
+            agent.parser.host_limiter = self._host_limiter
+            if urlsplit(source).scheme in ('http', 'https'):
+                agent.parser.http = self._http_session()
+
+            analysis = agent.process_swagger_url(source)
+            self.cache.put(source, analysis)
+            return analysis
+        finally:
+            self._slots.release()
+
+    def _http_session(self):
+        with self._session_lock:
+            if self._session is None:
+                self._session = create_session(self._per_host_limit)
+            return self._session
+
+    def _view(self, analysis: SwaggerAnalysis) -> InputInterpreterAgent:
+        """Throwaway agent bound to an analysis, for its read-only helpers"""
+        agent = InputInterpreterAgent()
+        agent.analysis_result = analysis
+        return agent
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import pickle
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from models.endpoint_model import EndpointInfo, HttpMethod, SwaggerAnalysis
+from utils.path_trie import PathTrie
+
+
+def endpoint(path, method, operation_id, tags=()):
+    return EndpointInfo(path=path, method=method, operation_id=operation_id,
+                        summary='', description='', tags=list(tags))
+
+
+class TestAnalysisIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.analysis = SwaggerAnalysis(
+            base_url='https://api.example.com/v2', title='Pets', version='1', description='',
+            endpoints=[
+                endpoint('/pets', HttpMethod.GET, 'listPets', ['pets']),
+                endpoint('/pets', HttpMethod.POST, 'createPet', ['pets']),
+                endpoint('/pets/{petId}', HttpMethod.GET, 'getPet', ['pets']),
+                endpoint('/pets/mine', HttpMethod.GET, 'myPets', ['pets', 'me']),
+                endpoint('/pets/{petId}/photos/{name}.{ext}', HttpMethod.GET, 'getPhoto'),
+            ])
+
+    def test_lookups(self):
+        """Operation, tag and method indexes"""
+        self.assertEqual(self.analysis.get_endpoint('getPet').path, '/pets/{petId}')
+        self.assertIsNone(self.analysis.get_endpoint('missing'))
+        self.assertEqual([ep.operation_id for ep in self.analysis.endpoints_by_tag('me')], ['myPets'])
+        self.assertEqual(len(self.analysis.endpoints_by_method('get')), 4)
+        self.assertEqual(len(self.analysis.endpoints_by_method(HttpMethod.POST)), 1)
+        self.assertEqual(self.analysis.endpoints_by_tag('none'), ())
+
+    def test_match_path(self):
+        """Concrete paths and URLs resolve to their templates"""
+        endpoint_, params = self.analysis.match_path('/pets/42')
+        self.assertEqual((endpoint_.operation_id, params), ('getPet', {'petId': '42'}))
+
+        self.assertEqual(self.analysis.match_path('/pets/mine')[0].operation_id, 'myPets')
+        self.assertEqual(self.analysis.match_path('/pets', 'POST')[0].operation_id, 'createPet')
+        self.assertIsNone(self.analysis.match_path('/pets/42', 'DELETE'))
+        self.assertIsNone(self.analysis.match_path('/owners/1'))
+
+        endpoint_, params = self.analysis.match_path(
+            'https://api.example.com/v2/pets/7/photos/cat.png?size=large')
+        self.assertEqual(endpoint_.operation_id, 'getPhoto')
+        self.assertEqual(params, {'petId': '7', 'name': 'cat', 'ext': 'png'})
+
+    def test_indexes_follow_changes(self):
+        """Mutating or replacing endpoints invalidates the indexes"""
+        self.assertIsNone(self.analysis.get_endpoint('deletePet'))
+
+        self.analysis.endpoints.append(endpoint('/pets/{petId}', HttpMethod.DELETE, 'deletePet'))
+        self.assertIsNotNone(self.analysis.get_endpoint('deletePet'))
+        self.assertEqual(self.analysis.match_path('/pets/1', 'DELETE')[0].operation_id, 'deletePet')
+
+        del self.analysis.endpoints[0]
+        self.assertIsNone(self.analysis.get_endpoint('listPets'))
+
+        self.analysis.endpoints[0] = endpoint('/stores', HttpMethod.GET, 'listStores')
+        self.assertIsNone(self.analysis.get_endpoint('createPet'))
+        self.assertIsNotNone(self.analysis.get_endpoint('listStores'))
+
+        self.analysis.endpoints = [endpoint('/owners', HttpMethod.GET, 'listOwners')]
+        self.assertEqual(len(self.analysis.endpoints_by_method('GET')), 1)
+        self.assertEqual(self.analysis.match_path('/owners')[0].operation_id, 'listOwners')
+
+        # In-place edits need an explicit invalidation
+        self.analysis.endpoints[0].operation_id = 'owners'
+        self.analysis.invalidate_indexes()
+        self.assertIsNotNone(self.analysis.get_endpoint('owners'))
+
+    def test_pickle_drops_indexes(self):
+        """Pickled analyses carry endpoints but not their indexes"""
+        self.analysis.get_endpoint('getPet')
+        restored = pickle.loads(pickle.dumps(self.analysis))
+
+        self.assertNotIn('getPet', str(restored.__dict__.get('_indexes')))
+        self.assertEqual(restored.get_endpoint('getPet').path, '/pets/{petId}')
+        restored.endpoints.append(endpoint('/x', HttpMethod.GET, 'x'))
+        self.assertIsNotNone(restored.get_endpoint('x'))
+
+    def test_summary_is_cached_until_change(self):
+        """get_endpoint_summary is built once per analysis version"""
+        agent = InputInterpreterAgent()
+        agent.analysis_result = self.analysis
+
+        summary = agent.get_endpoint_summary()
+        self.assertIs(agent.get_endpoint_summary(), summary)
+
+        self.analysis.endpoints.pop()
+        changed = agent.get_endpoint_summary()
+        self.assertIsNot(changed, summary)
+        self.assertEqual(changed['api_info']['total_endpoints'], 4)
+
+        self.analysis.title = 'Renamed'
+        self.assertEqual(agent.get_endpoint_summary()['api_info']['title'], 'Renamed')
+
+    def test_trie_prefers_literals_with_backtracking(self):
+        """A literal branch that dead-ends falls back to the parameter branch"""
+        trie = PathTrie()
+        trie.insert('/a/{x}/c', 'param')
+        trie.insert('/a/b/d', 'literal')
+
+        self.assertEqual(trie.match('/a/b/c'), ('param', {'x': 'b'}))
+        self.assertEqual(trie.match('/a/b/d'), ('literal', {}))
+        self.assertEqual(len(trie), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from parsers.spec_validator import SpecValidator
+from utils.metrics import Instrumentation, MetricsSink
+
+
+class CatalogHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    client_ports = set()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.client_ports.add(self.client_address[1])
+        try:
+            time.sleep(0.05)
+            if self.path == '/broken.json':
+                body = b'{"error": true'
+                self.send_response(500)
+            else:
+                name = self.path.strip('/').split('.')[0]
+                body = json.dumps({
+                    'openapi': '3.0.0',
+                    'info': {'title': name, 'version': '1.0'},
+                    'paths': {f"/{name}": {'get': {'responses': {'200': {'description': 'ok'}}}}}
+                }).encode('utf-8')
+                self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestProcessMany(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), CatalogHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_batch_survives_failures_and_respects_host_limit(self):
+        """Every URL gets a result, errors included, within the per-host limit"""
+        urls = [f"{self.base}/svc{i}.json" for i in range(8)] + [f"{self.base}/broken.json"]
+
+        results = list(InputInterpreterAgent().process_many(urls, max_workers=6, per_host_limit=2))
+
+        by_url = {r.url: r for r in results}
+        self.assertEqual(set(by_url), set(urls))
+        self.assertFalse(by_url[f"{self.base}/broken.json"].ok)
+        self.assertEqual(by_url[f"{self.base}/svc3.json"].analysis.title, 'svc3')
+        self.assertLessEqual(CatalogHandler.max_in_flight, 2)
+        # Connections are reused instead of opened per spec
+        self.assertLessEqual(len(CatalogHandler.client_ports), 2)
+
+    def test_batch_uses_the_agent_settings(self):
+        """Every spec reports metrics and is validated like a single run"""
+        class ListSink(MetricsSink):
+            reports = []
+
+            def emit(self, report):
+                self.reports.append(report)
+
+        validator = SpecValidator(full=True)
+        self.addCleanup(validator.close)
+        agent = InputInterpreterAgent(instrumentation=Instrumentation(sinks=[ListSink()]), validator=validator)
+        urls = [f"{self.base}/svc{i}.json" for i in range(3)]
+
+        results = list(agent.process_many(urls, max_workers=3))
+        validator.close()
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(sorted(report['context']['source'] for report in ListSink.reports), urls)
+        self.assertEqual(validator.misses, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from benchmarks.run_benchmarks import run_suite, compare
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_generated_specs_parse(self):
+        """Both spec versions go through the parser with refs resolved"""
+        for version in ('2', '3'):
+            agent = InputInterpreterAgent()
+            spec = agent.parser.load_spec(generate_spec(version=version, paths=5, params=4))
+
+            endpoints = agent._parse_all_endpoints(spec)
+
+            self.assertEqual(len(endpoints), 10)
+            self.assertEqual(endpoints[0].parameters[0].name, 'resourceId')
+            self.assertEqual(agent.parser.parse_servers(spec), ['http://localhost:8080/api'])
+
+    def test_generated_constructs_are_consumed(self):
+        """Path-level parameters, bodies and response schemas all reach the analysis, in both versions"""
+        shapes = {}
+        for version in ('2', '3'):
+            agent = InputInterpreterAgent()
+            spec = agent.parser.load_spec(generate_spec(version=version, paths=3, params=4,
+                                                        response_variants=2))
+            endpoints = {endpoint.operation_id: endpoint for endpoint in agent._parse_all_endpoints(spec)}
+
+            get, post = endpoints['getResource0'], endpoints['createResource0']
+            self.assertEqual([p.name for p in post.parameters], ['resourceId'])
+            self.assertEqual(len(get.parameters), 5)
+            self.assertEqual(post.request_body.schema['required'], ['id', 'name'])
+            for endpoint in (get, post):
+                self.assertEqual(len(endpoint.responses), 6)  # 3 status codes x JSON and XML
+                for response in endpoint.responses:
+                    self.assertIn('properties', response.schema)
+
+            shapes[version] = [(e.operation_id, [p.name for p in e.parameters],
+                                e.request_body is not None, [(r.status_code, r.content_type) for r in e.responses])
+                               for e in endpoints.values()]
+
+        self.assertEqual(shapes['2'], shapes['3'])
+
+    def test_suite_runs_offline_and_flags_regressions(self):
+        """The harness times every stage and compares against a baseline"""
+        results = run_suite({'paths': 3, 'models': 3}, repeat=1, track_memory=False)
+
+        self.assertEqual(results['meta']['endpoints'], 6)
+        self.assertIn('export_detailed_analysis', results['stages'])
+
+        baseline = {'stages': {'decode': {'seconds': results['stages']['decode']['seconds'] / 2}}}
+        self.assertEqual(len(compare(results, baseline, threshold=0.2)), 1)
+        self.assertEqual(compare(results, results, threshold=0.2), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.serialization import loads_analysis
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'cli.py')
+
+# Microseconds the CLI's own imports may take before a command runs
+STARTUP_BUDGET_US = 60_000
+HEAVY_MODULES = ('requests', 'yaml', 'urllib3', 'agent', 'numpy')
+# Loaded only by the commands that need them, never to analyze a spec
+COMMAND_MODULES = ('writers', 'parsers.jtl_parser', 'parsers.data_source', 'parsers.correlation',
+                   'parsers.snapshot_store', 'concurrent.futures.process', 'multiprocessing',
+                   'xml', 'http.client', 'urllib.request', 'csv', 'numpy')
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'CLI', 'version': '1.0'},
+    'paths': {'/pets/{petId}': {'get': {
+        'operationId': 'getPet',
+        'parameters': [{'name': 'petId', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}],
+        'responses': {'200': {'description': 'ok'}}}}}
+}
+
+
+def run_cli(*args: str, stdin: bytes = b'', importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ['-X', 'importtime'] if importtime else []
+    return subprocess.run([sys.executable, *flags, CLI, *args], input=stdin, capture_output=True,
+                          cwd=ROOT, timeout=120)
+
+
+def imported_modules(stderr: bytes) -> dict:
+    """Module -> cumulative import time (us) of the imports after interpreter startup"""
+    modules = {}
+    started = False
+    for line in stderr.decode('utf-8', 'replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:].rstrip()  # nested imports keep their indentation
+        if started:
+            modules[name] = int(cumulative)
+        elif name.strip() == 'site':
+            started = True
+    return modules
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.spec_path = os.path.join(self.tmp_dir.name, 'spec.json')
+        with open(self.spec_path, 'w', encoding='utf-8') as f:
+            json.dump(SPEC, f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_startup_budget(self):
+        """--help imports no heavy module and stays within the startup budget"""
+        result = run_cli('--help', importtime=True)
+        self.assertEqual(result.returncode, 0)
+
+        modules = imported_modules(result.stderr)
+        top_level = {name: us for name, us in modules.items() if not name.startswith(' ')}
+        for heavy in HEAVY_MODULES:
+            self.assertNotIn(heavy, {name.strip().split('.')[0] for name in modules})
+        self.assertLess(sum(top_level.values()), STARTUP_BUDGET_US, top_level)
+
+    def test_local_json_needs_no_network_stack(self):
+        result = run_cli('summary', self.spec_path, importtime=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        names = {name.strip().split('.')[0] for name in imported_modules(result.stderr)}
+        self.assertIn('agent', names)
+        self.assertNotIn('requests', names)
+        self.assertNotIn('yaml', names)
+
+    def test_analysis_skips_other_commands_modules(self):
+        for command in ('summary', 'analyze'):
+            result = run_cli(command, self.spec_path, importtime=True)
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+            names = {name.strip() for name in imported_modules(result.stderr)}
+            self.assertIn('parsers.swagger_parser', names)
+            for module in COMMAND_MODULES:
+                loaded = [name for name in names if name == module or name.startswith(module + '.')]
+                self.assertEqual(loaded, [], f"{command} imported {module}")
+
+    def test_summary_from_stdin(self):
+        with open(self.spec_path, 'rb') as f:
+            result = run_cli('summary', '-', stdin=f.read())
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        summary = json.loads(result.stdout)
+        self.assertEqual(summary['api_info']['title'], 'CLI')
+        self.assertEqual(summary['api_info']['total_endpoints'], 1)
+
+    def test_analyze_round_trips(self):
+        output = os.path.join(self.tmp_dir.name, 'analysis.bin')
+        result = run_cli('analyze', self.spec_path, '--binary', '-o', output)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        with open(output, 'rb') as f:
+            analysis = loads_analysis(f.read())
+        self.assertEqual(analysis.get_endpoint('getPet').path, '/pets/{petId}')
+
+    def test_export(self):
+        jmx_path = os.path.join(self.tmp_dir.name, 'plan.jmx')
+        data_dir = os.path.join(self.tmp_dir.name, 'data')
+        result = run_cli('export', self.spec_path, '--jmx', jmx_path, '--data-dir', data_dir, '--rows', '5')
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        self.assertEqual(os.listdir(data_dir), ['getPet_0.csv'])
+        with open(jmx_path, 'r', encoding='utf-8') as f:
+            self.assertIn('getPet_0.csv', f.read())
+
+    def test_errors_exit_non_zero(self):
+        self.assertEqual(run_cli('export', self.spec_path).returncode, 2)
+        result = run_cli('summary', os.path.join(self.tmp_dir.name, 'missing.json'))
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('Error', result.stderr.decode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from models.endpoint_model import SwaggerAnalysis
+from parsers.correlation import CorrelationEngine
+
+
+def json_response(schema, code='200'):
+    return {code: {'description': 'ok', 'content': {'application/json': {'schema': schema}}}}
+
+
+def json_body(schema):
+    return {'required': True, 'content': {'application/json': {'schema': schema}}}
+
+
+PET = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'integer', 'readOnly': True},
+        'name': {'type': 'string'},
+        'ownerId': {'type': 'integer'},
+        'status': {'type': 'string'}
+    }
+}
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Pets', 'version': '1'},
+    'paths': {
+        '/pets': {
+            'post': {'operationId': 'createPet', 'requestBody': json_body(PET),
+                     'responses': json_response(PET, '201')},
+            'get': {'operationId': 'listPets',
+                    'responses': json_response({'type': 'array', 'items': PET})}
+        },
+        '/pets/{petId}': {
+            'get': {'operationId': 'getPet',
+                    'parameters': [{'name': 'petId', 'in': 'path', 'required': True,
+                                    'schema': {'type': 'string'}}],
+                    'responses': json_response(PET)}
+        },
+        '/pets/{id}/vaccinations': {
+            'delete': {'operationId': 'clearVaccinations',
+                       'parameters': [{'name': 'id', 'in': 'path', 'required': True,
+                                       'schema': {'type': 'integer'}},
+                                      {'name': 'flag', 'in': 'query', 'schema': {'type': 'boolean'}}],
+                       'responses': {'204': {'description': 'gone'}}}
+        },
+        '/owners': {
+            'post': {'operationId': 'createOwner',
+                     'requestBody': json_body({'type': 'object', 'properties': {'name': {'type': 'string'}}}),
+                     'responses': json_response({'type': 'object', 'properties': {
+                         'id': {'type': 'integer'}, 'name': {'type': 'string'}}}, '201')}
+        },
+        '/orders': {
+            'post': {'operationId': 'createOrder',
+                     'requestBody': json_body({'type': 'object', 'properties': {
+                         'petId': {'type': 'integer'}, 'quantity': {'type': 'integer'}}}),
+                     'responses': json_response({'type': 'object', 'properties': {
+                         'orderId': {'type': 'string'}, 'flag': {'type': 'string'}}})}
+        },
+        '/orders/{orderId}': {
+            'get': {'operationId': 'getOrder',
+                    'parameters': [{'name': 'orderId', 'in': 'path', 'required': True,
+                                    'schema': {'type': 'string'}}],
+                    'responses': json_response({'type': 'object'})}
+        },
+        '/login': {
+            'post': {'operationId': 'login',
+                     'responses': json_response({'type': 'object', 'properties': {
+                         'sessionToken': {'type': 'string'}}})}
+        },
+        '/me': {
+            'get': {'operationId': 'getMe',
+                    'parameters': [{'name': 'X-Session-Token', 'in': 'header', 'required': True,
+                                    'schema': {'type': 'string'}}],
+                    'responses': json_response({'type': 'object'})}
+        }
+    }
+}
+
+
+def edges(graph, consumer):
+    return [(e.producer, e.source, e.target, e.location, e.kind) for e in graph.producers_of(consumer)]
+
+
+class TestCorrelationEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = InputInterpreterAgent()
+        self.endpoints = self.agent._parse_all_endpoints(self.agent.parser.load_spec(SPEC))
+        self.graph = CorrelationEngine().correlate(self.endpoints)
+
+    def test_identifier_feeds_path_parameter(self):
+        """petId comes from the id of /pets responses, creating operation first"""
+        self.assertEqual(edges(self.graph, 'getPet'), [
+            ('createPet', '$.id', 'petId', 'path', 'qualified'),
+            ('listPets', '$[0].id', 'petId', 'path', 'qualified')
+        ])
+
+    def test_bare_id_is_qualified_by_its_resource(self):
+        """{id} under /pets is a pet id; the boolean flag ignores the string $.flag"""
+        self.assertEqual(edges(self.graph, 'clearVaccinations')[0],
+                         ('createPet', '$.id', 'id', 'path', 'qualified'))
+        self.assertFalse([e for e in self.graph.producers_of('clearVaccinations') if e.target == 'flag'])
+
+    def test_request_body_references(self):
+        """Reference-like body fields are correlated, readOnly and plain fields are not"""
+        self.assertEqual(edges(self.graph, 'createOrder')[0],
+                         ('createPet', '$.id', '$.petId', 'body', 'qualified'))
+        self.assertEqual(edges(self.graph, 'createPet')[0],
+                         ('createOwner', '$.id', '$.ownerId', 'body', 'qualified'))
+        self.assertEqual({e.target for e in self.graph.producers_of('createPet')}, {'$.ownerId'})
+
+    def test_name_match(self):
+        """Names match across case and separators, also outside the producer's resource"""
+        self.assertEqual(edges(self.graph, 'getOrder'),
+                         [('createOrder', '$.orderId', 'orderId', 'path', 'qualified')])
+        self.assertEqual(edges(self.graph, 'getMe'),
+                         [('login', '$.sessionToken', 'X-Session-Token', 'header', 'name')])
+        self.assertEqual([e.consumer for e in self.graph.consumers_of('login')], ['getMe'])
+
+    def test_max_producers(self):
+        graph = CorrelationEngine(max_producers=1).correlate(self.endpoints)
+        self.assertEqual(edges(graph, 'getPet'), [('createPet', '$.id', 'petId', 'path', 'qualified')])
+
+    def test_graph_grows_linearly(self):
+        """Producers per input are capped, so edges grow with the spec, not its square"""
+        def edge_count(paths):
+            endpoints = self.agent._parse_all_endpoints(self.agent.parser.load_spec(
+                generate_spec(paths=paths, models=10)))
+            return len(CorrelationEngine().correlate(endpoints).edges)
+
+        self.assertEqual(edge_count(200), 10 * edge_count(20))
+
+    def test_agent_caches_graph(self):
+        self.agent.analysis_result = SwaggerAnalysis(base_url='', title='Pets', version='1',
+                                                     description='', endpoints=self.endpoints)
+        graph = self.agent.find_correlations()
+        self.assertIs(self.agent.find_correlations(), graph)
+        self.assertEqual(graph.to_dict(), self.graph.to_dict())
+
+        self.agent.analysis_result.endpoints.pop()
+        self.assertIsNot(self.agent.find_correlations(), graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
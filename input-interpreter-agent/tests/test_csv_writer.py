@@ -0,0 +1,154 @@
+import unittest
+import sys
+import os
+import csv
+import io
+import json
+import re
+import tempfile
+import uuid
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from models.endpoint_model import EndpointInfo, HttpMethod, Parameter, SwaggerAnalysis
+from writers.csv_writer import CsvDataWriter, plan_shards
+
+
+def read_rows(paths):
+    rows = []
+    for path in paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+class TestCsvDataWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = InputInterpreterAgent()
+        spec_data = self.agent.parser.load_spec(generate_spec(paths=2, params=3))
+        self.get_endpoint, self.post_endpoint = self.agent._parse_all_endpoints(spec_data)[:2]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_plan_shards(self):
+        """Rows are split into contiguous, near equal ranges"""
+        self.assertEqual(plan_shards(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(plan_shards(2, 1), [(0, 2)])
+
+    def test_shards_are_unique_and_complete(self):
+        """Every row is written once and path parameters are unique across shards"""
+        writer = CsvDataWriter(self.agent.analyzer, batch_size=128)
+        result = writer.write(self.get_endpoint, self.tmp.name, 1000, shards=3)
+
+        self.assertEqual(result.rows, 1000)
+        self.assertEqual(len(result.files), 3)
+        self.assertGreater(result.rows_per_second, 0)
+
+        rows = read_rows(result.files)
+        self.assertEqual(len(rows), 1000)
+        self.assertEqual(list(rows[0]), ['resourceId', 'param0', 'param1', 'param2'])
+        self.assertEqual(len({row['resourceId'] for row in rows}), 1000)
+        for row in rows:
+            self.assertTrue(1 <= int(row['param1']) <= 100)
+
+    def test_output_is_reproducible_across_workers(self):
+        """Serial and process pool runs write identical files"""
+        serial = CsvDataWriter(batch_size=64, seed=5).write(
+            self.get_endpoint, os.path.join(self.tmp.name, 'serial'), 300, shards=2)
+        pooled = CsvDataWriter(batch_size=64, seed=5).write(
+            self.get_endpoint, os.path.join(self.tmp.name, 'pooled'), 300, shards=2, workers=2)
+        other_seed = CsvDataWriter(batch_size=64, seed=6).write(
+            self.get_endpoint, os.path.join(self.tmp.name, 'other'), 300, shards=2)
+
+        self.assertEqual(read_rows(serial.files), read_rows(pooled.files))
+        self.assertNotEqual(read_rows(serial.files), read_rows(other_seed.files))
+
+    def test_request_body_is_json(self):
+        """Request bodies are written as compact JSON"""
+        result = CsvDataWriter().write(self.post_endpoint, self.tmp.name, 20)
+        rows = read_rows(result.files)
+
+        self.assertEqual(len(rows), 20)
+        body = json.loads(rows[0]['request_body'])
+        self.assertIn('id', body)
+
+    def test_bounded_unique_column_fails_early(self):
+        """A unique column whose range is too small is rejected"""
+        with self.assertRaises(ValueError):
+            CsvDataWriter().write(self.get_endpoint, self.tmp.name, 500, unique_columns=['param1'])
+
+    def test_unique_columns_follow_schema(self):
+        """Unique values keep the column's type, format and pattern"""
+        def param(name, schema):
+            return Parameter(name=name, location='query', type=schema.pop('type', 'string'),
+                             format=schema.pop('format', None), schema=schema)
+
+        endpoint = EndpointInfo(
+            path='/orders', method=HttpMethod.GET, operation_id='listOrders', summary='', description='',
+            parameters=[param('id', {'format': 'uuid'}),
+                        param('ref', {'pattern': r'^[A-C]{2}-\d{2}$'}),
+                        param('day', {'format': 'date'}),
+                        param('code', {'minLength': 3, 'maxLength': 4}),
+                        param('page', {'type': 'integer', 'minimum': 5, 'multipleOf': 5})])
+        columns = ['id', 'ref', 'day', 'code', 'page']
+        writer = CsvDataWriter(batch_size=64, seed=3)
+        rows = read_rows(writer.write(endpoint, self.tmp.name, 500, shards=2, unique_columns=columns).files)
+
+        self.assertEqual(len(rows), 500)
+        for name in columns:
+            self.assertEqual(len({row[name] for row in rows}), 500, name)
+        for row in rows:
+            self.assertEqual(uuid.UUID(row['id']).version, 5)
+            self.assertRegex(row['ref'], r'^[A-C]{2}-\d{2}$')
+            self.assertRegex(row['day'], r'^\d{4}-\d{2}-\d{2}$')
+            self.assertTrue(3 <= len(row['code']) <= 4)
+            self.assertEqual(int(row['page']) % 5, 0)
+
+        # The seed changes the uuids, and a pattern runs out of matches early
+        other = CsvDataWriter(seed=4).write(endpoint, os.path.join(self.tmp.name, 'other'), 5,
+                                            unique_columns=['id'])
+        self.assertNotEqual(read_rows(other.files)[0]['id'], rows[0]['id'])
+        with self.assertRaisesRegex(ValueError, r'Column ref: pattern has fewer than 901 unique matches'):
+            writer.write(endpoint, self.tmp.name, 901, unique_columns=['ref'])
+
+    def test_default_unique_columns_are_best_effort(self):
+        """Enum and boolean path parameters are unique only when asked for"""
+        endpoint = EndpointInfo(
+            path='/pets/{kind}/{id}/{active}', method=HttpMethod.GET, operation_id='getPet',
+            summary='', description='',
+            parameters=[Parameter(name='kind', location='path', type='string', enum_values=['cat', 'dog']),
+                        Parameter(name='id', location='path', type='integer'),
+                        Parameter(name='active', location='path', type='boolean')])
+        writer = CsvDataWriter()
+
+        self.assertEqual(writer.default_unique_columns(endpoint, 2), ['kind', 'id', 'active'])
+        self.assertEqual(writer.default_unique_columns(endpoint, 50), ['id'])
+        rows = read_rows(writer.write(endpoint, self.tmp.name, 50).files)
+        self.assertEqual(len({row['id'] for row in rows}), 50)
+        self.assertLessEqual({row['kind'] for row in rows}, {'cat', 'dog'})
+
+        rows = read_rows(writer.write(endpoint, self.tmp.name, 2, unique_columns=['kind', 'active']).files)
+        self.assertEqual([(row['kind'], row['active']) for row in rows], [('cat', 'False'), ('dog', 'True')])
+        with self.assertRaisesRegex(ValueError, r'Column kind: allows only 2 unique values, 3 rows requested'):
+            writer.write(endpoint, self.tmp.name, 3, unique_columns=['kind'])
+
+    def test_agent_export_data_files(self):
+        """The agent writes one shard set per operation"""
+        self.agent.analysis_result = SwaggerAnalysis(
+            base_url='', title='Synthetic API', version='1.0', description='',
+            endpoints=[self.get_endpoint, self.post_endpoint])
+
+        with redirect_stdout(io.StringIO()):
+            results = self.agent.export_data_files(self.tmp.name, 50, shards=2)
+
+        self.assertEqual([r.rows for r in results], [50, 50])
+        self.assertEqual(len(os.listdir(self.tmp.name)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import sys
+import os
+import csv
+import functools
+import io
+import sqlite3
+import tempfile
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from models.endpoint_model import EndpointInfo, HttpMethod, Parameter, SwaggerAnalysis
+from parsers.data_source import DataSource, connect_url, group_mapping
+
+
+def endpoint(operation_id, *names):
+    return EndpointInfo(
+        path=f"/{operation_id}", method=HttpMethod.GET, operation_id=operation_id,
+        summary='', description='',
+        parameters=[Parameter(name=name, location='query', type='string') for name in names])
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+class CountingConnection:
+    """Records fetchmany sizes of a sqlite3 connection"""
+
+    def __init__(self, connection, fetches):
+        self.connection = connection
+        self.fetches = fetches
+
+    def cursor(self):
+        cursor = self.connection.cursor()
+        fetchmany = cursor.fetchmany
+
+        class Cursor:
+            description = property(lambda _: cursor.description)
+            execute = cursor.execute
+            fetchall = cursor.fetchall
+
+            def fetchmany(_, size):
+                rows = fetchmany(size)
+                self.fetches.append(len(rows))
+                return rows
+        return Cursor()
+
+    def close(self):
+        self.connection.close()
+
+
+class TestDataSource(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, 'app.db')
+
+        with sqlite3.connect(self.db_path) as connection:
+            connection.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, name TEXT)")
+            connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, status TEXT)")
+            connection.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                                   [(i, f"user{i}@example.com", f"User {i}") for i in range(1, 1001)])
+            connection.executemany("INSERT INTO orders VALUES (?, ?, ?)",
+                                   [(i, i % 100 + 1, 'paid') for i in range(1, 501)])
+        connection.close()
+
+        self.connect = functools.partial(sqlite3.connect, self.db_path)
+        self.out = os.path.join(self.tmp.name, 'data')
+
+    def test_tables(self):
+        self.assertEqual(DataSource(self.connect).tables(), {
+            'orders': ['id', 'user_id', 'status'],
+            'users': ['id', 'email', 'name']
+        })
+
+    def test_map_parameters(self):
+        """Bare and table-qualified names bind; ambiguous names stay unbound"""
+        mapping = DataSource(self.connect).map_parameters([
+            endpoint('getUser', 'userId', 'email', 'id'),
+            endpoint('listOrders', 'orderId', 'status', 'page')
+        ])
+        self.assertEqual(mapping, {
+            'userId': 'users.id',
+            'email': 'users.email',
+            'orderId': 'orders.id',
+            'status': 'orders.status'
+        })
+
+    def test_extract_streams_in_chunks(self):
+        fetches = []
+        source = DataSource(lambda: CountingConnection(self.connect(), fetches), chunk_rows=128)
+        [users] = source.extract({'email': 'users.email', 'userId': 'users.id'}, self.out)
+
+        rows = read_rows(users.path)
+        self.assertEqual(rows[0], ['email', 'userId'])
+        self.assertEqual(rows[1], ['user1@example.com', '1'])
+        self.assertEqual(len(rows) - 1, 1000)
+        self.assertEqual((users.rows, users.scanned), (1000, 1000))
+        # Never more than one chunk in memory
+        self.assertEqual(max(fetches), 128)
+        self.assertEqual(sum(fetches), 1000)
+
+    def test_limit_and_sample(self):
+        source = DataSource(self.connect, chunk_rows=100, seed=3)
+
+        [limited] = source.extract({'email': 'users.email'}, self.out, limit=10)
+        self.assertEqual((limited.rows, limited.scanned), (10, 10))
+
+        [sampled] = source.extract({'email': 'users.email'}, self.out, sample=0.2)
+        self.assertEqual(sampled.scanned, 1000)
+        self.assertTrue(120 < sampled.rows < 280)
+        first = read_rows(sampled.path)
+
+        # Reproducible for a seed
+        source.extract({'email': 'users.email'}, self.out, sample=0.2)
+        self.assertEqual(read_rows(sampled.path), first)
+
+        [both] = source.extract({'email': 'users.email'}, self.out, sample=0.5, limit=25)
+        self.assertEqual(both.rows, 25)
+        self.assertLess(both.scanned, 1000)
+
+        with self.assertRaises(ValueError):
+            source.extract({'email': 'users.email'}, self.out, sample=0)
+
+    def test_parallel_matches_serial(self):
+        mapping = {'email': 'users.email', 'status': 'orders.status', 'userId': 'orders.user_id'}
+        source = DataSource(self.connect, chunk_rows=64)
+
+        serial = source.extract(mapping, os.path.join(self.out, 'serial'))
+        parallel = source.extract(mapping, os.path.join(self.out, 'parallel'), workers=2)
+
+        self.assertEqual([r.table for r in parallel], ['orders', 'users'])
+        self.assertEqual(parallel[0].columns, {'status': 'status', 'userId': 'user_id'})
+        for a, b in zip(serial, parallel):
+            self.assertEqual(read_rows(a.path), read_rows(b.path))
+
+    def test_rejects_unsafe_identifiers(self):
+        for target in ('email', 'users.email; DROP TABLE users', 'users."email"'):
+            with self.assertRaises(ValueError):
+                group_mapping({'email': target})
+        self.assertEqual(group_mapping({'email': 'app.users.email'}), {'app.users': {'email': 'email'}})
+
+    def test_connect_url(self):
+        connection = connect_url(f"sqlite:///{self.db_path}")()
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM users").fetchone(), (1000,))
+        connection.close()
+
+        with self.assertRaisesRegex(ValueError, 'Unsupported DB type'):
+            connect_url('postgresql://localhost/app')
+
+    def test_agent_export_db_data(self):
+        agent = InputInterpreterAgent()
+        agent.analysis_result = SwaggerAnalysis(
+            base_url='', title='API', version='1', description='',
+            endpoints=[endpoint('getUser', 'email', 'page')])
+
+        with redirect_stdout(io.StringIO()):
+            results = agent.export_db_data(self.connect, self.out, mapping={'page': 'orders.id'},
+                                           limit=5)
+        self.assertEqual({r.table: r.columns for r in results},
+                         {'orders': {'page': 'id'}, 'users': {'email': 'email'}})
+        self.assertEqual([r.rows for r in results], [5, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
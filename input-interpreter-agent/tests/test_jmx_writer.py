@@ -0,0 +1,150 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from models.endpoint_model import EndpointInfo, HttpMethod, Parameter
+from writers.jmx_writer import JmxWriter
+
+
+def props(element):
+    return {child.get('name'): child.text for child in element if child.tag.endswith('Prop')}
+
+
+class TestJmxWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def export(self, **options):
+        spec_path = os.path.join(self.tmp.name, 'spec.json')
+        with open(spec_path, 'w') as f:
+            json.dump(generate_spec(paths=5), f)
+
+        jmx_path = os.path.join(self.tmp.name, 'plan.jmx')
+        with redirect_stdout(io.StringIO()):
+            samplers = InputInterpreterAgent().export_jmx(jmx_path, source=spec_path, **options)
+        return samplers, ET.parse(jmx_path).getroot()
+
+    def test_plan_structure(self):
+        """Every test element is followed by its hashTree"""
+        samplers, root = self.export(threads=10, csv_files=['data.csv'])
+
+        self.assertEqual(samplers, 10)
+        self.assertEqual(root.tag, 'jmeterTestPlan')
+
+        def check(tree):
+            children = list(tree)
+            self.assertEqual(len(children) % 2, 0)
+            for element, subtree in zip(children[::2], children[1::2]):
+                self.assertNotEqual(element.tag, 'hashTree')
+                self.assertEqual(subtree.tag, 'hashTree')
+                check(subtree)
+
+        check(root.find('hashTree'))
+
+        thread_group = root.find('hashTree/hashTree/ThreadGroup')
+        self.assertEqual(props(thread_group)['ThreadGroup.num_threads'], '10')
+
+        defaults = root.find('hashTree/hashTree/hashTree/ConfigTestElement')
+        self.assertEqual(props(defaults)['HTTPSampler.domain'], 'localhost')
+        self.assertEqual(props(defaults)['HTTPSampler.port'], '8080')
+
+        csv_data_set = root.find('hashTree/hashTree/hashTree/CSVDataSet')
+        self.assertEqual(props(csv_data_set)['filename'], 'data.csv')
+
+    def test_samplers_and_assertions(self):
+        """Samplers carry the operation, path, headers and assertions"""
+        _, root = self.export()
+        group_tree = root.find('hashTree/hashTree/hashTree')
+        children = list(group_tree)
+        samplers = {e.get('testname'): (e, children[i + 1])
+                    for i, e in enumerate(children) if e.tag == 'HTTPSamplerProxy'}
+
+        sampler, tree = samplers['getResource0']
+        self.assertEqual(props(sampler)['HTTPSampler.path'], '/api/resources0/${resourceId}')
+        self.assertEqual(props(sampler)['HTTPSampler.method'], 'GET')
+        arguments = [e.get('name') for e in sampler.iter('elementProp')
+                     if e.get('elementType') == 'HTTPArgument']
+        self.assertEqual(arguments, ['param0', 'param1', 'param2'])
+
+        headers = {props(h)['Header.name']: props(h)['Header.value']
+                   for h in tree.find('HeaderManager').iter('elementProp')}
+        self.assertEqual(headers['Accept'], 'application/json')
+
+        codes = [p.text for p in tree.find('ResponseAssertion').find('collectionProp')]
+        self.assertEqual(codes, ['200'])
+
+        json_paths = [props(a)['JSON_PATH'] for a in tree.findall('JSONPathAssertion')]
+        self.assertEqual(json_paths, ['$.id', '$.name'])
+
+        sampler, _ = samplers['createResource0']
+        self.assertEqual(props(sampler)['HTTPSampler.postBodyRaw'], 'true')
+        self.assertEqual(props(sampler)['HTTPSampler.method'], 'POST')
+
+    def test_operation_data_sets_are_scoped_to_their_sampler(self):
+        """Operations' CSV files define the same variables, so each feeds only its sampler"""
+        _, root = self.export(csv_files=['users.csv'], operation_csv_files={
+            'getResource0': ['getResource0_0.csv'], 'createResource0': ['createResource0_0.csv']})
+
+        group_tree = root.find('hashTree/hashTree/hashTree')
+        self.assertEqual([props(e)['filename'] for e in group_tree.findall('CSVDataSet')], ['users.csv'])
+
+        children = list(group_tree)
+        scoped = {e.get('testname'): [props(d)['filename'] for d in children[i + 1].findall('CSVDataSet')]
+                  for i, e in enumerate(children) if e.tag == 'HTTPSamplerProxy'}
+        self.assertEqual(scoped['getResource0'], ['getResource0_0.csv'])
+        self.assertEqual(scoped['createResource0'], ['createResource0_0.csv'])
+        self.assertEqual(scoped['getResource1'], [])
+
+    def test_streams_and_escapes(self):
+        """Samplers are flushed as written and XML special characters are escaped"""
+        endpoint = EndpointInfo(
+            path='/search', method=HttpMethod.GET, operation_id='search<&>"',
+            summary='', description='',
+            parameters=[Parameter(name='q', location='query', type='string')],
+            headers_required={'X-Filter': 'a&b<c>'}
+        )
+        out = io.StringIO()
+        writer = JmxWriter(out, base_url='https://api.example.com/v1')
+        writer.start()
+        size = len(out.getvalue())
+
+        writer.write_endpoint(endpoint)
+        self.assertGreater(len(out.getvalue()), size)
+        writer.close()
+
+        root = ET.fromstring(out.getvalue().split('\n', 1)[1])
+        sampler = root.find('.//HTTPSamplerProxy')
+        self.assertEqual(sampler.get('testname'), 'search<&>"')
+        self.assertEqual(props(sampler)['HTTPSampler.path'], '/v1/search')
+        header = root.find('.//HeaderManager//elementProp')
+        self.assertEqual(props(header)['Header.value'], 'a&b<c>')
+
+    def test_content_type_is_matched_literally(self):
+        """Structured-syntax media types are not read as regular expressions"""
+        endpoint = EndpointInfo(
+            path='/orders', method=HttpMethod.GET, operation_id='listOrders', summary='', description='',
+            response_assertions=['Content-Type: application/vnd.api+json'])
+        out = io.StringIO()
+        with JmxWriter(out) as writer:
+            writer.write_endpoint(endpoint)
+
+        root = ET.fromstring(out.getvalue().split('\n', 1)[1])
+        assertion = [a for a in root.iter('ResponseAssertion') if a.get('testname') == 'Content-Type'][0]
+        self.assertEqual([p.text for p in assertion.find('collectionProp')], ['application/vnd.api+json'])
+        self.assertEqual(props(assertion)['Assertion.test_type'], '16')
+
+
+if __name__ == '__main__':
+    unittest.main()
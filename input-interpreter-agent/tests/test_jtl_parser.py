@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from models.endpoint_model import EndpointInfo, HttpMethod, SwaggerAnalysis
+from parsers import jtl_parser
+from parsers.jtl_parser import JtlParser, JTL_COLUMNS
+
+
+def sample_line(ts, elapsed, label, code, success='true'):
+    return (f"{ts},{elapsed},{label},{code},OK,Thread Group 1-1,text,{success},,512,128,"
+            f"1,1,http://localhost/x,{elapsed},0,1\n")
+
+
+class TestJtlParser(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.endpoints = [
+            EndpointInfo(path='/pets', method=HttpMethod.GET, operation_id='listPets',
+                         summary='', description='', expected_response_codes=['200']),
+            EndpointInfo(path='/pets', method=HttpMethod.POST, operation_id='createPet',
+                         summary='', description='', expected_response_codes=['201'])
+        ]
+
+    def write_jtl(self, name, lines, header=True):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            if header:
+                f.write(','.join(JTL_COLUMNS) + '\n')
+            f.writelines(lines)
+        return path
+
+    def test_per_operation_metrics(self):
+        """Percentiles, throughput and error rates are computed per label"""
+        lines = [sample_line(1_000_000 + i * 10, i + 1, 'listPets', '200') for i in range(100)]
+        # Expected codes decide errors, not JMeter's success flag
+        lines += [sample_line(1_000_000, 50, 'createPet', '200'),
+                  sample_line(1_000_500, 70, 'createPet', '201', success='false')]
+        lines += [sample_line(1_000_000, 5, 'setup', '500', success='false')]
+        path = self.write_jtl('results.jtl', lines)
+
+        parser = JtlParser(self.endpoints, chunk_rows=16)
+        report = parser.report(parser.parse_file(path))
+
+        list_pets = report['operations']['listPets']
+        self.assertEqual(list_pets['samples'], 100)
+        self.assertEqual(list_pets['errors'], 0)
+        self.assertEqual(list_pets['p50_ms'], 50.0)
+        self.assertEqual(list_pets['p99_ms'], 99.0)
+        self.assertEqual((list_pets['min_ms'], list_pets['max_ms']), (1, 100))
+        self.assertAlmostEqual(list_pets['throughput_per_second'], 100 / 1.09, places=2)
+
+        self.assertEqual(report['operations']['createPet']['error_rate'], 0.5)
+        self.assertEqual(report['operations']['setup']['errors'], 1)
+        self.assertEqual(report['unknown_labels'], ['setup'])
+        self.assertEqual(report['total']['samples'], 103)
+
+    def test_headerless_file_and_large_latencies(self):
+        """Files without a header use JMeter's default column order"""
+        lines = [sample_line(0, 2_000, 'listPets', '200'), sample_line(1, 10_000_000, 'listPets', '200')]
+        path = self.write_jtl('noheader.jtl', lines, header=False)
+
+        parser = JtlParser(self.endpoints)
+        report = parser.report(parser.parse_file(path))['operations']['listPets']
+
+        self.assertEqual(report['samples'], 2)
+        self.assertEqual(report['max_ms'], 10_000_000)
+        self.assertAlmostEqual(report['p50_ms'], 2_000, delta=20)
+
+    def test_date_timestamps(self):
+        """Files written with a date timestamp_format give the same report as epoch ones"""
+        epoch = [sample_line(1_706_702_400_000 + i * 500, 20, 'listPets', '200') for i in range(5)]
+        dated = [sample_line(f"2024/01/31 12:00:0{i // 2}.{i % 2 * 5}00", 20, 'listPets', '200')
+                 for i in range(5)]
+        iso = [sample_line(f"2024-01-31T12:00:0{i // 2}.{i % 2 * 5}00+00:00", 20, 'listPets', '200')
+               for i in range(5)]
+        custom = [sample_line(f"31.01.2024 12:00:0{i // 2}.{i % 2 * 5}00", 20, 'listPets', '200')
+                  for i in range(5)]
+
+        parser = JtlParser(self.endpoints)
+        expected = parser.report(parser.parse_file(self.write_jtl('epoch.jtl', epoch)))
+        self.assertAlmostEqual(expected['total']['throughput_per_second'], 5 / 2.02, places=3)
+        for name, lines in (('dated.jtl', dated), ('iso.jtl', iso)):
+            self.assertEqual(parser.report(parser.parse_file(self.write_jtl(name, lines))), expected)
+
+        path = self.write_jtl('custom.jtl', custom)
+        with self.assertRaisesRegex(ValueError, r'custom\.jtl, line 2: .*timestamp_format'):
+            parser.parse_file(path)
+        custom_parser = JtlParser(self.endpoints, timestamp_format='%d.%m.%Y %H:%M:%S.%f')
+        self.assertEqual(custom_parser.report(custom_parser.parse_file(path)), expected)
+
+    def test_pure_python_fallback_matches(self):
+        """Aggregation without NumPy gives the same report"""
+        lines = [sample_line(i, (i * 37) % 3000, f"op{i % 7}", '200' if i % 5 else '503')
+                 for i in range(2000)]
+        path = self.write_jtl('mixed.jtl', lines)
+        parser = JtlParser(self.endpoints, chunk_rows=300)
+
+        expected = parser.report(parser.parse_file(path))
+        with mock.patch.object(jtl_parser, 'np', None):
+            fallback = parser.report(parser.parse_file(path))
+
+        self.assertEqual(fallback, expected)
+
+    def test_files_merge_across_processes(self):
+        """Per-file results merge the same way serially and in a pool"""
+        first = self.write_jtl('a.jtl', [sample_line(i, 10, 'listPets', '200') for i in range(50)])
+        second = self.write_jtl('b.jtl', [sample_line(i, 30, 'listPets', '500') for i in range(50)])
+        parser = JtlParser(self.endpoints)
+
+        serial = parser.report(parser.parse_files([first, second]))
+        pooled = parser.report(parser.parse_files([first, second], workers=2))
+
+        self.assertEqual(serial, pooled)
+        self.assertEqual(serial['operations']['listPets']['samples'], 100)
+        self.assertEqual(serial['operations']['listPets']['error_rate'], 0.5)
+        self.assertEqual(serial['operations']['listPets']['p90_ms'], 30.0)
+
+    def test_agent_analyze_results(self):
+        """The agent maps results onto the current analysis"""
+        agent = InputInterpreterAgent()
+        agent.analysis_result = SwaggerAnalysis(base_url='', title='Pets', version='1',
+                                                description='', endpoints=self.endpoints)
+        path = self.write_jtl('run.jtl', [sample_line(0, 10, 'createPet', '201')])
+
+        report = agent.analyze_results([path])
+        self.assertEqual(report['operations']['createPet']['errors'], 0)
+        self.assertEqual(report['unknown_labels'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from utils.metrics import Instrumentation, JsonLinesSink, PrometheusTextfileSink, NULL_INSTRUMENTATION
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.spec_path = os.path.join(self.tmp_dir.name, 'spec.json')
+        with open(self.spec_path, 'w', encoding='utf-8') as f:
+            json.dump(generate_spec(paths=5, models=3), f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stage_timings_reach_every_sink(self):
+        """A run reports stages, counts and cache hit rates to the sinks"""
+        jsonl_path = os.path.join(self.tmp_dir.name, 'metrics.jsonl')
+        prom_path = os.path.join(self.tmp_dir.name, 'metrics.prom')
+        profile_dir = os.path.join(self.tmp_dir.name, 'profiles')
+        instrumentation = Instrumentation(
+            sinks=[JsonLinesSink(jsonl_path), PrometheusTextfileSink(prom_path)],
+            profile_stages=['analyze'], memory_stages=['parse'], profile_dir=profile_dir)
+
+        InputInterpreterAgent(instrumentation=instrumentation).process_swagger_url(self.spec_path)
+
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            report = json.loads(f.readline())
+        self.assertEqual(set(report['stages']),
+                         {'fetch', 'decode_header', 'decode_paths', 'parse', 'analyze'})
+        self.assertEqual(report['stages']['analyze']['calls'], 10)
+        self.assertIn('peak_bytes', report['stages']['parse'])
+        self.assertEqual(report['counts']['endpoints'], 10)
+        self.assertGreater(report['caches']['ref_resolver']['hit_rate'], 0)
+
+        with open(prom_path, 'r', encoding='utf-8') as f:
+            self.assertIn('jmeter_agent_stage_seconds{stage="fetch"}', f.read())
+        self.assertTrue(os.path.exists(os.path.join(profile_dir, 'analyze.prof')))
+
+    def test_nested_memory_stage_keeps_outer_peak(self):
+        """An inner memory stage does not wipe the peak its enclosing stage reached"""
+        instrumentation = Instrumentation(memory_stages=['outer', 'inner'])
+
+        with instrumentation.stage('outer'):
+            block = bytearray(4 << 20)
+            del block
+            with instrumentation.stage('inner'):
+                small = bytearray(1 << 10)
+            del small
+
+        stages = instrumentation.flush()['stages']
+        self.assertGreaterEqual(stages['outer']['peak_bytes'], 4 << 20)
+        self.assertLess(stages['inner']['peak_bytes'], 1 << 20)
+
+    def test_counters_from_threads(self):
+        """Counts and timings recorded from pool threads are not lost"""
+        instrumentation = Instrumentation()
+
+        def record(_):
+            for _ in range(1000):
+                instrumentation.count('requests')
+                instrumentation.add_time('fetch', 0.001)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(record, range(8)))
+
+        report = instrumentation.flush()
+        self.assertEqual(report['counts']['requests'], 8000)
+        self.assertEqual(report['stages']['fetch']['calls'], 8000)
+
+    def test_disabled_by_default(self):
+        """Without instrumentation nothing is recorded"""
+        agent = InputInterpreterAgent()
+        agent.process_swagger_url(self.spec_path)
+
+        self.assertIs(agent.instrumentation, NULL_INSTRUMENTATION)
+        self.assertEqual(NULL_INSTRUMENTATION.stages, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
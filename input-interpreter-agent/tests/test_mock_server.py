@@ -0,0 +1,164 @@
+import unittest
+import sys
+import os
+import io
+import json
+import random
+import socket
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import requests
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from utils.mock_server import MockServer, LatencyModel
+
+
+def json_response(description, schema):
+    return {'description': description, 'content': {'application/json': {'schema': schema}}}
+
+
+PET = {'type': 'object', 'required': ['id'], 'properties': {'id': {'type': 'integer', 'example': 7}}}
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Mock', 'version': '1.0'},
+    'servers': [{'url': 'http://localhost:8080/v1'}],
+    'paths': {
+        '/pets': {
+            'get': {'operationId': 'listPets', 'responses': {'200': json_response(
+                'ok', {'type': 'array', 'items': {'type': 'string'}, 'example': ['rex']})}},
+            'post': {'operationId': 'createPet', 'responses': {'201': json_response('created', PET)}}
+        },
+        '/pets/{petId}': {
+            'delete': {'operationId': 'deletePet', 'responses': {'204': {'description': 'gone'}}}
+        },
+        '/legacy': {
+            'get': {'operationId': 'legacy', 'responses': {'299': {'description': 'non-standard'}}}
+        }
+    }
+}
+
+
+def read_responses(sock: socket.socket, count: int) -> list:
+    """(status, body) of count pipelined responses"""
+    data, responses = b'', []
+    while len(responses) < count:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+        while True:
+            end = data.find(b'\r\n\r\n')
+            if end < 0:
+                break
+            head = data[:end].decode('latin-1')
+            length = int(head.lower().split('content-length:')[1].split('\r\n')[0])
+            if len(data) < end + 4 + length:
+                break
+            responses.append((int(head.split(' ')[1]), data[end + 4:end + 4 + length]))
+            data = data[end + 4 + length:]
+    return responses
+
+
+class TestMockServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            spec_path = os.path.join(tmp_dir, 'spec.json')
+            with open(spec_path, 'w', encoding='utf-8') as f:
+                json.dump(SPEC, f)
+            with redirect_stdout(io.StringIO()):
+                cls.analysis = InputInterpreterAgent().process_swagger_url(spec_path)
+
+    def test_routes_and_canned_bodies(self):
+        server = MockServer(self.analysis)
+        with server.run_in_thread() as base_url, requests.Session() as session:
+            self.assertTrue(base_url.endswith('/v1'))
+
+            response = session.get(f"{base_url}/pets?limit=5")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['Content-Type'], 'application/json')
+            self.assertEqual(response.json(), ['rex'])
+
+            response = session.post(f"{base_url}/pets", json={'name': 'rex'})
+            self.assertEqual((response.status_code, response.json()), (201, {'id': 7}))
+
+            response = session.delete(f"{base_url}/pets/42")
+            self.assertEqual((response.status_code, response.content), (204, b''))
+
+            self.assertEqual(session.put(f"{base_url}/pets/42").status_code, 405)
+            self.assertEqual(session.get(f"{base_url}/owners").status_code, 404)
+
+        self.assertEqual(server.requests, 5)
+
+    def test_pipelined_requests_with_bodies(self):
+        server = MockServer(self.analysis)
+        with server.run_in_thread() as base_url:
+            port = int(base_url.split(':')[2].split('/')[0])
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                body = b'{"name":"rex"}'
+                request = (b'POST /v1/pets HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n' % len(body)
+                           + body + b'GET /v1/pets HTTP/1.1\r\nHost: x\r\n\r\n')
+                sock.sendall(request * 50)
+                statuses = [status for status, _ in read_responses(sock, 100)]
+
+        self.assertEqual(statuses, [201, 200] * 50)
+
+    def test_malformed_content_length(self):
+        server = MockServer(self.analysis)
+        with server.run_in_thread() as base_url:
+            port = int(base_url.split(':')[2].split('/')[0])
+            for length in (b'-5', b'abc'):
+                with socket.create_connection(('127.0.0.1', port)) as sock:
+                    sock.sendall(b'POST /v1/pets HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n'
+                                 b'GET /v1/pets HTTP/1.1\r\n\r\n')
+                    self.assertEqual(read_responses(sock, 2), [(400, b'')])
+
+        self.assertEqual(server.requests, 0)
+
+    def test_non_standard_status(self):
+        server = MockServer(self.analysis)
+        with server.run_in_thread() as base_url:
+            port = int(base_url.split(':')[2].split('/')[0])
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                sock.sendall(b'GET /v1/legacy HTTP/1.1\r\n\r\n')
+                self.assertTrue(sock.recv(65536).startswith(b'HTTP/1.1 299 \r\n'))
+
+    def test_latency_keeps_order(self):
+        latency = LatencyModel(LatencyModel.uniform(1, 30),
+                               per_operation={'listPets': LatencyModel.fixed(40)})
+        server = MockServer(self.analysis, latency=latency)
+        with server.run_in_thread() as base_url:
+            port = int(base_url.split(':')[2].split('/')[0])
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                started = time.perf_counter()
+                sock.sendall(b'GET /v1/pets HTTP/1.1\r\n\r\n'
+                             b'POST /v1/pets HTTP/1.1\r\nContent-Length: 0\r\n\r\n'
+                             b'DELETE /v1/pets/1 HTTP/1.1\r\n\r\n')
+                statuses = [status for status, _ in read_responses(sock, 3)]
+                elapsed = time.perf_counter() - started
+
+        self.assertEqual(statuses, [200, 201, 204])
+        self.assertGreaterEqual(elapsed, 0.04)
+
+    def test_latency_distributions(self):
+        rng = random.Random(1)
+        self.assertEqual(LatencyModel.parse('fixed:20')(rng), 0.02)
+        self.assertTrue(all(0.005 <= LatencyModel.parse('uniform:5:50')(rng) <= 0.05 for _ in range(100)))
+
+        samples = sorted(LatencyModel.parse('lognormal:30:0.5')(rng) for _ in range(2001))
+        self.assertAlmostEqual(samples[1000], 0.03, delta=0.005)
+
+        self.assertEqual(LatencyModel(LatencyModel.normal(-50, 1)).sample('any'), 0.0)
+        with self.assertRaises(ValueError):
+            LatencyModel.parse('pareto:3')
+
+
+if __name__ == '__main__':
+    unittest.main()
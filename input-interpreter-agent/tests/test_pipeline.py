@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+
+
+def build_spec(path_count: int) -> dict:
+    paths = {}
+    for i in range(path_count):
+        paths[f"/items{i}/{{itemId}}"] = {
+            'get': {
+                'operationId': f"getItem{i}",
+                'parameters': [{'name': 'itemId', 'in': 'path', 'required': True,
+                                'schema': {'type': 'integer'}}],
+                'responses': {'200': {'description': 'ok', 'content': {'application/json': {
+                    'schema': {'$ref': '#/components/schemas/Item'}}}}}
+            },
+            'put': {
+                'operationId': f"putItem{i}",
+                'requestBody': {'content': {'application/json': {
+                    'schema': {'$ref': '#/components/schemas/Item'}}}},
+                'responses': {'204': {'description': 'updated'}}
+            }
+        }
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Pipeline', 'version': '1.0'},
+        'paths': paths,
+        'components': {'schemas': {'Item': {
+            'type': 'object', 'required': ['id'], 'properties': {'id': {'type': 'integer'}}}}}
+    }
+
+
+class TestParallelPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.spec_path = os.path.join(cls.tmp_dir.name, 'spec.json')
+        with open(cls.spec_path, 'w', encoding='utf-8') as f:
+            json.dump(build_spec(40), f)
+
+        cls.serial_agent = InputInterpreterAgent()
+        cls.serial = cls.serial_agent.process_swagger_url(cls.spec_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def _assert_matches_serial(self, agent: InputInterpreterAgent):
+        analysis = agent.process_swagger_url(self.spec_path)
+
+        self.assertEqual(analysis.endpoints, self.serial.endpoints)
+        self.assertEqual(agent.export_detailed_analysis()['sample_data'],
+                         self.serial_agent.export_detailed_analysis()['sample_data'])
+
+    def test_thread_pool_matches_serial(self):
+        """Thread mode produces the same endpoints in the same order"""
+        self._assert_matches_serial(InputInterpreterAgent(
+            workers=3, executor='thread', parallel_threshold=8, chunk_size=3))
+
+    def test_process_pool_matches_serial(self):
+        """Process mode produces the same endpoints in the same order"""
+        self._assert_matches_serial(InputInterpreterAgent(
+            workers=2, executor='process', parallel_threshold=8, chunk_size=5))
+
+    def test_small_spec_falls_back_to_serial(self):
+        """Specs below the threshold never start a pool"""
+        agent = InputInterpreterAgent(workers=4, executor='unknown', parallel_threshold=1000)
+
+        analysis = agent.process_swagger_url(self.spec_path)
+
+        self.assertEqual(len(analysis.endpoints), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
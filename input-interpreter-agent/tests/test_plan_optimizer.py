@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import io
+import xml.etree.ElementTree as ET
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.endpoint_model import EndpointInfo, HttpMethod
+from writers.jmx_writer import JmxWriter
+from writers.plan_optimizer import PlanOptimizer, estimate_cost
+
+
+def props(element):
+    return {child.get('name'): child.text for child in element if child.tag.endswith('Prop')}
+
+
+def endpoint(operation_id, headers, assertions):
+    return EndpointInfo(path=f"/{operation_id}", method=HttpMethod.GET, operation_id=operation_id,
+                        summary='', description='', headers_required=headers,
+                        response_assertions=assertions)
+
+
+class TestPlanOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        self.endpoints = [
+            endpoint('a', {'Accept': 'application/json', 'X-Key': '${key}'},
+                     ['Response Code: 200', 'Content-Type: application/json',
+                      'JSON Path: $.id', 'JSON Path: $.name']),
+            endpoint('b', {'Accept': 'application/json', 'X-Key': '${key}'},
+                     ['Response Code: 200', 'JSON Path: $.items[0].id']),
+            endpoint('c', {'Accept': 'application/xml', 'X-Key': '${key}', 'X-Trace': '1'},
+                     ['Response Code: 200']),
+        ]
+
+    def test_hoists_common_headers(self):
+        plan = PlanOptimizer().optimize(self.endpoints)
+
+        self.assertEqual(plan.shared_headers, {'Accept': 'application/json', 'X-Key': '${key}'})
+        self.assertEqual([ep.headers_required for ep in plan.endpoints],
+                         [{}, {}, {'Accept': 'application/xml', 'X-Trace': '1'}])
+        # The analysis is left untouched
+        self.assertEqual(len(self.endpoints[0].headers_required), 2)
+
+    def test_assertion_policies(self):
+        cheap = PlanOptimizer().optimize(self.endpoints).endpoints
+        self.assertEqual(cheap[0].response_assertions,
+                         ['Response Code: 200', 'Content-Type: application/json',
+                          'Body Contains: "id"', 'Body Contains: "name"'])
+        self.assertEqual(cheap[1].response_assertions, ['Response Code: 200'])
+
+        code = PlanOptimizer(assertions='code').optimize(self.endpoints).endpoints
+        self.assertEqual(code[0].response_assertions, ['Response Code: 200'])
+
+        keep = PlanOptimizer(assertions='keep').optimize(self.endpoints).endpoints
+        self.assertEqual(keep[0].response_assertions, self.endpoints[0].response_assertions)
+
+        with self.assertRaises(ValueError):
+            PlanOptimizer(assertions='none')
+
+    def test_cost_estimate(self):
+        plan = PlanOptimizer().optimize(self.endpoints)
+
+        self.assertEqual(plan.cost_before_us, estimate_cost(self.endpoints))
+        self.assertLess(plan.cost_after_us, plan.cost_before_us)
+        self.assertGreater(plan.speedup, 1)
+        self.assertIn('httpclient.reset_state_on_thread_group_iteration', plan.jmeter_properties)
+        self.assertEqual(len(plan.to_dict()['changes']), 3)
+
+    def test_written_plan(self):
+        plan = PlanOptimizer().optimize(self.endpoints)
+        out = io.StringIO()
+        with JmxWriter(out, shared_headers=plan.shared_headers,
+                       http_implementation=plan.http_implementation) as writer:
+            for ep in plan.endpoints:
+                writer.write_endpoint(ep)
+
+        root = ET.fromstring(out.getvalue().split('\n', 1)[1])
+        group_tree = root.find('hashTree/hashTree/hashTree')
+        defaults = group_tree.find('ConfigTestElement')
+        self.assertEqual(props(defaults)['HTTPSampler.implementation'], 'HttpClient4')
+
+        shared = group_tree.find('HeaderManager')
+        self.assertEqual(len(list(shared.iter('elementProp'))), 2)
+        self.assertEqual(len(root.findall('.//JSONPathAssertion')), 0)
+
+        body = [a for a in root.iter('ResponseAssertion') if a.get('testname') == 'Response Body']
+        self.assertEqual(len(body), 1)
+        self.assertEqual([p.text for p in body[0].find('collectionProp')], ['"id"', '"name"'])
+        self.assertEqual(props(body[0])['Assertion.test_type'], '16')
+
+
+if __name__ == '__main__':
+    unittest.main()
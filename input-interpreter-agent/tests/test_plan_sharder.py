@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import csv
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.endpoint_model import EndpointInfo, HttpMethod, Parameter
+from writers.plan_sharder import PlanSharder
+
+
+def props(element):
+    return {child.get('name'): child.text for child in element if child.tag.endswith('Prop')}
+
+
+def endpoint(operation_id, json_paths=0):
+    return EndpointInfo(
+        path=f"/{operation_id}/{{id}}", method=HttpMethod.GET, operation_id=operation_id,
+        summary='', description='',
+        parameters=[Parameter(name='id', location='path', type='integer', required=True,
+                              schema={'type': 'integer', 'minimum': 1})],
+        headers_required={'Accept': 'application/json'},
+        response_assertions=[f"JSON Path: $.f{i}" for i in range(json_paths)])
+
+
+class TestPlanSharder(unittest.TestCase):
+
+    def setUp(self):
+        # 'heavy' has JSON Path assertions, so each of its samples costs more
+        self.endpoints = [endpoint('heavy', json_paths=3)] + [endpoint(f"op{i}") for i in range(9)]
+
+    def test_rates_follow_mix(self):
+        mix = {'heavy': 2, 'op0': 1, 'op1': 1, 'op2': 0}
+        shard_plan = PlanSharder(4, 400, mix=mix).plan(self.endpoints)
+
+        totals = {}
+        for node in shard_plan.nodes:
+            for op, rps in node.operations.items():
+                totals[op] = totals.get(op, 0) + rps
+        self.assertEqual(set(totals), {'heavy', 'op0', 'op1'})
+        self.assertAlmostEqual(totals['heavy'], 200)
+        self.assertAlmostEqual(totals['op0'], 100)
+        self.assertAlmostEqual(sum(node.rps for node in shard_plan.nodes), 400)
+
+        with self.assertRaises(ValueError):
+            PlanSharder(4, 400, mix={'missing': 1}).plan(self.endpoints)
+
+    def test_balanced_by_cost(self):
+        """The expensive operation is split so no node saturates first"""
+        shard_plan = PlanSharder(4, 1000, mix={'heavy': 5, 'op0': 1, 'op1': 1}).plan(self.endpoints)
+
+        self.assertLess(shard_plan.imbalance, 1.1)
+        self.assertGreater(sum(1 for node in shard_plan.nodes if 'heavy' in node.operations), 1)
+
+        # Balanced by load, not by request rate
+        rps = [node.rps for node in shard_plan.nodes]
+        self.assertGreater(max(rps) / min(rps), 1.5)
+
+    def test_threads_from_latency(self):
+        shard_plan = PlanSharder(2, 100, latency_ms=500, headroom=1.0).plan(self.endpoints)
+        for node in shard_plan.nodes:
+            self.assertGreaterEqual(node.threads, node.rps * 0.5)
+
+    def test_writes_plan_and_data_per_node(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_plan = PlanSharder(3, 300, mix={'heavy': 4, 'op0': 1}).write(
+                self.endpoints, tmp_dir, rows=90, base_url='http://localhost:8080')
+
+            ids = []
+            for node in shard_plan.nodes:
+                root = ET.parse(node.plan_path).getroot()
+                timer = root.find('.//ConstantThroughputTimer')
+                self.assertAlmostEqual(float(timer.find('doubleProp/value').text), node.rps * 60, places=2)
+
+                percents = [float(c.find('FloatProperty/value').text)
+                            for c in root.iter('ThroughputController')]
+                self.assertAlmostEqual(sum(percents), 100, places=2)
+                self.assertEqual(len(percents), len(node.operations))
+
+                data_sets = [props(d)['filename'] for d in root.iter('CSVDataSet')]
+                self.assertEqual(sorted(data_sets), sorted(node.data_files))
+                self.assertEqual(root.findall('hashTree/hashTree/hashTree/CSVDataSet'), [])
+
+                for path in node.data_files:
+                    if os.path.basename(path).startswith('heavy_'):
+                        with open(path, newline='') as f:
+                            ids.extend(row['id'] for row in csv.DictReader(f))
+
+            # Data partitions are disjoint and cover every row
+            self.assertEqual(len(ids), 90)
+            self.assertEqual(len(set(ids)), 90)
+
+    def test_enum_path_parameters_are_not_forced_unique(self):
+        kind = Parameter(name='kind', location='path', type='string', required=True,
+                         enum_values=['cat', 'dog'])
+        pets = EndpointInfo(path='/pets/{kind}', method=HttpMethod.GET, operation_id='listPets',
+                            summary='', description='', parameters=[kind])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_plan = PlanSharder(2, 10).write([pets], tmp_dir, rows=20)
+            kinds = []
+            for path in shard_plan.nodes[0].data_files + shard_plan.nodes[1].data_files:
+                with open(path, newline='') as f:
+                    kinds.extend(row['kind'] for row in csv.DictReader(f))
+
+        self.assertEqual(len(kinds), 20)
+        self.assertLessEqual(set(kinds), {'cat', 'dog'})
+
+
+if __name__ == '__main__':
+    unittest.main()
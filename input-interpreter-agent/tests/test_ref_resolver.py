@@ -0,0 +1,175 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from dataclasses import FrozenInstanceError, replace
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from parsers.ref_resolver import RefResolver
+from parsers.swagger_parser import SwaggerParser
+
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Refs', 'version': '1.0'},
+    'paths': {},
+    'components': {
+        'schemas': {
+            'Pet': {
+                'type': 'object',
+                'required': ['id', 'name'],
+                'properties': {
+                    'id': {'type': 'integer'},
+                    'name': {'type': 'string'},
+                    'owner': {'$ref': '#/components/schemas/Owner'}
+                }
+            },
+            'Owner': {
+                'type': 'object',
+                'properties': {
+                    'pets': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}}
+                }
+            },
+            'Cat': {
+                'allOf': [
+                    {'$ref': '#/components/schemas/Pet'},
+                    {'type': 'object', 'required': ['lives'],
+                     'properties': {'lives': {'type': 'integer'}}}
+                ]
+            }
+        },
+        'parameters': {
+            'PetId': {'name': 'petId', 'in': 'path', 'required': True,
+                      'schema': {'type': 'integer'}}
+        }
+    }
+}
+
+SWAGGER2_SPEC = {
+    'swagger': '2.0',
+    'info': {'title': 'Pets', 'version': '1.0'},
+    'host': 'pets.example.com',
+    'produces': ['application/json'],
+    'paths': {
+        '/pets': {
+            'post': {
+                'operationId': 'addPet',
+                'consumes': ['application/json', 'application/xml'],
+                'parameters': [{'name': 'body', 'in': 'body', 'required': True,
+                                'schema': {'$ref': '#/definitions/Pet'}}],
+                'responses': {'200': {'description': 'ok', 'schema': {'$ref': '#/definitions/Pet'}}}
+            }
+        },
+        '/pets/{petId}': {
+            'post': {
+                'operationId': 'updatePetWithForm',
+                'produces': ['application/xml'],
+                'parameters': [{'$ref': '#/parameters/PetId'},
+                               {'name': 'name', 'in': 'formData', 'type': 'string', 'required': True},
+                               {'name': 'photo', 'in': 'formData', 'type': 'file'}],
+                'responses': {'200': {'description': 'ok',
+                                      'schema': {'type': 'array', 'items': {'$ref': '#/definitions/Pet'}}},
+                              '405': {'description': 'invalid input'}}
+            }
+        }
+    },
+    'parameters': {
+        'PetId': {'name': 'petId', 'in': 'path', 'required': True, 'type': 'integer'}
+    },
+    'definitions': {
+        'Pet': {'type': 'object', 'required': ['name'],
+                'properties': {'id': {'type': 'integer'}, 'name': {'type': 'string'}}}
+    }
+}
+
+
+class TestRefResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.resolver = RefResolver(SPEC)
+
+    def test_resolve_is_memoized(self):
+        """Resolving the same component twice returns the cached object"""
+        first = self.resolver.resolve({'$ref': '#/components/schemas/Pet'})
+        second = self.resolver.resolve({'$ref': '#/components/schemas/Pet'})
+
+        self.assertIs(first, second)
+        self.assertEqual(first['required'], ['id', 'name'])
+        self.assertGreaterEqual(self.resolver.hits, 1)
+
+    def test_recursive_models_terminate(self):
+        """Cycles are cut with a circular-ref marker"""
+        pet = self.resolver.resolve_ref('#/components/schemas/Pet')
+        items = pet['properties']['owner']['properties']['pets']['items']
+
+        self.assertTrue(items.get('x-circular-ref'))
+
+    def test_all_of_is_merged(self):
+        """allOf members are merged into one object schema"""
+        cat = self.resolver.resolve_ref('#/components/schemas/Cat')
+
+        self.assertEqual(cat['type'], 'object')
+        self.assertEqual(cat['required'], ['id', 'name', 'lives'])
+        self.assertIn('lives', cat['properties'])
+
+    def test_parser_follows_refs(self):
+        """SwaggerParser resolves parameter and schema references"""
+        parser = SwaggerParser()
+        parser.load_spec(SPEC)
+
+        params = parser.parse_parameters([{'$ref': '#/components/parameters/PetId'}])
+        responses = parser.parse_responses({
+            '200': {'description': 'ok', 'content': {
+                'application/json': {'schema': {'$ref': '#/components/schemas/Pet'}}}}
+        })
+
+        self.assertEqual(params[0].name, 'petId')
+        self.assertEqual(params[0].type, 'integer')
+        self.assertEqual(responses[0].schema['required'], ['id', 'name'])
+
+    def test_shared_parameters_are_immutable(self):
+        """Operations using the same $ref share one frozen Parameter"""
+        parser = SwaggerParser()
+        parser.load_spec(SPEC)
+        first, = parser.parse_parameters([{'$ref': '#/components/parameters/PetId'}])
+        second, = parser.parse_parameters([{'$ref': '#/components/parameters/PetId'}])
+
+        self.assertIs(first, second)
+        with self.assertRaises(FrozenInstanceError):
+            first.required = False
+        changed = replace(first, required=False)
+        self.assertEqual((first.required, changed.required, changed.name), (True, False, 'petId'))
+
+    def test_swagger2_bodies_and_response_schemas(self):
+        """Swagger 2.0 body/formData parameters and response schemas resolve #/definitions"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'swagger.json')
+            with open(path, 'w') as f:
+                json.dump(SWAGGER2_SPEC, f)
+            with redirect_stdout(io.StringIO()):
+                add, update = InputInterpreterAgent().process_swagger_url(path).endpoints
+
+        self.assertEqual(add.parameters, [])
+        self.assertEqual((add.request_body.content_type, add.request_body.required), ('application/json', True))
+        self.assertEqual(add.request_body.schema['required'], ['name'])
+        self.assertEqual([(r.status_code, r.content_type) for r in add.responses], [('200', 'application/json')])
+        self.assertIn('id', add.responses[0].schema['properties'])
+
+        self.assertEqual([p.name for p in update.parameters], ['petId'])
+        body = update.request_body
+        self.assertEqual(body.content_type, 'multipart/form-data')
+        self.assertEqual(body.schema['required'], ['name'])
+        self.assertEqual(body.schema['properties']['photo'], {'type': 'string', 'format': 'binary'})
+        self.assertEqual([(r.status_code, r.content_type) for r in update.responses],
+                         [('200', 'application/xml'), ('405', 'text/plain')])
+        self.assertEqual(update.responses[0].schema['items']['required'], ['name'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+import sys
+import os
+import random
+import re
+import uuid
+from unittest import mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from parsers import schema_compiler
+from parsers.schema_compiler import SchemaCompiler, compile_pattern, load_numpy
+
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Orders', 'version': '1.0'},
+    'paths': {
+        '/orders/{orderId}': {
+            'put': {
+                'operationId': 'updateOrder',
+                'parameters': [
+                    {'name': 'orderId', 'in': 'path', 'required': True,
+                     'schema': {'type': 'integer', 'minimum': 10, 'maximum': 20}},
+                    {'name': 'status', 'in': 'query',
+                     'schema': {'type': 'string', 'enum': ['open', 'closed']}},
+                    {'name': 'ref', 'in': 'query',
+                     'schema': {'type': 'string', 'pattern': '^ORD-[0-9]{4}$'}},
+                    {'name': 'X-Trace', 'in': 'header', 'schema': {'type': 'string', 'format': 'uuid'}}
+                ],
+                'requestBody': {'content': {'application/json': {
+                    'schema': {'$ref': '#/components/schemas/Order'}}}},
+                'responses': {'200': {'description': 'ok'}}
+            }
+        }
+    },
+    'components': {'schemas': {
+        'Order': {
+            'type': 'object',
+            'required': ['id'],
+            'properties': {
+                'id': {'type': 'string', 'format': 'uuid'},
+                'email': {'type': 'string', 'format': 'email'},
+                'placedAt': {'type': 'string', 'format': 'date-time'},
+                'quantity': {'type': 'integer', 'minimum': 1, 'maximum': 5},
+                'lines': {'type': 'array', 'items': {'$ref': '#/components/schemas/Line'}}
+            }
+        },
+        'Line': {
+            'type': 'object',
+            'properties': {'sku': {'type': 'string', 'example': 'SKU-1'}, 'price': {'type': 'number'}}
+        }
+    }}
+}
+
+
+class TestSchemaCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = InputInterpreterAgent()
+        spec_data = self.agent.parser.load_spec(SPEC)
+        self.endpoint = self.agent._parse_all_endpoints(spec_data)[0]
+        self.analyzer = self.agent.analyzer
+
+    def test_sample_covers_nested_objects_and_formats(self):
+        """Sample data includes optional and nested properties"""
+        sample = self.analyzer.generate_sample_data(self.endpoint)
+
+        self.assertEqual(sample['orderId'], 10)
+        self.assertEqual(sample['status'], 'open')
+        self.assertRegex(sample['ref'], r'^ORD-[0-9]{4}$')
+
+        body = sample['request_body']
+        self.assertEqual(set(body), {'id', 'email', 'placedAt', 'quantity', 'lines'})
+        self.assertEqual(body['lines'], [{'sku': 'SKU-1', 'price': 1.0}])
+        uuid.UUID(body['id'])
+
+    def test_schemas_compile_once(self):
+        """Compiled generators are cached by schema identity"""
+        compiler = SchemaCompiler()
+        schema = {'type': 'object', 'properties': {'a': {'type': 'integer'}}}
+
+        self.assertIs(compiler.compile(schema), compiler.compile(schema))
+        self.assertIsNot(compiler.compile(schema), compiler.compile(dict(schema)))
+
+    def test_cache_is_bounded(self):
+        """Least recently used generators are evicted past max_entries"""
+        compiler = SchemaCompiler(max_entries=2)
+        first, second, third = ({'type': 'integer', 'maximum': i} for i in range(3))
+
+        compiled = compiler.compile(first)
+        compiler.compile(second)
+        self.assertIs(compiler.compile(first), compiled)
+        compiler.compile(third)
+
+        self.assertEqual(len(compiler._cache), 2)
+        self.assertIs(compiler.compile(first), compiled)
+        self.assertNotIn((id(second), 0), compiler._cache)
+
+    def test_generate_batch_respects_constraints(self):
+        """Batch rows are random but valid and reproducible"""
+        rows = self.analyzer.generate_batch(self.endpoint, 500, seed=7)
+
+        self.assertEqual(len(rows), 500)
+        self.assertEqual(rows, self.analyzer.generate_batch(self.endpoint, 500, seed=7))
+        self.assertNotEqual(rows, self.analyzer.generate_batch(self.endpoint, 500, seed=8))
+
+        for row in rows:
+            self.assertTrue(10 <= row['orderId'] <= 20)
+            self.assertIn(row['status'], ('open', 'closed'))
+            self.assertRegex(row['ref'], r'^ORD-[0-9]{4}$')
+            uuid.UUID(row['X-Trace'])
+
+            body = row['request_body']
+            self.assertIn('@', body['email'])
+            self.assertTrue(1 <= body['quantity'] <= 5)
+            for line in body['lines']:
+                self.assertIsInstance(line['price'], float)
+
+        self.assertGreater(len({row['orderId'] for row in rows}), 5)
+
+    def test_generate_columns_length(self):
+        """Every column holds n values"""
+        columns = self.analyzer.generate_columns(self.endpoint, 1000)
+
+        self.assertEqual(set(columns), {'orderId', 'status', 'ref', 'X-Trace', 'request_body'})
+        for values in columns.values():
+            self.assertEqual(len(values), 1000)
+
+    def test_default_columns_do_not_depend_on_numpy(self):
+        """Without vectorized=True the same seed gives the same rows with or without numpy"""
+        rows = self.analyzer.generate_batch(self.endpoint, 200, seed=5)
+
+        with mock.patch.object(schema_compiler, '_numpy', None):
+            self.assertEqual(rows, self.analyzer.generate_batch(self.endpoint, 200, seed=5))
+            self.assertEqual(rows, self.analyzer.generate_batch(self.endpoint, 200, seed=5, vectorized=True))
+
+    @unittest.skipIf(load_numpy() is None, 'numpy is not installed')
+    def test_numpy_columns(self):
+        """With numpy, vectorized numeric and enum columns are arrays that honour the schema"""
+        np = load_numpy()
+        self.assertIsInstance(self.analyzer.generate_columns(self.endpoint, 10)['orderId'], list)
+        columns = self.analyzer.generate_columns(self.endpoint, 1000, seed=5, vectorized=True)
+
+        self.assertIsInstance(columns['orderId'], np.ndarray)
+        self.assertTrue(((columns['orderId'] >= 10) & (columns['orderId'] <= 20)).all())
+        self.assertEqual(set(columns['status'].tolist()), {'open', 'closed'})
+        self.assertIsInstance(columns['ref'], list)
+
+        rows = self.analyzer.generate_batch(self.endpoint, 50, seed=5, vectorized=True)
+        self.assertEqual(rows, self.analyzer.generate_batch(self.endpoint, 50, seed=5, vectorized=True))
+        self.assertIs(type(rows[0]['orderId']), int)
+        self.assertIs(type(rows[0]['status']), str)
+
+    def test_pattern_generation(self):
+        """Regex patterns produce matching strings"""
+        pattern = r'^[A-Z]{2}(-\d+)?_(red|blue)\w*$'
+        generate = compile_pattern(pattern)
+        rng = random.Random(3)
+
+        self.assertRegex(generate(None), pattern)
+        for _ in range(50):
+            self.assertRegex(generate(rng), pattern)
+
+    def test_pattern_without_regex_parser(self):
+        """Without the private regex parser, patterned strings use the plain generator"""
+        with mock.patch.object(schema_compiler, 'sre_parse', None):
+            self.assertIsNone(compile_pattern('^ORD-[0-9]{4}$'))
+            compiled = SchemaCompiler().compile({'type': 'string', 'pattern': '^ORD-[0-9]{4}$', 'maxLength': 8})
+
+        self.assertEqual(compiled.sample(), 'sample_s')
+        self.assertTrue(1 <= len(compiled.draw(random.Random(1))) <= 8)
+        self.assertNotEqual(compiled.unique(0, uuid.NAMESPACE_URL), compiled.unique(1, uuid.NAMESPACE_URL))
+
+    def test_pattern_parse_is_checked(self):
+        """A parse tree whose minimal match misses the pattern is not trusted"""
+        self.assertIsNone(compile_pattern('[unclosed'))
+        self.assertIsNone(compile_pattern(r'^\d+(?<=5)$'))
+
+
+if __name__ == '__main__':
+    unittest.main()
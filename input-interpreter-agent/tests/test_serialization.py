@@ -0,0 +1,179 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from models.serialization import dumps_analysis, loads_analysis, FORMAT_VERSION
+
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Serialize', 'version': '1.0'},
+    'servers': [{'url': 'https://api.example.com/v1'}],
+    'components': {
+        'schemas': {'Pet': {'type': 'object', 'required': ['name'],
+                            'properties': {'name': {'type': 'string'}, 'age': {'type': 'integer'}}}},
+        'securitySchemes': {'key': {'type': 'apiKey', 'in': 'header', 'name': 'X-Key'}}
+    },
+    'security': [{'key': []}],
+    'paths': {
+        '/pets': {
+            'get': {'operationId': 'listPets', 'tags': ['pets'],
+                    'parameters': [{'name': 'limit', 'in': 'query', 'schema': {'type': 'integer'}}],
+                    'responses': {'200': {'description': 'ok', 'content': {'application/json': {
+                        'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}}}}}}},
+            'post': {'operationId': 'createPet', 'tags': ['pets'],
+                     'requestBody': {'content': {'application/json': {
+                         'schema': {'$ref': '#/components/schemas/Pet'}}}},
+                     'responses': {'201': {'description': 'created'}}}
+        },
+        '/pets/{petId}': {
+            'get': {'operationId': 'getPet',
+                    'parameters': [{'name': 'petId', 'in': 'path', 'required': True,
+                                    'schema': {'type': 'integer'}}],
+                    'responses': {'200': {'description': 'ok', 'content': {'application/json': {
+                        'schema': {'$ref': '#/components/schemas/Pet'}}}}}}
+        }
+    }
+}
+
+
+YAML_SPEC = """
+openapi: 3.0.0
+info: {title: Dates, version: '1'}
+components:
+  securitySchemes:
+    oauth:
+      type: oauth2
+      flows:
+        clientCredentials:
+          tokenUrl: https://auth.example.com/token
+          x-issued: 2024-02-01
+          scopes: {}
+security:
+  - oauth: []
+paths:
+  /events:
+    get:
+      operationId: listEvents
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema: {type: array, items: {type: string}}
+          headers:
+            X-Since:
+              schema: {type: string, format: date}
+              example: 2024-01-01
+"""
+
+
+class TestAnalysisSerialization(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.spec_path = os.path.join(cls.tmp_dir.name, 'spec.json')
+        with open(cls.spec_path, 'w', encoding='utf-8') as f:
+            json.dump(SPEC, f)
+
+        cls.agent = InputInterpreterAgent()
+        cls.analysis = cls.agent.process_swagger_url(cls.spec_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """JSON and binary forms load back to an equal analysis"""
+        for binary in (False, True):
+            loaded = loads_analysis(dumps_analysis(self.analysis, binary=binary))
+            self.assertEqual(loaded, self.analysis)
+            self.assertEqual(loaded.get_endpoint('getPet').path, '/pets/{petId}')
+
+    def test_json_form_is_versioned(self):
+        data = json.loads(dumps_analysis(self.analysis))
+        self.assertEqual(data['version'], FORMAT_VERSION)
+
+        data['version'] = FORMAT_VERSION + 1
+        with self.assertRaises(ValueError):
+            loads_analysis(json.dumps(data).encode('utf-8'))
+
+    def test_shared_schemas_stay_shared(self):
+        """A resolved component used by several operations is loaded once"""
+        loaded = loads_analysis(dumps_analysis(self.analysis))
+        body = loaded.get_endpoint('createPet').request_body.schema
+        response = loaded.get_endpoint('getPet').responses[0].schema
+        self.assertEqual(body, SPEC['components']['schemas']['Pet'])
+        self.assertIs(body, response)
+
+    def test_load_in_another_agent(self):
+        other = InputInterpreterAgent()
+        other.load_analysis(self.agent.export_analysis(binary=True))
+        self.assertEqual(other.get_endpoint_summary(), self.agent.get_endpoint_summary())
+
+    def test_yaml_dates_round_trip(self):
+        """Dates YAML decodes in headers and OAuth flows are stored as strings"""
+        spec_path = os.path.join(self.tmp_dir.name, 'dates.yaml')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            f.write(YAML_SPEC)
+
+        agent = InputInterpreterAgent()
+        agent.process_swagger_url(spec_path)
+
+        for binary in (False, True):
+            other = InputInterpreterAgent()
+            loaded = other.load_analysis(agent.export_analysis(binary=binary))
+            headers = loaded.get_endpoint('listEvents').responses[0].headers
+            self.assertEqual(headers['X-Since']['example'], '2024-01-01')
+            self.assertEqual(loaded.global_security[0].flows['clientCredentials']['x-issued'], '2024-02-01')
+
+
+class TestLazySampleData(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        spec_path = os.path.join(self.tmp_dir.name, 'spec.json')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump(SPEC, f)
+
+        self.agent = InputInterpreterAgent()
+        self.agent.process_swagger_url(spec_path)
+
+        self.calls = []
+        generate = self.agent.analyzer.generate_sample_data
+        self.agent.analyzer.generate_sample_data = lambda ep: self.calls.append(ep.operation_id) or generate(ep)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_generated_on_access(self):
+        sample_data = self.agent.export_detailed_analysis()['sample_data']
+        self.assertEqual(self.calls, [])
+        self.assertEqual(list(sample_data), ['listPets', 'createPet', 'getPet'])
+
+        self.assertIn('petId', sample_data['getPet'])
+        self.assertIs(sample_data['getPet'], sample_data['getPet'])
+        self.assertEqual(self.calls, ['getPet'])
+
+        with self.assertRaises(KeyError):
+            sample_data['missing']
+
+    def test_materialize(self):
+        sample_data = self.agent.export_detailed_analysis()['sample_data']
+        sample_data['getPet']
+        materialized = sample_data.materialize()
+
+        self.assertIsInstance(materialized, dict)
+        self.assertEqual(set(materialized), {'listPets', 'createPet', 'getPet'})
+        self.assertEqual(sorted(self.calls), ['createPet', 'getPet', 'listPets'])
+
+
+if __name__ == '__main__':
+    unittest.main()
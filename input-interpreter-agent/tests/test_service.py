@@ -0,0 +1,184 @@
+import unittest
+import sys
+import os
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service import AnalysisCache, AnalysisService, ServiceBusy
+
+
+class GatedHandler(BaseHTTPRequestHandler):
+    """Serves a one-operation spec per path, holding responses until the gate opens"""
+
+    protocol_version = 'HTTP/1.1'
+    gate = threading.Event()
+    lock = threading.Lock()
+    fetches = {}
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.fetches[self.path] = cls.fetches.get(self.path, 0) + 1
+        cls.gate.wait(10)
+
+        name = self.path.strip('/').split('.')[0]
+        body = json.dumps({
+            'openapi': '3.0.0',
+            'info': {'title': name, 'version': '1.0'},
+            'paths': {f"/{name}": {'get': {'responses': {'200': {'description': 'ok'}}}}}
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnalysisService(unittest.TestCase):
+
+    def setUp(self):
+        GatedHandler.gate.clear()
+        GatedHandler.fetches = {}
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), GatedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        self.clock = FakeClock()
+
+        # The agent reports progress on stdout
+        stdout = redirect_stdout(io.StringIO())
+        stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def tearDown(self):
+        GatedHandler.gate.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def service(self, **kwargs):
+        service = AnalysisService(clock=self.clock, **kwargs)
+        self.addCleanup(service.close)
+        return service
+
+    def test_concurrent_requests_are_coalesced(self):
+        service = self.service(max_workers=2)
+        url = f"{self.base}/pets.json"
+
+        futures = [service.submit(url) for _ in range(8)]
+        GatedHandler.gate.set()
+        analyses = [future.result(10) for future in futures]
+
+        self.assertEqual(GatedHandler.fetches, {'/pets.json': 1})
+        self.assertTrue(all(analysis is analyses[0] for analysis in analyses))
+        self.assertEqual(analyses[0].title, 'pets')
+        self.assertEqual(service.stats()['coalesced'], 7)
+        self.assertEqual(service.stats()['in_flight'], 0)
+
+        # Served from the cache afterwards
+        self.assertIs(service.analyze(url), analyses[0])
+        self.assertEqual(GatedHandler.fetches, {'/pets.json': 1})
+
+    def test_threads_share_one_analysis(self):
+        service = self.service(max_workers=2)
+        url = f"{self.base}/orders.json"
+        GatedHandler.gate.set()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            summaries = list(pool.map(lambda _: service.summary(url), range(16)))
+
+        self.assertEqual(GatedHandler.fetches, {'/orders.json': 1})
+        self.assertTrue(all(s is summaries[0] for s in summaries))
+        self.assertEqual(summaries[0]['api_info']['title'], 'orders')
+
+    def test_ttl_expiry_and_refresh(self):
+        service = self.service(ttl=60)
+        url = f"{self.base}/pets.json"
+        GatedHandler.gate.set()
+
+        first = service.analyze(url)
+        self.clock.now = 59
+        self.assertIs(service.analyze(url), first)
+
+        self.clock.now = 61
+        self.assertIsNot(service.analyze(url), first)
+        service.analyze(url, refresh=True)
+        self.assertEqual(GatedHandler.fetches, {'/pets.json': 3})
+
+    def test_backpressure(self):
+        service = self.service(max_workers=1, max_pending=1)
+
+        running = service.submit(f"{self.base}/a.json")
+        queued = service.submit(f"{self.base}/b.json")
+        with self.assertRaises(ServiceBusy):
+            service.submit(f"{self.base}/c.json")
+
+        # Joining work already accepted is always allowed
+        self.assertIs(service.submit(f"{self.base}/a.json"), running)
+        self.assertEqual(service.stats()['rejected'], 1)
+
+        # Rejections from many threads at once are all counted
+        def flood(n):
+            for i in range(25):
+                with self.assertRaises(ServiceBusy):
+                    service.submit(f"{self.base}/flood{n}_{i}.json")
+
+        callers = [threading.Thread(target=flood, args=(n,)) for n in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join(10)
+        self.assertEqual(service.stats()['rejected'], 201)
+
+        GatedHandler.gate.set()
+        self.assertEqual([running.result(10).title, queued.result(10).title], ['a', 'b'])
+        self.assertEqual(service.analyze(f"{self.base}/c.json").title, 'c')
+
+    def test_failures_are_not_cached(self):
+        service = self.service()
+        missing = os.path.join(os.path.dirname(__file__), 'missing.json')
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                service.analyze(missing)
+        self.assertEqual(service.stats()['started'], 2)
+        self.assertEqual(service.stats()['cached'], 0)
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(max_entries=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), ('A', 'C'))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+        cache.invalidate('a')
+        self.assertIsNone(cache.get('a'))
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from models.endpoint_model import SwaggerAnalysis
+from parsers.snapshot_store import AnalysisSnapshotStore
+from parsers.spec_validator import SpecValidator
+
+
+def build_spec(title: str, path_count: int = 3) -> dict:
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': title, 'version': '1.0'},
+        'paths': {f"/items{i}": {'get': {'operationId': f"getItem{i}",
+                                         'responses': {'200': {'description': 'ok'}}}}
+                  for i in range(path_count)}
+    }
+
+
+class TestAnalysisSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = AnalysisSnapshotStore(os.path.join(self.tmp_dir.name, 'snapshots'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, spec: dict) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+        return path
+
+    def test_unchanged_spec_is_loaded_not_analyzed(self):
+        path = self._write('spec.json', build_spec('Snapshot'))
+        cold = InputInterpreterAgent(snapshot_store=self.store).process_swagger_url(path)
+
+        agent = InputInterpreterAgent(snapshot_store=self.store)
+        agent._iter_stream_endpoints = lambda stream: self.fail("spec was re-analyzed")
+        warm = agent.process_swagger_url(path)
+
+        self.assertEqual(warm, cold)
+        self.assertEqual(agent.analysis_result, warm)
+        self.assertEqual(agent.parser.spec_data['info']['title'], 'Snapshot')
+        self.assertEqual((self.store.hits, self.store.misses), (1, 1))
+
+    def test_cached_runs_report_the_same_validation(self):
+        spec = build_spec('Snapshot')
+        spec['paths']['/items0']['post'] = {'operationId': 'createItem0'}  # no responses: a warning
+        path = self._write('spec.json', spec)
+        validator = SpecValidator(full=True)
+        self.addCleanup(validator.close)
+
+        reports = []
+        for _ in range(2):
+            agent = InputInterpreterAgent(snapshot_store=self.store, validator=validator)
+            with redirect_stdout(io.StringIO()) as output:
+                agent.process_swagger_url(path)
+            reports.append((agent.validation, agent.full_validation.result(30)))
+            self.assertIn('⚠️ 1 spec validation warnings', output.getvalue())
+
+        (cold, cold_full), (warm, warm_full) = reports
+        self.assertEqual(self.store.hits, 1)
+        self.assertEqual([str(issue) for issue in warm.warnings], ['POST /items0: no responses'])
+        self.assertEqual((warm.issues, warm.cached), (cold.issues, True))
+        self.assertEqual((warm_full.issues, warm_full.cached), (cold_full.issues, True))
+
+        # A validator that never saw the spec checks it again instead of reporting nothing
+        agent = InputInterpreterAgent(snapshot_store=self.store)
+        with redirect_stdout(io.StringIO()):
+            agent.process_swagger_url(path)
+        self.assertEqual((agent.validation.issues, agent.validation.cached), (cold.issues, False))
+
+    def test_changed_spec_misses(self):
+        path = self._write('spec.json', build_spec('First'))
+        agent = InputInterpreterAgent(snapshot_store=self.store)
+        agent.process_swagger_url(path)
+
+        self._write('spec.json', build_spec('Second'))
+        self.assertEqual(agent.process_swagger_url(path).title, 'Second')
+        self.assertEqual(self.store.hits, 0)
+
+    def test_invalidate(self):
+        path = self._write('spec.json', build_spec('Snapshot'))
+        agent = InputInterpreterAgent(snapshot_store=self.store)
+        agent.process_swagger_url(path)
+
+        self.store.invalidate()
+        agent.process_swagger_url(path)
+        self.assertEqual((self.store.hits, self.store.misses), (0, 2))
+
+    def test_failed_store_still_returns_analysis(self):
+        path = self._write('spec.json', build_spec('Snapshot'))
+        agent = InputInterpreterAgent(snapshot_store=self.store)
+
+        def full_disk(digest, analysis):
+            raise OSError(28, 'No space left on device')
+        self.store.store = full_disk
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            analysis = agent.process_swagger_url(path)
+        self.assertEqual(len(analysis.endpoints), 3)
+        self.assertIs(agent.analysis_result, analysis)
+        self.assertIn('⚠️ Could not store analysis snapshot', output.getvalue())
+
+    def test_eviction_is_bounded(self):
+        store = AnalysisSnapshotStore(os.path.join(self.tmp_dir.name, 'small'), max_entries=2)
+        for i in range(4):
+            store.store(f"digest{i}", SwaggerAnalysis(base_url='', title=f"API {i}",
+                                                      version='1', description=''))
+            os.utime(store._path(f"digest{i}"), ns=(i, i))
+
+        store.store('digest4', SwaggerAnalysis(base_url='', title='API 4', version='1', description=''))
+        self.assertIsNone(store.load('digest0'))
+        self.assertEqual(store.load('digest4').title, 'API 4')
+        self.assertEqual(len(store._snapshots()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest import mock
+
+from agent import InputInterpreterAgent
+from parsers.spec_cache import SpecCache
+from parsers.spec_stream import SpecStream
+from parsers.swagger_parser import SwaggerParser
+
+
+SPEC_BODY = json.dumps({
+    'openapi': '3.0.0',
+    'info': {'title': 'Cached', 'version': '1.0'},
+    'paths': {'/pets': {'get': {'responses': {'200': {'description': 'ok'}}}}}
+}).encode('utf-8')
+
+
+class SpecHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(SPEC_BODY)))
+        self.end_headers()
+        self.wfile.write(SPEC_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSpecCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = SpecCache(os.path.join(self.tmp_dir.name, 'cache'))
+        SpecHandler.requests_seen = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_conditional_get_reuses_parsed_spec(self):
+        """A 304 response returns the cached parse"""
+        server = HTTPServer(('127.0.0.1', 0), SpecHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/spec.json"
+
+        try:
+            first = SwaggerParser(cache=self.cache).fetch_spec(url)
+            second = SwaggerParser(cache=self.cache).fetch_spec(url)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(first['info']['title'], 'Cached')
+        self.assertIs(first, second)
+        self.assertEqual(SpecHandler.requests_seen[1].get('If-None-Match'), '"v1"')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_streamed_analysis_revalidates(self):
+        """process_swagger_url records the spec, then reuses body and header on a 304"""
+        server = HTTPServer(('127.0.0.1', 0), SpecHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/spec.json"
+
+        try:
+            with redirect_stdout(io.StringIO()):
+                first = InputInterpreterAgent(spec_cache=self.cache).process_swagger_url(url)
+                # The decoded header is reused: no header pass over the cached body
+                with mock.patch.object(SpecStream, '_read_header', side_effect=AssertionError):
+                    second = InputInterpreterAgent(spec_cache=self.cache).process_swagger_url(url)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual([r.get('If-None-Match') for r in SpecHandler.requests_seen], [None, '"v1"'])
+        self.assertEqual(self.cache.entry(url)['etag'], '"v1"')
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual((second.title, len(second.endpoints)), (first.title, 1))
+
+    def test_local_path_and_file_url(self):
+        """Local specs are cached until the file changes"""
+        path = os.path.join(self.tmp_dir.name, 'spec.json')
+        with open(path, 'wb') as f:
+            f.write(SPEC_BODY)
+
+        parser = SwaggerParser(cache=self.cache)
+        parser.fetch_spec(path)
+        spec = parser.fetch_spec('file://' + path)
+
+        self.assertEqual(spec['info']['title'], 'Cached')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_lru_eviction_bounds_size(self):
+        """Least recently used specs are evicted past the size bound"""
+        cache = SpecCache(os.path.join(self.tmp_dir.name, 'small'), max_bytes=600)
+        for i in range(5):
+            raw = json.dumps({'n': i, 'pad': 'x' * 100}).encode('utf-8')
+            cache.store(f"spec-{i}", raw, json.loads)
+
+        self.assertLessEqual(cache.total_bytes(), 600)
+        self.assertIsNone(cache.entry('spec-0'))
+        self.assertIsNotNone(cache.entry('spec-4'))
+
+    def test_invalidate_keeps_in_flight_writes(self):
+        """Another writer's temporary blob survives an invalidate of the shared directory"""
+        self.cache.store('spec', SPEC_BODY, json.loads)
+        other = SpecCache(self.cache.cache_dir)
+        chunks = iter([SPEC_BODY[:10], SPEC_BODY[10:]])
+
+        def invalidating_chunks():
+            yield next(chunks)
+            self.cache.invalidate()
+            yield next(chunks)
+
+        fileobj, digest = other.store_stream('other', invalidating_chunks())
+        with fileobj:
+            self.assertEqual(fileobj.read(), SPEC_BODY)
+        self.assertIsNone(self.cache.entry('spec'))
+
+    def test_parsed_specs_in_memory_are_bounded(self):
+        """Only the most recently used parses are kept in memory"""
+        cache = SpecCache(os.path.join(self.tmp_dir.name, 'memory'), max_parsed=2)
+        for i in range(4):
+            cache.store(f"spec-{i}", json.dumps({'n': i}).encode('utf-8'), json.loads)
+
+        self.assertEqual(len(cache._parsed), 2)
+        self.assertEqual(cache.load('spec-0'), {'n': 0})  # read back from disk
+        self.assertEqual([spec['n'] for spec in cache._parsed.values()], [3, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
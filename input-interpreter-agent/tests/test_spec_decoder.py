@@ -0,0 +1,32 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.spec_decoder import sniff_format, decode_spec
+
+
+class TestSpecDecoder(unittest.TestCase):
+
+    def test_sniff_format(self):
+        """The format comes from the first non-whitespace byte"""
+        self.assertEqual(sniff_format(b'\xef\xbb\xbf  \n{"openapi": "3.0.0"}'), 'json')
+        self.assertEqual(sniff_format(b'openapi: 3.0.0\n'), 'yaml')
+        self.assertEqual(sniff_format(b'  ---\nswagger: "2.0"'), 'yaml')
+
+    def test_decode_json_and_yaml(self):
+        """JSON and YAML bytes decode to the same structure"""
+        expected = {'openapi': '3.0.0', 'paths': {'/pets': {}}}
+
+        self.assertEqual(decode_spec(b'{"openapi": "3.0.0", "paths": {"/pets": {}}}'), expected)
+        self.assertEqual(decode_spec(b"openapi: '3.0.0'\npaths:\n  /pets: {}\n"), expected)
+
+    def test_yaml_flow_mapping_falls_back(self):
+        """A YAML flow mapping that is not valid JSON still decodes"""
+        self.assertEqual(decode_spec(b"{openapi: '3.0.0'}"), {'openapi': '3.0.0'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import tempfile
+from unittest import mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from parsers.spec_diff import OperationFingerprinter
+
+
+SPEC_V1 = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Diff', 'version': '1.0'},
+    'paths': {
+        '/pets': {
+            'get': {'operationId': 'listPets', 'responses': {'200': {
+                'description': 'ok', 'content': {'application/json': {
+                    'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}}}}}}}
+        },
+        '/owners': {
+            'get': {'operationId': 'listOwners', 'responses': {'200': {'description': 'ok'}}}
+        },
+        '/stores': {
+            'get': {'operationId': 'listStores', 'responses': {'200': {'description': 'ok'}}}
+        }
+    },
+    'components': {'schemas': {
+        'Pet': {'type': 'object', 'properties': {'tag': {'$ref': '#/components/schemas/Tag'}}},
+        'Tag': {'type': 'object', 'properties': {'name': {'type': 'string'}}}
+    }}
+}
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, spec: dict) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+        return path
+
+    def test_only_changed_operations_are_reanalyzed(self):
+        """A transitively referenced schema change marks its operations modified"""
+        spec_v2 = copy.deepcopy(SPEC_V1)
+        spec_v2['components']['schemas']['Tag']['properties']['id'] = {'type': 'integer'}
+        del spec_v2['paths']['/stores']
+        spec_v2['paths']['/vets'] = {'get': {'operationId': 'listVets',
+                                             'responses': {'200': {'description': 'ok'}}}}
+
+        agent = InputInterpreterAgent(fingerprints=True)
+        v1 = agent.process_swagger_url(self._write('v1.json', SPEC_V1))
+        v2 = agent.process_swagger_url(self._write('v2.json', spec_v2), previous=v1)
+
+        self.assertEqual(v2.change_set.to_dict(), {
+            'added': ['listVets'],
+            'removed': ['listStores'],
+            'modified': ['listPets'],
+            'unchanged_count': 1
+        })
+
+        owners_v1 = next(ep for ep in v1.endpoints if ep.operation_id == 'listOwners')
+        owners_v2 = next(ep for ep in v2.endpoints if ep.operation_id == 'listOwners')
+        self.assertIs(owners_v1, owners_v2)
+
+    def test_unchanged_spec_has_empty_change_set(self):
+        """Re-analyzing the same spec reuses every endpoint"""
+        path = self._write('v1.json', SPEC_V1)
+        agent = InputInterpreterAgent(fingerprints=True)
+
+        v1 = agent.process_swagger_url(path)
+        again = agent.process_swagger_url(path, previous=v1)
+
+        self.assertEqual(again.change_set.modified, [])
+        self.assertEqual(len(again.change_set.unchanged), 3)
+        self.assertEqual(again.endpoints, v1.endpoints)
+
+    def test_path_level_parameters_are_fingerprinted(self):
+        """Operations inherit path-level parameters, and changing them is a modification"""
+        spec_v1 = copy.deepcopy(SPEC_V1)
+        spec_v1['paths']['/pets']['parameters'] = [{'name': 'limit', 'in': 'query',
+                                                    'schema': {'type': 'integer'}}]
+        spec_v2 = copy.deepcopy(spec_v1)
+        spec_v2['paths']['/pets']['parameters'][0]['schema']['maximum'] = 50
+
+        agent = InputInterpreterAgent(fingerprints=True)
+        v1 = agent.process_swagger_url(self._write('v1.json', spec_v1))
+        v2 = agent.process_swagger_url(self._write('v2.json', spec_v2), previous=v1)
+
+        pets = next(ep for ep in v2.endpoints if ep.operation_id == 'listPets')
+        self.assertEqual([(p.name, p.schema.get('maximum')) for p in pets.parameters], [('limit', 50)])
+        self.assertEqual(v2.change_set.modified, ['listPets'])
+        self.assertEqual(len(v2.change_set.unchanged), 2)
+
+    def test_fingerprints_are_computed_only_when_needed(self):
+        """A plain run skips fingerprinting; an incremental one hashes each operation once"""
+        path = self._write('v1.json', SPEC_V1)
+        with mock.patch.object(OperationFingerprinter, 'fingerprint', autospec=True,
+                               side_effect=OperationFingerprinter.fingerprint) as fingerprint:
+            plain = InputInterpreterAgent().process_swagger_url(path)
+            self.assertEqual(fingerprint.call_count, 0)
+            self.assertEqual({ep.fingerprint for ep in plain.endpoints}, {''})
+
+            spec_v2 = copy.deepcopy(SPEC_V1)
+            spec_v2['components']['schemas']['Tag']['properties']['id'] = {'type': 'integer'}
+            v1 = InputInterpreterAgent(fingerprints=True).process_swagger_url(path)
+            fingerprint.reset_mock()
+            InputInterpreterAgent().process_swagger_url(self._write('v2.json', spec_v2), previous=v1)
+            self.assertEqual(fingerprint.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
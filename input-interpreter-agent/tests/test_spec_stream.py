@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest import mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+
+from agent import InputInterpreterAgent
+from parsers import spec_stream
+from parsers.spec_stream import SpecStream
+
+
+# paths deliberately precede components to exercise the two-part scan
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Stream "API"', 'version': '2.0'},
+    'servers': [{'url': 'http://localhost:8080'}],
+    'paths': {
+        '/pets': {
+            'get': {'operationId': 'listPets', 'responses': {'200': {
+                'description': 'ok', 'content': {'application/json': {
+                    'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}}}}}}},
+            'post': {'operationId': 'createPet', 'requestBody': {'content': {'application/json': {
+                'schema': {'$ref': '#/components/schemas/Pet'}}}},
+                'responses': {'201': {'description': 'created {[brackets]}'}}}
+        },
+        '/pets/{petId}': {
+            'get': {'operationId': 'getPet', 'parameters': [
+                {'name': 'petId', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}],
+                'responses': {'200': {'description': 'ok', 'content': {'application/json': {
+                    'schema': {'$ref': '#/components/schemas/Pet'}}}}}}
+        }
+    },
+    'components': {'schemas': {'Pet': {
+        'type': 'object', 'required': ['id'], 'properties': {'id': {'type': 'integer'}}}}}
+}
+
+
+class TestSpecStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_header_and_paths_are_split(self):
+        """Top-level members are decoded eagerly, path items one by one"""
+        path = self._write('spec.json', json.dumps(SPEC, indent=2))
+
+        with SpecStream(open(path, 'rb')) as stream:
+            self.assertNotIn('paths', stream.header)
+            self.assertEqual(stream.header['info']['title'], 'Stream "API"')
+            self.assertEqual(dict(stream.iter_paths()), SPEC['paths'])
+
+    def test_paths_are_read_from_recorded_spans(self):
+        """iter_paths decodes the spans found by the header pass, without scanning again"""
+        spec = dict(SPEC, paths=dict(SPEC['paths'], **{'/café/{ü}': {'get': {'summary': 'ünïcode'}}}))
+        path = self._write('spec.json', json.dumps(spec, ensure_ascii=False, indent=1))
+
+        with SpecStream(open(path, 'rb')) as stream, \
+                mock.patch.object(SpecStream, '_iter_members', side_effect=AssertionError), \
+                mock.patch.object(spec_stream, 'loads_json', wraps=spec_stream.loads_json) as loads_json:
+            self.assertEqual(dict(stream.iter_paths()), spec['paths'])
+            self.assertEqual(loads_json.call_count, len(spec['paths']))
+
+            with SpecStream(open(path, 'rb'), state=stream.state()) as reopened:
+                self.assertEqual(reopened.header, stream.header)
+                self.assertEqual(dict(reopened.iter_paths()), spec['paths'])
+
+    def test_window_edges_and_invalid_utf8(self):
+        """Characters split by the decode window survive; invalid bytes are reported, not dropped"""
+        # The first window ends inside one of the three-byte characters
+        spec = dict(SPEC, info={'title': '€' * 50000, 'version': '1'})
+        path = self._write('spec.json', json.dumps(spec, ensure_ascii=False))
+        with SpecStream(open(path, 'rb')) as stream:
+            self.assertEqual(stream.header['info'], spec['info'])
+            self.assertEqual(dict(stream.iter_paths()), SPEC['paths'])
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        broken = raw.replace('€'.encode('utf-8'), b'\xe2\x82x', 1)
+        with open(path, 'wb') as f:
+            f.write(broken)
+        offset = broken.index(b'\xe2\x82x')
+        with self.assertRaisesRegex(ValueError, f"Invalid UTF-8 at byte {offset}"):
+            SpecStream(open(path, 'rb'))
+
+    def test_yaml_fallback(self):
+        """YAML specs are iterated after a full load"""
+        path = self._write('spec.yaml', yaml.safe_dump(SPEC))
+
+        with SpecStream(open(path, 'rb')) as stream:
+            self.assertEqual(stream.header['info']['version'], '2.0')
+            self.assertEqual([p for p, _ in stream.iter_paths()], list(SPEC['paths']))
+
+    def test_process_matches_iter_endpoints(self):
+        """process_swagger_url consumes the same stream as iter_endpoints"""
+        path = self._write('spec.json', json.dumps(SPEC))
+        agent = InputInterpreterAgent()
+
+        analysis = agent.process_swagger_url(path)
+        streamed = list(InputInterpreterAgent().iter_endpoints(path))
+
+        self.assertEqual(analysis.title, 'Stream "API"')
+        self.assertEqual(analysis.base_url, 'http://localhost:8080')
+        self.assertEqual([e.operation_id for e in streamed],
+                         ['listPets', 'createPet', 'getPet'])
+        self.assertEqual(analysis.endpoints, streamed)
+        self.assertIn('JSON Path: $.id', streamed[2].response_assertions)
+
+
+if __name__ == '__main__':
+    unittest.main()
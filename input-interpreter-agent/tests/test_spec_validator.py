@@ -0,0 +1,197 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import InputInterpreterAgent
+from benchmarks.spec_generator import generate_spec
+from parsers.spec_stream import SpecStream
+from parsers.spec_validator import (SpecValidator, ShardValidator, STRUCTURAL, FULL,
+                                    sharding_supported, validate_unsharded)
+
+
+def ok(code='200'):
+    return {code: {'description': 'ok'}}
+
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Pets', 'version': '1'},
+    'paths': {
+        '/pets/{petId}': {
+            'get': {'operationId': 'getPet', 'responses': ok()},
+            'delete': {'operationId': 'getPet',
+                       'parameters': [{'name': 'petId', 'in': 'path', 'required': True,
+                                       'schema': {'type': 'integer'}},
+                                      {'$ref': '#/components/parameters/Missing'}],
+                       'responses': ok('204')}
+        },
+        '/pets': {
+            'post': {'operationId': 'createPet'},
+            'get': {'operationId': 'listPets',
+                    'parameters': [{'name': 'limit', 'in': 'query',
+                                    'schema': {'type': 'integer', 'default': 'ten'}}],
+                    'responses': ok()}
+        }
+    },
+    'components': {'schemas': {'Pet': {'type': 'object', 'properties': {'id': {'type': 'integer'}}}}}
+}
+
+
+class TestSpecValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        # The agent reports progress on stdout
+        stdout = redirect_stdout(io.StringIO())
+        self.output = stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def write_spec(self, spec, name='spec.json'):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w') as f:
+            json.dump(spec, f)
+        return path
+
+    def open_stream(self, spec):
+        f = open(self.write_spec(spec), 'rb')
+        self.addCleanup(f.close)
+        stream = SpecStream(f)
+        self.addCleanup(stream.close)
+        return stream
+
+    def issues(self, report, severity):
+        return [str(issue) for issue in report.issues if issue.severity == severity]
+
+    def test_structural_warnings_do_not_stop_analysis(self):
+        agent = InputInterpreterAgent()
+        analysis = agent.process_swagger_url(self.write_spec(SPEC))
+
+        self.assertEqual(len(analysis.endpoints), 4)
+        self.assertEqual(agent.validation.operations, 4)
+        self.assertEqual(self.issues(agent.validation, 'warning'), [
+            "GET /pets/{petId}: path parameter 'petId' is not declared",
+            "DELETE /pets/{petId} parameters.1: unresolved $ref #/components/parameters/Missing",
+            "DELETE /pets/{petId}: operationId 'getPet' is already used by GET /pets/{petId}",
+            "POST /pets: no responses"
+        ])
+        self.assertIn('⚠️ 4 spec validation warnings', self.output.getvalue())
+
+    def test_malformed_spec_fails_with_its_location(self):
+        spec = dict(SPEC, paths={'/pets': {'get': {'responses': {'200': 'ok'}}}})
+
+        with self.assertRaises(ValueError) as error:
+            InputInterpreterAgent().process_swagger_url(self.write_spec(spec))
+        self.assertEqual(str(error.exception), 'Invalid spec: GET /pets responses.200: response is not a mapping')
+
+        spec = dict(SPEC, paths={'/pets': {'get': {'parameters': {'name': 'limit'}, 'responses': ok()}}})
+        with self.assertRaisesRegex(ValueError, r'GET /pets parameters: parameters is not a list'):
+            list(InputInterpreterAgent(workers=2, parallel_threshold=1).iter_endpoints(self.write_spec(spec)))
+
+    def test_full_validation(self):
+        agent = InputInterpreterAgent()
+        report = agent.validate_spec(self.write_spec(SPEC), level=FULL)
+
+        self.assertFalse(report.valid)
+        self.assertEqual(len(report.warnings), 3)
+        errors = self.issues(report, 'error')
+        # No single shard sees both operations, so the structural pass reports the duplicate
+        self.assertEqual(errors[0], "DELETE /pets/{petId}: operationId 'getPet' is already used by GET /pets/{petId}")
+        self.assertIn("/pets: 'ten' is not of type 'integer'", errors)
+        self.assertIn("POST /pets: 'responses' is a required property", errors)
+        self.assertIn('❌ Spec has', self.output.getvalue())
+
+        valid = agent.validate_spec(self.write_spec(generate_spec(paths=5, models=3), 'valid.json'))
+        self.assertTrue(valid.valid)
+        self.assertEqual(valid.issues, [])
+
+    def test_parallel_shards_match_serial(self):
+        spec = generate_spec(paths=12, models=4)
+        spec['paths']['/resources7/{resourceId}']['get']['responses']['200']['description'] = 7
+        path = self.write_spec(spec)
+
+        reports = []
+        for workers in (1, 2):
+            with open(path, 'rb') as f, SpecStream(f) as stream:
+                reports.append(SpecValidator(workers=workers, chunk_paths=5).validate(stream, FULL))
+
+        serial, parallel = reports
+        self.assertEqual(serial.issues, parallel.issues)
+        self.assertEqual([issue.location for issue in serial.errors], ['GET /resources7/{resourceId} responses.200'])
+
+    @unittest.skipUnless(sharding_supported(), 'sharding is not supported by this openapi-spec-validator')
+    def test_shards_match_whole_document(self):
+        """The library internals ShardValidator relies on still give the public API's answer"""
+        spec = generate_spec(paths=12, models=4)
+        spec['paths']['/resources7/{resourceId}']['get']['responses']['200']['description'] = 7
+        header = {key: value for key, value in spec.items() if key != 'paths'}
+        path_items = list(spec['paths'].items())
+
+        shard = ShardValidator(header)
+        issues = shard.validate_header()
+        for start in range(0, len(path_items), 5):
+            issues.extend(shard.validate_paths(path_items[start:start + 5]))
+        self.assertEqual(issues, validate_unsharded(header, path_items))
+        self.assertEqual(len(issues), 1)
+
+    def test_other_releases_are_validated_unsharded(self):
+        self.assertTrue(sharding_supported('0.7.2'))
+        self.assertFalse(sharding_supported('0.6.3'))
+        self.assertFalse(sharding_supported('1.0.0'))
+        self.assertFalse(sharding_supported('dev'))
+
+        with mock.patch('parsers.spec_validator.SHARDED_VALIDATOR_VERSIONS', ((0, 0), (0, 1))), \
+                mock.patch.object(ShardValidator, 'validate_paths', side_effect=AssertionError):
+            report = SpecValidator(workers=2).validate(self.open_stream(SPEC), FULL)
+        self.assertIn("POST /pets: 'responses' is a required property", self.issues(report, 'error'))
+
+    def test_reports_are_cached_by_content_hash(self):
+        cache_dir = os.path.join(self.tmp_dir.name, 'validation')
+        path = self.write_spec(SPEC)
+        copy = self.write_spec(SPEC, 'copy.json')
+
+        validator = SpecValidator(cache_dir=cache_dir)
+        agent = InputInterpreterAgent(validator=validator)
+        first = agent.validate_spec(path)
+        again = agent.validate_spec(copy)
+
+        self.assertFalse(first.cached)
+        self.assertTrue(again.cached)
+        self.assertEqual(again.issues, first.issues)
+        self.assertEqual((validator.hits, validator.misses), (1, 1))
+
+        # Levels are cached separately, and the disk cache outlives the validator
+        self.assertFalse(agent.validate_spec(path, level=STRUCTURAL).cached)
+        restarted = InputInterpreterAgent(validator=SpecValidator(cache_dir=cache_dir))
+        self.assertTrue(restarted.validate_spec(path).cached)
+
+        self.write_spec(dict(SPEC, info={'title': 'Changed', 'version': '2'}))
+        self.assertFalse(restarted.validate_spec(path).cached)
+
+    def test_background_validation(self):
+        validator = SpecValidator(full=True)
+        self.addCleanup(validator.close)
+        agent = InputInterpreterAgent(validator=validator)
+
+        analysis = agent.process_swagger_url(self.write_spec(SPEC))
+        report = agent.full_validation.result(30)
+        self.assertEqual(len(analysis.endpoints), 4)
+        self.assertEqual((report.level, report.operations), (FULL, 4))
+        self.assertFalse(report.valid)
+
+        # The same content is not validated again
+        future = agent.validate_spec(self.write_spec(SPEC, 'copy.json'), background=True)
+        self.assertTrue(future.result(30).cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,17 @@
+import re
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def normalize_name(name: str) -> str:
+    """Case and separator insensitive key: petId, pet_id and Pet-ID all give 'petid'"""
+    return _NON_ALNUM.sub('', name.lower())
+
+
+def singular(noun: str) -> str:
+    """Naive English singular of a table or path segment (pets -> pet, categories -> category)"""
+    if noun.endswith('ies'):
+        return noun[:-3] + 'y'
+    if noun.endswith('s') and not noun.endswith('ss'):
+        return noun[:-1]
+    return noun
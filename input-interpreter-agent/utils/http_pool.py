@@ -0,0 +1,42 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    import requests
+
+
+def create_session(per_host_limit: int = 4, max_hosts: int = 32) -> 'requests.Session':
+    """Session with a keep-alive connection pool sized for per-host concurrency"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=per_host_limit, pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class HostLimiter:
+    """Caps the number of concurrent requests per host"""
+
+    def __init__(self, per_host_limit: int = 4):
+        self.per_host_limit = per_host_limit
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return semaphore
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold one of the host's request slots for the duration of the block"""
+        semaphore = self._semaphore(urlparse(url).netloc.lower())
+        with semaphore:
+            yield
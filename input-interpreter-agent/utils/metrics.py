@@ -0,0 +1,252 @@
+import cProfile
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+
+
+class Instrumentation:
+    """Collects per-stage timings, counts and cache hit rates for one run.
+
+    ``stage(name)`` may be entered many times per run (e.g. once per
+    operation); durations are summed and calls counted. Stages listed in
+    ``profile_stages`` run under cProfile and stages in ``memory_stages``
+    record their tracemalloc peak. ``flush()`` sends the run's report to every
+    sink and starts a new run. Stages, counts and caches may be recorded
+    from several threads at once.
+
+    tracemalloc keeps a single peak, which every memory stage has to reset.
+    Before resetting it, the peak so far is saved into each memory stage
+    still open (nested or on another thread), and a stage's peak on exit is
+    the larger of the saved and the current one, so entering a stage never
+    hides an enclosing stage's peak.
+    """
+
+    enabled = True
+
+    def __init__(self, sinks: Iterable['MetricsSink'] = (), profile_stages: Iterable[str] = (),
+                 memory_stages: Iterable[str] = (), profile_dir: Optional[str] = None):
+        self.sinks = list(sinks)
+        self.profile_stages = set(profile_stages)
+        self.memory_stages = set(memory_stages)
+        self.profile_dir = profile_dir
+        self._started_tracing = False
+        self._lock = threading.Lock()
+        self._memory_frames: List[Dict[str, int]] = []  # open memory stages
+        self._reset()
+
+    def _reset(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counts: Dict[str, float] = {}
+        self.caches: Dict[str, Dict[str, float]] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block and attribute it to a stage"""
+        profiler = self._profiler(name) if name in self.profile_stages else None
+        trace_memory = name in self.memory_stages
+
+        frame = self._enter_memory() if trace_memory else None
+        if profiler is not None:
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+
+            peak = self._exit_memory(frame) if frame is not None else None
+            with self._lock:
+                stats = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                stats['seconds'] += elapsed
+                stats['calls'] += 1
+                if peak is not None:
+                    stats['peak_bytes'] = max(stats.get('peak_bytes', 0), peak)
+
+    def _enter_memory(self) -> Dict[str, int]:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            for frame in self._memory_frames:
+                frame['peak'] = max(frame['peak'], peak)
+            tracemalloc.reset_peak()
+            frame = {'before': current, 'peak': current}
+            self._memory_frames.append(frame)
+            return frame
+
+    def _exit_memory(self, frame: Dict[str, int]) -> int:
+        """Bytes the stage's peak rose above its starting usage"""
+        with self._lock:
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            self._memory_frames.remove(frame)
+            return peak - frame['before']
+
+    def add_time(self, name: str, seconds: float):
+        """Attribute an externally measured duration to a stage"""
+        with self._lock:
+            stats = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stats['seconds'] += seconds
+            stats['calls'] += 1
+
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def cache(self, name: str, hits: int, misses: int):
+        """Record hit/miss totals of a cache used during the run"""
+        total = hits + misses
+        with self._lock:
+            self.caches[name] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0
+            }
+
+    def _profiler(self, name: str) -> cProfile.Profile:
+        profiler = self.profiles.get(name)
+        if profiler is None:
+            profiler = self.profiles[name] = cProfile.Profile()
+        return profiler
+
+    def report(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Snapshot of the current run"""
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'context': context or {},
+                'stages': {name: dict(stats) for name, stats in self.stages.items()},
+                'counts': dict(self.counts),
+                'caches': {name: dict(stats) for name, stats in self.caches.items()}
+            }
+
+    def flush(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Emit the run's report to every sink and start a new run"""
+        report = self.report(context)
+
+        if self.profile_dir and self.profiles:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            for name, profiler in self.profiles.items():
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+
+        for sink in self.sinks:
+            sink.emit(report)
+
+        with self._lock:
+            if self._started_tracing and not self._memory_frames:
+                tracemalloc.stop()
+                self._started_tracing = False
+            self._reset()
+        return report
+
+
+class NullInstrumentation(Instrumentation):
+    """Disabled instrumentation: every call is a cheap no-op"""
+
+    enabled = False
+
+    def __init__(self):
+        super().__init__()
+        self._noop = _NoopContext()
+
+    def stage(self, name: str) -> '_NoopContext':
+        return self._noop
+
+    def add_time(self, name: str, seconds: float):
+        pass
+
+    def count(self, name: str, value: float = 1):
+        pass
+
+    def cache(self, name: str, hits: int, misses: int):
+        pass
+
+    def flush(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {}
+
+
+class _NoopContext:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class MetricsSink:
+    def emit(self, report: Dict[str, Any]):
+        raise NotImplementedError
+
+
+class LoggingSink(MetricsSink):
+    """Logs one summary line per run"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger('input_interpreter_agent.metrics')
+        self.level = level
+
+    def emit(self, report: Dict[str, Any]):
+        stages = ', '.join(f"{name}={stats['seconds']:.3f}s" for name, stats in report['stages'].items())
+        caches = ', '.join(f"{name}={stats['hit_rate']:.0%}" for name, stats in report['caches'].items())
+        self.logger.log(self.level, "stages: %s | counts: %s | cache hit rates: %s",
+                        stages, report['counts'], caches)
+
+
+class JsonLinesSink(MetricsSink):
+    """Appends each run's report as one JSON line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def emit(self, report: Dict[str, Any]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, default=str) + '\n')
+
+
+class PrometheusTextfileSink(MetricsSink):
+    """Writes the latest run in Prometheus text format (node_exporter textfile collector)"""
+
+    def __init__(self, path: str, prefix: str = 'jmeter_agent'):
+        self.path = path
+        self.prefix = prefix
+
+    def emit(self, report: Dict[str, Any]):
+        lines = self._lines(report)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def _lines(self, report: Dict[str, Any]) -> List[str]:
+        p = self.prefix
+        lines = [f"# TYPE {p}_stage_seconds gauge"]
+        for name, stats in report['stages'].items():
+            lines.append(f'{p}_stage_seconds{{stage="{name}"}} {stats["seconds"]:.6f}')
+
+        lines.append(f"# TYPE {p}_stage_calls gauge")
+        for name, stats in report['stages'].items():
+            lines.append(f'{p}_stage_calls{{stage="{name}"}} {stats["calls"]}')
+
+        lines.append(f"# TYPE {p}_count gauge")
+        for name, value in report['counts'].items():
+            lines.append(f'{p}_count{{name="{name}"}} {value}')
+
+        lines.append(f"# TYPE {p}_cache_hit_ratio gauge")
+        for name, stats in report['caches'].items():
+            lines.append(f'{p}_cache_hit_ratio{{cache="{name}"}} {stats["hit_rate"]}')
+
+        return lines
@@ -0,0 +1,347 @@
+import asyncio
+import json
+import math
+import random
+import threading
+from collections import deque
+from contextlib import contextmanager
+from http import HTTPStatus
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple
+from urllib.parse import urlsplit
+
+from models.endpoint_model import EndpointInfo, Response, SwaggerAnalysis
+from parsers.schema_analyzer import SchemaAnalyzer
+
+try:
+    import uvloop
+except ImportError:  # optional, falls back to the default event loop
+    uvloop = None
+
+MAX_HEADER_BYTES = 64 * 1024
+SERVER_HEADER = b'Server: jmeter-agentic-mock\r\n'
+
+
+class LatencyModel:
+    """Response delay, in seconds, drawn per request from a seeded distribution.
+
+    ``per_operation`` overrides the default for single operations. Delays are
+    clamped at zero.
+    """
+
+    def __init__(self, default: Optional[Callable[[random.Random], float]] = None,
+                 per_operation: Optional[Dict[str, Callable[[random.Random], float]]] = None,
+                 seed: int = 0):
+        self.default = default
+        self.per_operation = dict(per_operation or {})
+        self.rng = random.Random(seed)
+
+    @staticmethod
+    def fixed(ms: float) -> Callable[[random.Random], float]:
+        return lambda rng: ms / 1000
+
+    @staticmethod
+    def uniform(low_ms: float, high_ms: float) -> Callable[[random.Random], float]:
+        return lambda rng: rng.uniform(low_ms, high_ms) / 1000
+
+    @staticmethod
+    def normal(mean_ms: float, stddev_ms: float) -> Callable[[random.Random], float]:
+        return lambda rng: rng.gauss(mean_ms, stddev_ms) / 1000
+
+    @staticmethod
+    def lognormal(median_ms: float, sigma: float) -> Callable[[random.Random], float]:
+        """Long-tailed; median_ms is the 50th percentile"""
+        mu = math.log(median_ms) if median_ms > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+
+    @staticmethod
+    def exponential(mean_ms: float) -> Callable[[random.Random], float]:
+        return lambda rng: rng.expovariate(1 / mean_ms) / 1000 if mean_ms > 0 else 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> Callable[[random.Random], float]:
+        """'fixed:20', 'uniform:5:50', 'normal:40:10', 'lognormal:30:0.5' or 'exponential:25'"""
+        name, *args = spec.split(':')
+        factory = {'fixed': cls.fixed, 'uniform': cls.uniform, 'normal': cls.normal,
+                   'lognormal': cls.lognormal, 'exponential': cls.exponential}.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown latency distribution: {name}")
+        return factory(*(float(a) for a in args))
+
+    def sample(self, operation_id: Optional[str]) -> float:
+        distribution = self.per_operation.get(operation_id, self.default)
+        return max(0.0, distribution(self.rng)) if distribution is not None else 0.0
+
+
+class MockServer:
+    """HTTP/1.1 stub server for an analyzed API, built for throughput.
+
+    Requests are routed through the analysis' path templates. Each operation
+    answers with its first 2xx response, whose body comes from the response
+    schema via SchemaAnalyzer. Complete responses (status line, headers and
+    body) are serialized once up front; with ``variants`` > 1 each operation
+    cycles through that many different bodies. The hot path only parses the
+    request line and Content-Length, looks up the route and writes bytes, with
+    keep-alive and pipelining. Unknown paths get 404, unknown methods 405.
+    """
+
+    def __init__(self, analysis: SwaggerAnalysis, latency: Optional[LatencyModel] = None,
+                 analyzer: Optional[SchemaAnalyzer] = None, variants: int = 1, seed: int = 0):
+        self.analysis = analysis
+        self.latency = latency
+        self.requests = 0
+        self._analyzer = analyzer or SchemaAnalyzer()
+        self._responses: Dict[str, List[bytes]] = {}
+        self._counters: Dict[str, int] = {}
+        self._routes: Dict[Tuple[bytes, bytes], Tuple[Optional[str], List[bytes]]] = {}
+        self._not_found = _response(404, b'application/json', b'{"error":"not found"}')
+        self._not_allowed = _response(405, b'application/json', b'{"error":"method not allowed"}')
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+        for endpoint in analysis.endpoints:
+            self._responses[endpoint.operation_id] = self._canned(endpoint, max(1, variants), seed)
+            self._counters[endpoint.operation_id] = 0
+
+    def _canned(self, endpoint: EndpointInfo, variants: int, seed: int) -> List[bytes]:
+        """Serialized responses for one operation"""
+        response = _success_response(endpoint.responses)
+        if response is None:
+            return [_response(200, b'application/json', b'')]
+
+        status = int(response.status_code) if response.status_code.isdigit() else 200
+        content_type = (response.content_type or 'application/json').encode('latin-1')
+        samples = self._analyzer.generate_response_samples(response, variants, seed)
+        if not samples or status in (204, 304):
+            return [_response(status, content_type, b'')]
+        return [_response(status, content_type, _encode_body(sample, response.content_type))
+                for sample in samples]
+
+    def route(self, method: bytes, target: bytes) -> Tuple[Optional[str], bytes]:
+        """(operation_id, serialized response) for a request line"""
+        path = target.split(b'?', 1)[0]
+        key = (method, path)
+        routed = self._routes.get(key)
+        if routed is None:
+            routed = self._resolve(method.decode('latin-1'), path.decode('latin-1'))
+            if len(self._routes) < 100_000:  # concrete paths, so bound the memo
+                self._routes[key] = routed
+
+        operation_id, responses = routed
+        if len(responses) == 1:
+            return operation_id, responses[0]
+
+        count = self._counters[operation_id]
+        self._counters[operation_id] = count + 1
+        return operation_id, responses[count % len(responses)]
+
+    def _resolve(self, method: str, path: str) -> Tuple[Optional[str], List[bytes]]:
+        found = self.analysis.match_path(path, method)
+        if found is not None:
+            operation_id = found[0].operation_id
+            return operation_id, self._responses[operation_id]
+        if self.analysis.match_path(path) is not None:
+            return None, [self._not_allowed]
+        return None, [self._not_found]
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, reuse_port: bool = False) -> int:
+        """Start listening; returns the bound port"""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _MockProtocol(self), host, port,
+                                               reuse_port=reuse_port or None, backlog=1024)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Keep-alive clients would otherwise hold wait_closed() open
+            for transport in list(self._connections):
+                transport.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8080, reuse_port: bool = False):
+        await self.start(host, port, reuse_port)
+        await self._server.serve_forever()
+
+    @contextmanager
+    def run_in_thread(self, host: str = '127.0.0.1', port: int = 0) -> Iterator[str]:
+        """Serve from a background event loop, yielding the base URL"""
+        loop = new_event_loop()
+        started = threading.Event()
+        bound: Dict[str, Any] = {}
+
+        def run():
+            asyncio.set_event_loop(loop)
+            try:
+                bound['port'] = loop.run_until_complete(self.start(host, port))
+            except Exception as e:
+                bound['error'] = e
+            started.set()
+            if 'error' not in bound:
+                loop.run_forever()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        started.wait()
+        if 'error' in bound:
+            raise bound['error']
+
+        try:
+            yield f"http://{host}:{bound['port']}{_base_path(self.analysis.base_url)}"
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+class _MockProtocol(asyncio.Protocol):
+    """One connection: parses pipelined requests and writes responses in order"""
+
+    def __init__(self, server: MockServer):
+        self.server = server
+        self.latency = server.latency
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+        self.skip = 0  # request body bytes still to discard
+        self.pending: deque = deque()  # (ready_at, data, close) when delaying
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.ready_at = 0.0
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        self.server._connections.add(transport)
+
+    def connection_lost(self, exc: Optional[Exception]):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.server._connections.discard(self.transport)
+        self.transport = None
+
+    def data_received(self, data: bytes):
+        buffer = self.buffer
+        buffer += data
+
+        while True:
+            if self.skip:
+                dropped = min(self.skip, len(buffer))
+                del buffer[:dropped]
+                self.skip -= dropped
+                if self.skip:
+                    return
+
+            end = buffer.find(b'\r\n\r\n')
+            if end < 0:
+                if len(buffer) > MAX_HEADER_BYTES:
+                    self._respond(None, _response(431, b'text/plain', b''), close=True)
+                return
+
+            head = bytes(buffer[:end])
+            del buffer[:end + 4]
+            if not self._handle(head) or self.transport is None:
+                return
+
+    def _handle(self, head: bytes) -> bool:
+        """Answer one request; False when the connection is closing"""
+        line_end = head.find(b'\r\n')
+        request_line = head if line_end < 0 else head[:line_end]
+        parts = request_line.split(b' ')
+        if len(parts) != 3:
+            self._respond(None, _response(400, b'text/plain', b''), close=True)
+            return False
+
+        method, target, version = parts
+        headers = head[line_end:].lower() if line_end >= 0 else b''
+
+        if b'\r\ntransfer-encoding:' in headers:
+            self._respond(None, _response(501, b'text/plain', b''), close=True)
+            return False
+
+        position = headers.find(b'\r\ncontent-length:')
+        if position >= 0:
+            value_end = headers.find(b'\r\n', position + 2)
+            value = headers[position + 17:value_end if value_end >= 0 else None]
+            try:
+                length = int(value)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self._respond(None, _response(400, b'text/plain', b''), close=True)
+                return False
+            self.skip = length
+
+        if version == b'HTTP/1.0':
+            close = b'\r\nconnection: keep-alive' not in headers
+        else:
+            close = b'\r\nconnection: close' in headers
+
+        operation_id, data = self.server.route(method, target)
+        self.server.requests += 1
+        self._respond(operation_id, data, close)
+        return not close
+
+    def _respond(self, operation_id: Optional[str], data: bytes, close: bool):
+        delay = self.latency.sample(operation_id) if self.latency is not None else 0.0
+        if not delay and not self.pending:
+            self.transport.write(data)
+            if close:
+                self.transport.close()
+            return
+
+        # Responses leave in request order, each no earlier than its own delay
+        loop = asyncio.get_running_loop()
+        self.ready_at = max(self.ready_at, loop.time() + delay)
+        self.pending.append((self.ready_at, data, close))
+        if self.timer is None:
+            self.timer = loop.call_at(self.ready_at, self._flush)
+
+    def _flush(self):
+        self.timer = None
+        if self.transport is None:
+            return
+
+        now = asyncio.get_running_loop().time()
+        while self.pending and self.pending[0][0] <= now:
+            _, data, close = self.pending.popleft()
+            self.transport.write(data)
+            if close:
+                self.transport.close()
+                self.pending.clear()
+                return
+
+        if self.pending:
+            self.timer = asyncio.get_running_loop().call_at(self.pending[0][0], self._flush)
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """uvloop's loop when it is installed, else asyncio's"""
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+
+def _success_response(responses: List[Response]) -> Optional[Response]:
+    """The lowest 2xx response, else 'default', else the first one"""
+    success = sorted((r for r in responses if r.status_code.startswith('2')), key=lambda r: r.status_code)
+    if success:
+        return success[0]
+    return next((r for r in responses if r.status_code == 'default'), responses[0] if responses else None)
+
+
+def _encode_body(sample: Any, content_type: str) -> bytes:
+    if content_type.startswith('text/') and isinstance(sample, str):
+        return sample.encode('utf-8')
+    # JSON for JSON media types, and as the stand-in for anything else
+    return json.dumps(sample, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _response(status: int, content_type: bytes, body: bytes) -> bytes:
+    try:
+        reason = HTTPStatus(status).phrase.encode('latin-1')
+    except ValueError:  # unregistered codes such as 299 have no standard phrase
+        reason = b''
+    return (b'HTTP/1.1 %d %s\r\n' % (status, reason) + SERVER_HEADER +
+            b'Content-Type: ' + content_type + b'\r\n'
+            b'Content-Length: %d\r\n\r\n' % len(body) + body)
+
+
+def _base_path(base_url: str) -> str:
+    return urlsplit(base_url).path.rstrip('/')
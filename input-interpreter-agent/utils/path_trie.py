@@ -0,0 +1,119 @@
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+PARAMETER = re.compile(r'\{([^}/]+)\}')
+
+
+class _Node:
+    __slots__ = ('literals', 'patterns', 'value')
+
+    def __init__(self):
+        self.literals: Dict[str, '_Node'] = {}
+        # (template segment, regex or None for a whole-segment parameter, names, child)
+        self.patterns: List[Tuple[str, Any, Tuple[str, ...], '_Node']] = []
+        self.value: Any = None
+
+
+class PathTrie:
+    """Matches concrete paths such as ``/pets/42`` against path templates.
+
+    Templates are split on ``/``; literal segments are dict lookups and
+    ``{param}`` segments (or partial ones like ``{name}.json``) are tried
+    only when no literal matches, so ``/pets/mine`` wins over
+    ``/pets/{petId}``.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self.size = 0
+
+    def insert(self, template: str, value: Any):
+        node = self.root
+
+        for segment in _segments(template):
+            if '{' not in segment:
+                node = node.literals.setdefault(segment, _Node())
+                continue
+
+            for existing, _, _, child in node.patterns:
+                if existing == segment:
+                    node = child
+                    break
+            else:
+                names = tuple(PARAMETER.findall(segment))
+                whole = len(names) == 1 and segment == f"{{{names[0]}}}"
+                child = _Node()
+                node.patterns.append((segment, None if whole else _segment_regex(segment), names, child))
+                node = child
+
+        if node.value is None:
+            self.size += 1
+        node.value = value
+
+    def match(self, path: str) -> Optional[Tuple[Any, Dict[str, str]]]:
+        """Return (value, path parameters) for the best matching template"""
+        segments = _segments(path)
+
+        # Fast path: walk down preferring literals, taking a parameter only
+        # when it is the node's single plain {param}; that is the same
+        # choice the backtracking search makes first, so a hit is final.
+        node = self.root
+        params = {}
+        for segment in segments:
+            child = node.literals.get(segment)
+            if child is None:
+                patterns = node.patterns
+                if len(patterns) != 1 or patterns[0][1] is not None:
+                    break
+                _, _, names, child = patterns[0]
+                params[names[0]] = segment
+            node = child
+        else:
+            if node.value is not None:
+                return node.value, params
+
+        return _match(self.root, segments, 0)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def _segments(path: str) -> List[str]:
+    path = path.strip('/')
+    return path.split('/') if path else []
+
+
+def _segment_regex(segment: str) -> Any:
+    parts = PARAMETER.split(segment)
+    # split() alternates literal text and parameter names
+    regex = ''.join(re.escape(part) if i % 2 == 0 else '([^/]+?)' for i, part in enumerate(parts))
+    return re.compile(f"^{regex}$")
+
+
+def _match(node: _Node, segments: List[str], position: int) -> Optional[Tuple[Any, Dict[str, str]]]:
+    if position == len(segments):
+        return (node.value, {}) if node.value is not None else None
+
+    segment = segments[position]
+
+    child = node.literals.get(segment)
+    if child is not None:
+        found = _match(child, segments, position + 1)
+        if found is not None:
+            return found
+
+    for _, pattern, names, child in node.patterns:
+        if pattern is None:
+            values = (segment,)
+        else:
+            matched = pattern.match(segment)
+            if matched is None:
+                continue
+            values = matched.groups()
+
+        found = _match(child, segments, position + 1)
+        if found is not None:
+            found[1].update(zip(names, values))
+            return found
+
+    return None
@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, List, Iterator, Iterable, Callable, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_worker_state = threading.local()
+
+
+def create_executor(kind: str, workers: int, header: Dict[str, Any],
+                    fingerprints: bool = False) -> Executor:
+    """Create a process or thread pool whose workers hold their own agent"""
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                   initargs=(header, fingerprints))
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=workers, initializer=init_worker,
+                                  initargs=(header, fingerprints))
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def init_worker(header: Dict[str, Any], fingerprints: bool = False):
+    """Give each worker its own parser/analyzer bound to the spec header"""
+    from agent import InputInterpreterAgent
+
+    agent = InputInterpreterAgent(fingerprints=fingerprints)
+    agent.parser.load_spec(header)
+    _worker_state.agent = agent
+
+
+def analyze_path_items(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+    """Parse and analyze a shard of path items inside a worker"""
+    agent = _worker_state.agent
+    endpoints = []
+
+    for path, path_item in chunk:
+        for endpoint in agent._parse_path_item(path, path_item):
+            endpoints.append(agent.analyzer.analyze_endpoint_requirements(endpoint))
+
+    return endpoints
+
+
+def generate_sample_chunk(chunk: List[Any]) -> List[Dict[str, Any]]:
+    """Generate sample data for a shard of endpoints inside a worker"""
+    analyzer = _worker_state.agent.analyzer
+    return [analyzer.generate_sample_data(endpoint) for endpoint in chunk]
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(executor: Executor, fn: Callable[[T], R], items: Iterable[T],
+                max_pending: int) -> Iterator[R]:
+    """Map fn over items in the pool, yielding results in submission order.
+
+    At most max_pending items are in flight, so reading the input overlaps
+    with the workers without buffering the whole input or output.
+    """
+    pending = deque()
+
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
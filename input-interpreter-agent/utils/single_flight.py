@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent work for the same key into one execution.
+
+    The first caller for a key starts the work and every caller arriving
+    while it runs gets the same future. The key is forgotten as soon as the
+    future completes, so later calls start fresh work (and a failure is not
+    remembered).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def submit(self, key: Hashable, start: Callable[[], Future]) -> Future:
+        """Future of the in-flight work for key, calling start() when there is none.
+
+        start runs under the lock and should only schedule the work (e.g.
+        executor.submit); exceptions it raises propagate to this caller.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            # A done future may not have been forgotten yet; it is no longer in flight
+            if future is not None and not future.done():
+                self.coalesced += 1
+                return future
+            future = self._in_flight[key] = start()
+            self.started += 1
+
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return sum(1 for future in self._in_flight.values() if not future.done())
+
+    def _forget(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
@@ -0,0 +1,173 @@
+import csv
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+from models.endpoint_model import EndpointInfo, CsvWriteResult
+from parsers.schema_analyzer import SchemaAnalyzer, _to_list
+
+
+class CsvDataWriter:
+    """Streams generated parameter rows into JMeter CSV Data Set files.
+
+    Rows are split into contiguous shards (one file each, e.g. one per load
+    generator or thread group) and generated in batches, so memory stays
+    bounded by ``batch_size`` whatever the row count. Every batch draws from
+    its own seed derived from (seed, operation, shard, batch), so the output
+    is identical whether shards are written serially or in a process pool.
+    Unique columns are derived from the global row index instead of random
+    draws, which makes them unique across all shards without coordination:
+    integers count up from the lower bound, uuids are uuid5 of the row under
+    a namespace from (seed, operation, column), and other strings spell the
+    index in their format or pattern. ``vectorized`` draws numeric and enum
+    columns with NumPy (see SchemaAnalyzer.generate_columns): faster, but
+    the files then depend on whether NumPy is installed.
+    """
+
+    def __init__(self, analyzer: Optional[SchemaAnalyzer] = None, batch_size: int = 10000,
+                 seed: int = 0, vectorized: bool = False):
+        self.analyzer = analyzer or SchemaAnalyzer()
+        self.batch_size = batch_size
+        self.seed = seed
+        self.vectorized = vectorized
+
+    def write(self, endpoint: EndpointInfo, output_dir: str, rows: int, shards: int = 1,
+              workers: int = 1, unique_columns: Optional[Sequence[str]] = None,
+              header: bool = True) -> CsvWriteResult:
+        """Write rows for one operation into shards files under output_dir"""
+        os.makedirs(output_dir, exist_ok=True)
+        if unique_columns is None:
+            unique_columns = self.default_unique_columns(endpoint, rows)
+        self._check_unique(endpoint, rows, unique_columns)
+
+        tasks = []
+        for shard, (start, stop) in enumerate(plan_shards(rows, shards)):
+            path = os.path.join(output_dir, f"{endpoint.operation_id}_{shard}.csv")
+            tasks.append((endpoint, path, shard, start, stop, list(unique_columns), header))
+
+        started = time.perf_counter()
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                written = list(executor.map(_write_shard_task, tasks, [self.batch_size] * len(tasks),
+                                            [self.seed] * len(tasks), [self.vectorized] * len(tasks)))
+        else:
+            written = [self.write_shard(*task) for task in tasks]
+
+        return CsvWriteResult(
+            operation_id=endpoint.operation_id,
+            files=[task[1] for task in tasks],
+            rows=sum(written),
+            elapsed_seconds=time.perf_counter() - started
+        )
+
+    def write_shard(self, endpoint: EndpointInfo, path: str, shard: int, start: int, stop: int,
+                    unique_columns: Sequence[str] = (), header: bool = True) -> int:
+        """Write global rows [start, stop) to one file; returns rows written"""
+        written = 0
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            columns = self.column_names(endpoint)
+            if header:
+                writer.writerow(columns)
+
+            for batch, offset in enumerate(range(start, stop, self.batch_size)):
+                n = min(self.batch_size, stop - offset)
+                seed = derive_seed(self.seed, endpoint.operation_id, shard, batch)
+                generated = self.analyzer.generate_columns(endpoint, n, seed, skip=unique_columns,
+                                                           vectorized=self.vectorized)
+
+                values = []
+                for name in columns:
+                    if name in unique_columns:
+                        column = self._unique_column(endpoint, name, offset, n)
+                    else:
+                        column = _to_list(generated[name])
+                    if name == 'request_body':
+                        column = [json.dumps(body, separators=(',', ':')) for body in column]
+                    values.append(column)
+
+                writer.writerows(zip(*values))
+                written += n
+
+        return written
+
+    def column_names(self, endpoint: EndpointInfo) -> List[str]:
+        """CSV columns, which double as JMeter variable names"""
+        return list(self.analyzer.generate_columns(endpoint, 0))
+
+    def default_unique_columns(self, endpoint: EndpointInfo, rows: int) -> List[str]:
+        """Path parameters, which usually identify a resource, that can hold rows distinct values.
+
+        Best effort: a path parameter that cannot be unique (a small enum, a
+        boolean, a short bounded range) is drawn at random instead.
+        """
+        unique = []
+        for param in endpoint.parameters:
+            if param.location != 'path':
+                continue
+            try:
+                self._check_unique(endpoint, rows, [param.name])
+            except ValueError:
+                continue
+            unique.append(param.name)
+        return unique
+
+    def _unique_column(self, endpoint: EndpointInfo, name: str, offset: int, n: int) -> List[Any]:
+        compiled = self._compiled(endpoint, name)
+        namespace = self._namespace(endpoint, name)
+        try:
+            return [compiled.unique(i, namespace) for i in range(offset, offset + n)]
+        except ValueError as e:
+            raise ValueError(f"Column {name}: {e}") from None
+
+    def _namespace(self, endpoint: EndpointInfo, name: str) -> uuid.UUID:
+        seed = uuid.UUID(int=self.seed % (1 << 128))
+        return uuid.uuid5(seed, f"{endpoint.operation_id}:{name}")
+
+    def _compiled(self, endpoint: EndpointInfo, name: str) -> Any:
+        for param in endpoint.parameters:
+            if param.name == name:
+                return self.analyzer.compiler.compile_parameter(param)
+        raise ValueError(f"Unique column {name} is not a parameter of {endpoint.operation_id}")
+
+    def _check_unique(self, endpoint: EndpointInfo, rows: int, unique_columns: Sequence[str]):
+        """Fail early when a column cannot hold rows distinct values"""
+        for name in unique_columns:
+            compiled = self._compiled(endpoint, name)
+            try:
+                compiled.unique(max(rows - 1, 0), self._namespace(endpoint, name))
+            except ValueError as e:
+                raise ValueError(f"Column {name}: {e}, {rows} rows requested") from None
+
+
+def plan_shards(rows: int, shards: int) -> List[Tuple[int, int]]:
+    """Split rows into shards contiguous [start, stop) ranges of near equal size"""
+    shards = max(1, shards)
+    size, extra = divmod(rows, shards)
+    ranges = []
+    start = 0
+
+    for shard in range(shards):
+        stop = start + size + (1 if shard < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+
+    return ranges
+
+
+def derive_seed(seed: int, *parts: Any) -> int:
+    """Stable 64-bit seed for a (seed, parts...) tuple, independent of PYTHONHASHSEED"""
+    key = ':'.join(str(part) for part in (seed,) + parts).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+def _write_shard_task(task: Tuple, batch_size: int, seed: int, vectorized: bool) -> int:
+    """Process pool entry point: write one shard with a worker-local analyzer"""
+    writer = CsvDataWriter(SchemaAnalyzer(), batch_size=batch_size, seed=seed, vectorized=vectorized)
+    return writer.write_shard(*task)
+
@@ -0,0 +1,360 @@
+import re
+from typing import Dict, Any, List, Iterable, TextIO, Optional, Sequence
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+from models.endpoint_model import EndpointInfo
+
+JMETER_VERSION = '5.6.3'
+
+# ResponseAssertion test types (org.apache.jmeter.assertions.ResponseAssertion)
+ASSERT_EQUALS = 8
+ASSERT_SUBSTRING = 16
+ASSERT_OR = 32
+
+# ConstantThroughputTimer: all active threads in the current thread group (shared)
+CALC_MODE_GROUP_SHARED = 4
+# ThroughputController: percent executions
+THROUGHPUT_PERCENT = 1
+
+PATH_PARAMETER = re.compile(r'\{([^}/]+)\}')
+
+
+class JmxWriter:
+    """Streams a JMeter 5.6 test plan to a file, one sampler at a time.
+
+    The TestPlan, ThreadGroup, HTTP defaults and shared CSV Data Sets
+    (``csv_files``) are written by ``start()``; each ``write_endpoint()``
+    appends an HTTPSamplerProxy and its hashTree (CSV Data Sets, header
+    manager and assertions) and flushes it, so memory use does not depend on
+    the number of samplers. ``close()`` closes the open hashTrees. Use it as
+    a context manager to get both.
+
+    Generated data files (see writers.csv_writer) all use the plain parameter
+    names as variables, so ``operation_csv_files`` puts each operation's
+    files under its own sampler: JMeter reads a line just before that sampler
+    runs, and two operations with an ``id`` column cannot feed each other.
+
+    ``shared_headers`` go into one thread-group level header manager, which
+    sampler level managers override, and ``http_implementation`` is set on
+    the HTTP Request Defaults (see writers.plan_optimizer). A non-zero
+    ``throughput`` (samples per minute) paces the whole thread group with a
+    shared Constant Throughput Timer; ``write_endpoint(ep, percent)`` then
+    sets the operation's share of it (see writers.plan_sharder).
+    """
+
+    def __init__(self, fileobj: TextIO, test_name: str = 'Test Plan', base_url: str = '',
+                 threads: int = 1, ramp_up: int = 1, loops: int = 1,
+                 csv_files: Iterable[str] = (), shared_headers: Optional[Dict[str, str]] = None,
+                 http_implementation: str = '', throughput: float = 0.0,
+                 operation_csv_files: Optional[Dict[str, Sequence[str]]] = None):
+        self.file = fileobj
+        self.test_name = test_name
+        self.threads = threads
+        self.ramp_up = ramp_up
+        self.loops = loops
+        self.csv_files = list(csv_files)
+        self.operation_csv_files = {op: list(paths) for op, paths in (operation_csv_files or {}).items()}
+        self.shared_headers = dict(shared_headers or {})
+        self.http_implementation = http_implementation
+        self.throughput = throughput
+        self.samplers = 0
+
+        parts = urlsplit(base_url)
+        self.protocol = parts.scheme
+        self.domain = parts.hostname or ''
+        self.port = str(parts.port) if parts.port else ''
+        self.base_path = parts.path.rstrip('/')
+
+        self._lines: List[str] = []
+        self._open_tags: List[str] = []
+        self._started = False
+
+    def __enter__(self) -> 'JmxWriter':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        """Write everything up to the first sampler"""
+        if self._started:
+            return
+        self._started = True
+
+        self._lines.append('<?xml version="1.0" encoding="UTF-8"?>')
+        self._open('jmeterTestPlan', version='1.2', properties='5.0', jmeter=JMETER_VERSION)
+        self._open('hashTree')
+
+        self._open('TestPlan', guiclass='TestPlanGui', testclass='TestPlan', testname=self.test_name)
+        self._arguments('TestPlan.user_defined_variables', 'ArgumentsPanel', [])
+        self._prop('bool', 'TestPlan.functional_mode', 'false')
+        self._prop('bool', 'TestPlan.serialize_threadgroups', 'false')
+        self._close('TestPlan')
+        self._open('hashTree')
+
+        self._open('ThreadGroup', guiclass='ThreadGroupGui', testclass='ThreadGroup',
+                   testname='Thread Group')
+        self._prop('int', 'ThreadGroup.num_threads', self.threads)
+        self._prop('int', 'ThreadGroup.ramp_time', self.ramp_up)
+        self._prop('bool', 'ThreadGroup.same_user_on_next_iteration', 'true')
+        self._prop('string', 'ThreadGroup.on_sample_error', 'continue')
+        self._open('elementProp', name='ThreadGroup.main_controller', elementType='LoopController',
+                   guiclass='LoopControlPanel', testclass='LoopController', testname='Loop Controller')
+        self._prop('string', 'LoopController.loops', self.loops)
+        self._prop('bool', 'LoopController.continue_forever', 'false')
+        self._close('elementProp')
+        self._close('ThreadGroup')
+        self._open('hashTree')
+
+        self._open('ConfigTestElement', guiclass='HttpDefaultsGui', testclass='ConfigTestElement',
+                   testname='HTTP Request Defaults')
+        self._arguments('HTTPsampler.Arguments', 'HTTPArgumentsPanel', [])
+        self._prop('string', 'HTTPSampler.domain', self.domain)
+        self._prop('string', 'HTTPSampler.port', self.port)
+        self._prop('string', 'HTTPSampler.protocol', self.protocol)
+        if self.http_implementation:
+            self._prop('string', 'HTTPSampler.implementation', self.http_implementation)
+        self._close('ConfigTestElement')
+        self._empty('hashTree')
+
+        if self.shared_headers:
+            self._header_manager(self.shared_headers)
+
+        if self.throughput:
+            self._throughput_timer(self.throughput)
+
+        for path in self.csv_files:
+            self._csv_data_set(path)
+
+        self._flush()
+
+    def write_endpoint(self, endpoint: EndpointInfo, percent: Optional[float] = None):
+        """Append one sampler with its header manager and assertions.
+
+        With a percent the sampler runs under a Throughput Controller in that
+        share of the thread group's iterations.
+        """
+        if not self._started:
+            self.start()
+
+        if percent is not None:
+            self._throughput_controller(endpoint.operation_id, percent)
+            self._open('hashTree')
+
+        self._sampler(endpoint)
+        self._open('hashTree')
+
+        for path in self.operation_csv_files.get(endpoint.operation_id, ()):
+            self._csv_data_set(path)
+
+        if endpoint.headers_required:
+            self._header_manager(endpoint.headers_required)
+
+        codes = list(dict.fromkeys(endpoint.expected_response_codes))
+        self._response_assertion('Response Code', 'Assertion.response_code', codes,
+                                 ASSERT_EQUALS | ASSERT_OR)
+
+        body_strings = []
+        for assertion in endpoint.response_assertions:
+            if assertion.startswith('Content-Type: '):
+                # Plain substring: '+' and '.' in media types are not regex syntax
+                self._response_assertion('Content-Type', 'Assertion.response_headers',
+                                         [assertion], ASSERT_SUBSTRING)
+            elif assertion.startswith('JSON Path: '):
+                self._json_path_assertion(assertion[len('JSON Path: '):])
+            elif assertion.startswith('Body Contains: '):
+                body_strings.append(assertion[len('Body Contains: '):])
+
+        # One plain substring assertion (all strings must match) for every body check
+        if body_strings:
+            self._response_assertion('Response Body', 'Assertion.response_data', body_strings,
+                                     ASSERT_SUBSTRING)
+
+        self._close('hashTree')
+        if percent is not None:
+            self._close('hashTree')
+        self.samplers += 1
+        self._flush()
+
+    def close(self):
+        """Close the ThreadGroup, TestPlan and document hashTrees"""
+        if not self._started:
+            self.start()
+        while self._open_tags:
+            self._close(self._open_tags[-1])
+        self._flush()
+
+    def _sampler(self, endpoint: EndpointInfo):
+        path = self.base_path + PATH_PARAMETER.sub(r'${\1}', endpoint.path)
+        query = [(p.name, f"${{{p.name}}}") for p in endpoint.parameters if p.location == 'query']
+
+        # A raw body takes the argument slot, so query parameters go on the path
+        if endpoint.request_body and query:
+            path += '?' + '&'.join(f"{name}={value}" for name, value in query)
+
+        self._open('HTTPSamplerProxy', guiclass='HttpTestSampleGui', testclass='HTTPSamplerProxy',
+                   testname=endpoint.operation_id)
+        if endpoint.request_body:
+            self._prop('bool', 'HTTPSampler.postBodyRaw', 'true')
+            self._arguments('HTTPsampler.Arguments', 'HTTPArgumentsPanel', [('', '${request_body}')],
+                            encode=False)
+        else:
+            self._arguments('HTTPsampler.Arguments', 'HTTPArgumentsPanel', query)
+        self._prop('string', 'HTTPSampler.path', path)
+        self._prop('string', 'HTTPSampler.method', endpoint.method.value)
+        self._prop('bool', 'HTTPSampler.follow_redirects', 'true')
+        self._prop('bool', 'HTTPSampler.use_keepalive', 'true')
+        self._close('HTTPSamplerProxy')
+
+    def _arguments(self, name: str, guiclass: str, arguments: List[Any], encode: bool = True):
+        self._open('elementProp', name=name, elementType='Arguments', guiclass=guiclass,
+                   testclass='Arguments', testname='User Defined Variables')
+        if not arguments:
+            self._empty('collectionProp', name='Arguments.arguments')
+        else:
+            self._open('collectionProp', name='Arguments.arguments')
+            for arg_name, value in arguments:
+                self._open('elementProp', name=arg_name, elementType='HTTPArgument')
+                self._prop('bool', 'HTTPArgument.always_encode', 'true' if encode else 'false')
+                self._prop('string', 'Argument.value', value)
+                self._prop('string', 'Argument.metadata', '=')
+                self._prop('bool', 'HTTPArgument.use_equals', 'true')
+                self._prop('string', 'Argument.name', arg_name)
+                self._close('elementProp')
+            self._close('collectionProp')
+        self._close('elementProp')
+
+    def _header_manager(self, headers: Dict[str, str]):
+        self._open('HeaderManager', guiclass='HeaderPanel', testclass='HeaderManager',
+                   testname='HTTP Header Manager')
+        self._open('collectionProp', name='HeaderManager.headers')
+        for name, value in headers.items():
+            self._open('elementProp', name='', elementType='Header')
+            self._prop('string', 'Header.name', name)
+            self._prop('string', 'Header.value', value)
+            self._close('elementProp')
+        self._close('collectionProp')
+        self._close('HeaderManager')
+        self._empty('hashTree')
+
+    def _response_assertion(self, test_name: str, field: str, patterns: List[str], test_type: int):
+        self._open('ResponseAssertion', guiclass='AssertionGui', testclass='ResponseAssertion',
+                   testname=test_name)
+        # "Asserion" is the property name JMeter itself uses
+        self._open('collectionProp', name='Asserion.test_strings')
+        for pattern in patterns:
+            if field == 'Assertion.response_headers':
+                pattern = pattern.split(': ', 1)[1]
+            self._prop('string', str(_java_hash(pattern)), pattern)
+        self._close('collectionProp')
+        self._prop('string', 'Assertion.custom_message', '')
+        self._prop('string', 'Assertion.test_field', field)
+        self._prop('bool', 'Assertion.assume_success', 'false')
+        self._prop('int', 'Assertion.test_type', test_type)
+        self._close('ResponseAssertion')
+        self._empty('hashTree')
+
+    def _json_path_assertion(self, json_path: str):
+        self._open('JSONPathAssertion', guiclass='JSONPathAssertionGui', testclass='JSONPathAssertion',
+                   testname=f"JSON Path: {json_path}")
+        self._prop('string', 'JSON_PATH', json_path)
+        self._prop('string', 'EXPECTED_VALUE', '')
+        self._prop('bool', 'JSONVALIDATION', 'false')
+        self._prop('bool', 'EXPECT_NULL', 'false')
+        self._prop('bool', 'INVERT', 'false')
+        self._prop('bool', 'ISREGEX', 'true')
+        self._close('JSONPathAssertion')
+        self._empty('hashTree')
+
+    def _throughput_timer(self, per_minute: float):
+        self._open('ConstantThroughputTimer', guiclass='TestBeanGUI', testclass='ConstantThroughputTimer',
+                   testname='Constant Throughput Timer')
+        self._prop('int', 'calcMode', CALC_MODE_GROUP_SHARED)
+        self._value_prop('doubleProp', 'throughput', round(per_minute, 3))
+        self._close('ConstantThroughputTimer')
+        self._empty('hashTree')
+
+    def _throughput_controller(self, name: str, percent: float):
+        self._open('ThroughputController', guiclass='ThroughputControllerGui',
+                   testclass='ThroughputController', testname=f"{name} ({percent:.2f}%)")
+        self._prop('int', 'ThroughputController.style', THROUGHPUT_PERCENT)
+        self._prop('bool', 'ThroughputController.perThread', 'false')
+        self._prop('int', 'ThroughputController.maxThroughput', 1)
+        self._value_prop('FloatProperty', 'ThroughputController.percentThroughput', round(percent, 4))
+        self._close('ThroughputController')
+
+    def _csv_data_set(self, path: str):
+        self._open('CSVDataSet', guiclass='TestBeanGUI', testclass='CSVDataSet',
+                   testname=f"CSV Data Set Config ({path})")
+        self._prop('string', 'filename', path)
+        self._prop('string', 'fileEncoding', 'UTF-8')
+        # Empty variableNames: JMeter takes them from the header line
+        self._prop('string', 'variableNames', '')
+        self._prop('bool', 'ignoreFirstLine', 'false')
+        self._prop('string', 'delimiter', ',')
+        self._prop('bool', 'quotedData', 'true')
+        self._prop('bool', 'recycle', 'true')
+        self._prop('bool', 'stopThread', 'false')
+        self._prop('string', 'shareMode', 'shareMode.all')
+        self._close('CSVDataSet')
+        self._empty('hashTree')
+
+    # Low-level emitter: only the stack of open tags is kept, never a tree
+
+    def _indent(self) -> str:
+        return '  ' * len(self._open_tags)
+
+    def _open(self, tag: str, **attrs: Any):
+        self._lines.append(f"{self._indent()}<{tag}{_attributes(attrs)}>")
+        self._open_tags.append(tag)
+
+    def _close(self, tag: str):
+        expected = self._open_tags.pop()
+        if expected != tag:
+            raise ValueError(f"Closing <{tag}> while <{expected}> is open")
+        self._lines.append(f"{self._indent()}</{tag}>")
+
+    def _empty(self, tag: str, **attrs: Any):
+        self._lines.append(f"{self._indent()}<{tag}{_attributes(attrs)}/>")
+
+    def _prop(self, kind: str, name: str, value: Any):
+        self._lines.append(f"{self._indent()}<{kind}Prop name={quoteattr(name)}>"
+                           f"{escape(str(value))}</{kind}Prop>")
+
+    def _value_prop(self, tag: str, name: str, value: Any):
+        """Numeric properties JMeter stores as name/value/savedValue children"""
+        self._open(tag)
+        indent = self._indent()
+        self._lines.append(f"{indent}<name>{escape(name)}</name>")
+        self._lines.append(f"{indent}<value>{value}</value>")
+        self._lines.append(f"{indent}<savedValue>0.0</savedValue>")
+        self._close(tag)
+
+    def _flush(self):
+        if self._lines:
+            self.file.write('\n'.join(self._lines) + '\n')
+            self._lines.clear()
+
+
+def write_jmx(path: str, endpoints: Iterable[EndpointInfo], **options: Any) -> int:
+    """Write endpoints to a .jmx file; returns the number of samplers"""
+    with open(path, 'w', encoding='utf-8') as f:
+        with JmxWriter(f, **options) as writer:
+            for endpoint in endpoints:
+                writer.write_endpoint(endpoint)
+    return writer.samplers
+
+
+def _attributes(attrs: Dict[str, Any]) -> str:
+    return ''.join(f" {name}={quoteattr(str(value))}" for name, value in attrs.items())
+
+
+def _java_hash(value: str) -> int:
+    """String.hashCode(), which JMeter uses to name assertion test strings"""
+    h = 0
+    for ch in value:
+        h = (31 * h + ord(ch)) & 0xFFFFFFFF
+    return h - (1 << 32) if h >= (1 << 31) else h
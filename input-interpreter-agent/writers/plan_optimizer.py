@@ -0,0 +1,173 @@
+import re
+from collections import Counter
+from dataclasses import replace
+from typing import Dict, List, Sequence, Optional
+
+from models.endpoint_model import EndpointInfo, PlanOptimization
+
+# Relative injector CPU per sample, in microseconds. These are estimates
+# for ranking plan shapes against each other, not measurements.
+SAMPLER_US = 60.0             # HTTP sampler overhead without network time
+HEADER_MANAGER_US = 8.0       # each header manager merged into the request
+HEADER_US = 1.0               # each header it adds
+CODE_ASSERTION_US = 2.0       # Response Code equals/or
+REGEX_ASSERTION_US = 15.0     # ResponseAssertion "contains" compiles a regex
+SUBSTRING_ASSERTION_US = 3.0  # ResponseAssertion "substring" is indexOf
+SUBSTRING_US = 1.0            # each substring it checks
+JSON_PATH_ASSERTION_US = 120.0  # parses the whole body, once per assertion
+CONNECTION_SETUP_US = 2500.0  # TCP + TLS handshake, per thread iteration when connections are reset
+
+HTTP_IMPLEMENTATION = 'HttpClient4'
+
+# jmeter.properties that keep connections open across thread iterations
+KEEP_ALIVE_PROPERTIES = {
+    'httpclient.reset_state_on_thread_group_iteration': 'false',
+    'httpclient4.time_to_live': '60000',
+    'httpclient4.validate_after_inactivity': '4900',
+}
+
+ASSERTION_MODES = ('cheap', 'code', 'keep')
+
+SIMPLE_JSON_PATH = re.compile(r'^\$\.([A-Za-z_][\w-]*)$')
+
+
+class PlanOptimizer:
+    """Rewrites endpoints into a plan that is cheaper for JMeter to run.
+
+    - Headers every sampler sends are hoisted into one shared header manager;
+      samplers keep only the headers that differ (sampler level managers
+      override the shared one).
+    - ``assertions='cheap'`` keeps the response code check and replaces
+      ``$.field`` JSON Path assertions, which parse the body once each, with
+      one plain substring check for ``"field"``. ``'code'`` keeps the
+      response code check only; ``'keep'`` leaves assertions alone.
+    - With ``keep_alive`` the plan uses HttpClient4 and the report lists the
+      jmeter.properties that stop connections being reset every iteration.
+
+    The analysis itself is never modified; optimized copies are returned.
+    """
+
+    def __init__(self, assertions: str = 'cheap', hoist_headers: bool = True,
+                 keep_alive: bool = True, max_body_checks: int = 3):
+        if assertions not in ASSERTION_MODES:
+            raise ValueError(f"assertions must be one of {', '.join(ASSERTION_MODES)}")
+        self.assertions = assertions
+        self.hoist_headers = hoist_headers
+        self.keep_alive = keep_alive
+        self.max_body_checks = max_body_checks
+
+    @property
+    def http_implementation(self) -> str:
+        return HTTP_IMPLEMENTATION if self.keep_alive else ''
+
+    def optimize(self, endpoints: Sequence[EndpointInfo]) -> PlanOptimization:
+        endpoints = list(endpoints)
+        shared = self.shared_headers(endpoints) if self.hoist_headers else {}
+        optimized = [self.optimize_endpoint(ep, shared) for ep in endpoints]
+
+        plan = PlanOptimization(
+            endpoints=optimized,
+            shared_headers=shared,
+            http_implementation=self.http_implementation,
+            jmeter_properties=dict(KEEP_ALIVE_PROPERTIES) if self.keep_alive else {},
+            cost_before_us=estimate_cost(endpoints),
+            cost_after_us=estimate_cost(optimized, shared, connection_reuse=self.keep_alive)
+        )
+        plan.changes = self._describe(endpoints, plan)
+        return plan
+
+    def shared_headers(self, endpoints: Sequence[EndpointInfo]) -> Dict[str, str]:
+        """Headers every endpoint sends, each with its most common value"""
+        if not endpoints:
+            return {}
+
+        names = set(endpoints[0].headers_required)
+        for ep in endpoints[1:]:
+            names.intersection_update(ep.headers_required)
+
+        shared = {}
+        for name in sorted(names):
+            values = Counter(ep.headers_required[name] for ep in endpoints)
+            shared[name] = values.most_common(1)[0][0]
+        return shared
+
+    def optimize_endpoint(self, endpoint: EndpointInfo, shared_headers: Dict[str, str]) -> EndpointInfo:
+        """Copy of one endpoint with hoisted headers removed and cheaper assertions"""
+        headers = {name: value for name, value in endpoint.headers_required.items()
+                   if shared_headers.get(name) != value}
+        return replace(endpoint, headers_required=headers,
+                       response_assertions=self._assertions(endpoint.response_assertions))
+
+    def _assertions(self, assertions: List[str]) -> List[str]:
+        if self.assertions == 'keep':
+            return list(assertions)
+        if self.assertions == 'code':
+            return [a for a in assertions if a.startswith('Response Code: ')]
+
+        result, body_checks = [], []
+        for assertion in assertions:
+            match = SIMPLE_JSON_PATH.match(assertion[len('JSON Path: '):]) \
+                if assertion.startswith('JSON Path: ') else None
+            if match:
+                if len(body_checks) < self.max_body_checks:
+                    body_checks.append(f'Body Contains: "{match.group(1)}"')
+            elif not assertion.startswith('JSON Path: '):
+                result.append(assertion)
+        return result + body_checks
+
+    def _describe(self, endpoints: List[EndpointInfo], plan: PlanOptimization) -> List[str]:
+        changes = []
+        if plan.shared_headers:
+            removed = sum(len(ep.headers_required) for ep in endpoints) - \
+                sum(len(ep.headers_required) for ep in plan.endpoints)
+            changes.append(f"Hoisted {len(plan.shared_headers)} shared headers "
+                           f"({removed} sampler level headers removed)")
+
+        json_paths = sum(_count(ep.response_assertions, 'JSON Path: ') for ep in endpoints)
+        remaining = sum(_count(ep.response_assertions, 'JSON Path: ') for ep in plan.endpoints)
+        if json_paths != remaining:
+            changes.append(f"Replaced {json_paths - remaining} JSON Path assertions "
+                           f"with substring checks" if self.assertions == 'cheap'
+                           else f"Dropped {json_paths - remaining} JSON Path assertions")
+
+        if self.keep_alive:
+            changes.append(f"Using {HTTP_IMPLEMENTATION} with connections kept across iterations")
+        return changes
+
+
+def estimate_cost(endpoints: Sequence[EndpointInfo], shared_headers: Optional[Dict[str, str]] = None,
+                  connection_reuse: bool = False) -> float:
+    """Mean estimated injector CPU (us) per sample for a plan.
+
+    Without connection reuse JMeter resets connections every thread
+    iteration, i.e. once per pass over all samplers.
+    """
+    if not endpoints:
+        return 0.0
+
+    shared_cost = HEADER_MANAGER_US + HEADER_US * len(shared_headers) if shared_headers else 0.0
+    total = 0.0
+    for ep in endpoints:
+        cost = SAMPLER_US + shared_cost + CODE_ASSERTION_US
+        if ep.headers_required:
+            cost += HEADER_MANAGER_US + HEADER_US * len(ep.headers_required)
+
+        substrings = 0
+        for assertion in ep.response_assertions:
+            if assertion.startswith('Content-Type: '):
+                cost += REGEX_ASSERTION_US
+            elif assertion.startswith('JSON Path: '):
+                cost += JSON_PATH_ASSERTION_US
+            elif assertion.startswith('Body Contains: '):
+                substrings += 1
+        if substrings:
+            cost += SUBSTRING_ASSERTION_US + SUBSTRING_US * substrings
+        total += cost
+
+    if not connection_reuse:
+        total += CONNECTION_SETUP_US
+    return total / len(endpoints)
+
+
+def _count(assertions: List[str], prefix: str) -> int:
+    return sum(1 for a in assertions if a.startswith(prefix))
@@ -0,0 +1,160 @@
+import heapq
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.endpoint_model import EndpointInfo, NodeShard, ShardPlan
+from parsers.schema_analyzer import SchemaAnalyzer
+from writers.csv_writer import CsvDataWriter
+from writers.jmx_writer import JmxWriter
+from writers.plan_optimizer import PlanOptimizer, estimate_cost
+
+
+class PlanSharder:
+    """Splits a load profile across JMeter worker nodes.
+
+    Every operation gets a request rate from ``target_rps`` and its ``mix``
+    weight (equal weights by default). Its load is that rate times its
+    estimated per-sample cost (writers.plan_optimizer), and loads are
+    bin-packed onto ``nodes`` largest first, each onto the least loaded
+    node. An operation heavier than a node's fair share is split into equal
+    rate slices first, so no node has to carry more than about its share.
+
+    Each node runs one thread group paced by a shared Constant Throughput
+    Timer at the node's rate, with a percent Throughput Controller per
+    operation for the mix. Threads follow Little's law from ``latency_ms``
+    with ``headroom``. CSV rows of an operation are split across the nodes
+    running it in proportion to their rate, as disjoint row ranges, so unique
+    columns stay unique across the cluster.
+    """
+
+    def __init__(self, nodes: int, target_rps: float, mix: Optional[Dict[str, float]] = None,
+                 latency_ms: float = 200.0, headroom: float = 1.5,
+                 optimizer: Optional[PlanOptimizer] = None):
+        if nodes < 1:
+            raise ValueError("nodes must be at least 1")
+        if target_rps <= 0:
+            raise ValueError("target_rps must be positive")
+        self.nodes = nodes
+        self.target_rps = target_rps
+        self.mix = mix
+        self.latency_ms = latency_ms
+        self.headroom = headroom
+        self.optimizer = optimizer
+
+    def plan(self, endpoints: Sequence[EndpointInfo]) -> ShardPlan:
+        """Assign operation rates to nodes without writing anything"""
+        return self._assign(*self._prepare(endpoints))
+
+    def write(self, endpoints: Sequence[EndpointInfo], output_dir: str, rows: int = 0,
+              seed: int = 0, test_name: str = 'Test Plan', base_url: str = '',
+              analyzer: Optional[SchemaAnalyzer] = None) -> ShardPlan:
+        """Write node_<i>/plan.jmx (and node_<i>/data/*.csv with rows per operation)"""
+        endpoints, shared_headers, weights = self._prepare(endpoints)
+        shard_plan = self._assign(endpoints, shared_headers, weights)
+        by_id = {ep.operation_id: ep for ep in endpoints}
+        data_writer = CsvDataWriter(analyzer, seed=seed) if rows else None
+        offsets = self._row_ranges(shard_plan, rows)
+
+        for node in shard_plan.nodes:
+            node_dir = os.path.join(output_dir, f"node_{node.node}")
+            os.makedirs(node_dir, exist_ok=True)
+
+            data_files = {}
+            if data_writer is not None:
+                data_dir = os.path.join(node_dir, 'data')
+                os.makedirs(data_dir, exist_ok=True)
+                for operation_id in node.operations:
+                    endpoint = by_id[operation_id]
+                    start, stop = offsets[(operation_id, node.node)]
+                    path = os.path.join(data_dir, f"{operation_id}_{node.node}.csv")
+                    unique = data_writer.default_unique_columns(endpoint, rows)
+                    data_writer.write_shard(endpoint, path, node.node, start, stop, unique)
+                    node.data_files.append(path)
+                    data_files[operation_id] = [path]
+
+            node.plan_path = os.path.join(node_dir, 'plan.jmx')
+            with open(node.plan_path, 'w', encoding='utf-8') as f:
+                # Loops forever; the Constant Throughput Timer sets the rate
+                with JmxWriter(f, test_name=f"{test_name} (node {node.node})", base_url=base_url,
+                               threads=node.threads, loops=-1, operation_csv_files=data_files,
+                               shared_headers=shared_headers, throughput=node.rps * 60,
+                               http_implementation=self.optimizer.http_implementation
+                               if self.optimizer else '') as writer:
+                    for operation_id, rps in node.operations.items():
+                        writer.write_endpoint(by_id[operation_id], percent=rps / node.rps * 100)
+
+        return shard_plan
+
+    def _prepare(self, endpoints: Sequence[EndpointInfo]
+                 ) -> Tuple[List[EndpointInfo], Dict[str, str], Dict[str, float]]:
+        """Endpoints in the mix (optimized when an optimizer is set), shared headers and weights"""
+        weights = self._weights(endpoints)
+        endpoints = [ep for ep in endpoints if weights.get(ep.operation_id, 0) > 0]
+        if self.optimizer is None:
+            return endpoints, {}, weights
+        optimized = self.optimizer.optimize(endpoints)
+        return optimized.endpoints, optimized.shared_headers, weights
+
+    def _weights(self, endpoints: Sequence[EndpointInfo]) -> Dict[str, float]:
+        if self.mix is None:
+            return {ep.operation_id: 1.0 for ep in endpoints}
+        known = {ep.operation_id for ep in endpoints}
+        unknown = sorted(set(self.mix) - known)
+        if unknown:
+            raise ValueError(f"Unknown operations in mix: {', '.join(unknown)}")
+        return {op: float(weight) for op, weight in self.mix.items()}
+
+    def _assign(self, endpoints: List[EndpointInfo], shared_headers: Dict[str, str],
+                weights: Dict[str, float]) -> ShardPlan:
+        total_weight = sum(weights[ep.operation_id] for ep in endpoints)
+        if not endpoints or total_weight <= 0:
+            raise ValueError("The mix selects no operations")
+
+        # (load, operation_id, rps, cost) slices, each at most about a node's fair share
+        slices = []
+        loads = {}
+        for ep in endpoints:
+            rps = self.target_rps * weights[ep.operation_id] / total_weight
+            cost = estimate_cost([ep], shared_headers, connection_reuse=True)
+            loads[ep.operation_id] = (rps, cost)
+        fair_share = sum(rps * cost for rps, cost in loads.values()) / self.nodes
+
+        for operation_id, (rps, cost) in loads.items():
+            parts = min(self.nodes, max(1, math.ceil(rps * cost / fair_share - 1e-9)))
+            for _ in range(parts):
+                slices.append((rps * cost / parts, operation_id, rps / parts, cost))
+
+        # Longest processing time first onto the least loaded node
+        slices.sort(key=lambda s: (-s[0], s[1]))
+        nodes = [NodeShard(node=i) for i in range(self.nodes)]
+        heap = [(0.0, i) for i in range(self.nodes)]
+        for load, operation_id, rps, cost in slices:
+            node_load, index = heapq.heappop(heap)
+            node = nodes[index]
+            node.operations[operation_id] = node.operations.get(operation_id, 0.0) + rps
+            node.load_us = node_load + load
+            heapq.heappush(heap, (node.load_us, index))
+
+        latency_s = self.latency_ms / 1000
+        for node in nodes:
+            node.threads = max(1, math.ceil(node.rps * latency_s * self.headroom))
+        return ShardPlan(target_rps=self.target_rps, nodes=nodes)
+
+    def _row_ranges(self, shard_plan: ShardPlan, rows: int) -> Dict[Tuple[str, int], Tuple[int, int]]:
+        """Disjoint [start, stop) rows of each operation per node, by rate share"""
+        running: Dict[str, List[Tuple[int, float]]] = {}
+        for node in shard_plan.nodes:
+            for operation_id, rps in node.operations.items():
+                running.setdefault(operation_id, []).append((node.node, rps))
+
+        ranges = {}
+        for operation_id, shares in running.items():
+            total = sum(rps for _, rps in shares)
+            start, cumulative = 0, 0.0
+            for node_index, rps in shares:
+                cumulative += rps
+                stop = round(rows * cumulative / total)
+                ranges[(operation_id, node_index)] = (start, stop)
+                start = stop
+        return ranges